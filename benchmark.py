@@ -0,0 +1,200 @@
+# Times the exporter's hot paths against the code they replaced, to see that an optimization still pays off.
+# Nothing is asserted: timings depend on the machine, so they're only printed. The unit tests in tests/
+# check that the outputs match.
+#
+# Like run.py, --blender lets you specify an executable. The script launches Blender with the exporter
+# out of your GIT repo and then runs itself inside it, e.g.
+#
+# python3 benchmark.py --blender /Applications/Blender.app/Contents/MacOS/Blender -f dedup
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Callable, Dict
+
+# Benchmark name -> function, in the order they're run
+BENCHMARKS: Dict[str, Callable[[], None]] = {}
+
+
+def benchmark(func: Callable[[], None]) -> Callable[[], None]:
+    BENCHMARKS[func.__name__] = func
+    return func
+
+
+def _time(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _compare(
+    new_name: str, new: Callable[[], object], old_name: str, old: Callable[[], object]
+) -> None:
+    """Times new and old once each and prints how many times faster new is"""
+    new_time = _time(new)
+    old_time = _time(old)
+    print(
+        f"{new_name}: {new_time:.3f}s, {old_name}: {old_time:.3f}s"
+        f" ({old_time / new_time:.1f}x)"
+    )
+
+
+@benchmark
+def dedup_vt_block_1M_corners() -> None:
+    import numpy
+
+    from io_xplane2blender.xplane_types.xplane_mesh import dedup_vt_block
+
+    rng = numpy.random.default_rng(1)
+    unique = rng.random((250000, 8)).astype(numpy.float32)
+    vt_block = unique[rng.integers(0, 250000, 1000000)]
+
+    def with_dict():
+        vertices_dct = {}
+        inverse = []
+        for vt_entry in map(tuple, vt_block.tolist()):
+            vindex = vertices_dct.get(vt_entry, -1)
+            if vindex == -1:
+                vindex = len(vertices_dct)
+                vertices_dct[vt_entry] = vindex
+            inverse.append(vindex)
+        return inverse
+
+    print("1M corners, 250k unique VT rows")
+    _compare(
+        "dedup_vt_block",
+        lambda: dedup_vt_block(vt_block),
+        "vertices_dct.get loop",
+        with_dict,
+    )
+
+
+@benchmark
+def floatRowsToStr_1M_vertices() -> None:
+    import numpy
+
+    from io_xplane2blender.xplane_helpers import floatRowsToStr, floatToStr
+
+    rng = numpy.random.default_rng(1)
+    table = (rng.random((1000000, 8)) * 2 - 1).astype(numpy.float32)
+
+    def in_batches():
+        # Chunked like XPlaneMesh.writeVerticesTo
+        return "".join(
+            floatRowsToStr(table[chunk_start : chunk_start + 65536], "VT\t")
+            for chunk_start in range(0, len(table), 65536)
+        )
+
+    def per_component():
+        tab = "\t"
+        return "".join(
+            f"VT\t{tab.join(floatToStr(component) for component in line)}\n"
+            for line in table.tolist()
+        )
+
+    print("1M VT rows of 8 float32s")
+    _compare("floatRowsToStr", in_batches, "floatToStr per component", per_component)
+
+
+@benchmark
+def XPlaneCommands_write_bone_trees() -> None:
+    import bpy
+    from mathutils import Vector
+
+    from io_xplane2blender.tests.test_creation_helpers import (
+        DatablockInfo,
+        create_datablock_armature,
+        create_datablock_collection,
+        create_initial_test_setup,
+    )
+    from io_xplane2blender.xplane_types import xplane_file
+
+    create_initial_test_setup()
+    # Debug mode writes a comment for every bone, so every bone has output
+    bpy.context.scene.xplane.debug = True
+
+    # With linear scaling, each bone costs the same at every size
+    first_per_bone = None
+    for num_bones in (1250, 2500, 5000):
+        name = f"tree_{num_bones}"
+        collection = create_datablock_collection(name)
+        collection.xplane.is_exportable_collection = True
+        arm = create_datablock_armature(DatablockInfo("ARMATURE", name, collection=name))
+        # Each bone i is parented to bone (i-1)//2, all in one trip to Edit Mode
+        bpy.context.view_layer.objects.active = arm
+        bpy.ops.object.mode_set(mode="EDIT", toggle=False)
+        edit_bones = arm.data.edit_bones
+        edit_bones.remove(edit_bones[0])
+        new_bones = []
+        for i in range(num_bones):
+            bone = edit_bones.new(f"{name}_{i}")
+            bone.head = Vector((i, 0, 0))
+            bone.tail = Vector((i, 0, 1))
+            if i:
+                bone.parent = new_bones[(i - 1) // 2]
+            new_bones.append(bone)
+        bpy.ops.object.mode_set(mode="OBJECT", toggle=False)
+
+        xp_file = xplane_file.createFileFromBlenderRootObject(
+            collection, bpy.context.view_layer
+        )
+        seconds = _time(lambda: xp_file.commands.write(lod_bucket_index=None))
+        per_bone = seconds / num_bones
+        first_per_bone = first_per_bone or per_bone
+        print(
+            f"{num_bones} bones: {seconds:.3f}s, {per_bone * 1e6:.1f}us per bone"
+            f" ({per_bone / first_per_bone:.2f}x the per bone cost of 1250)"
+        )
+
+
+def _make_argparse():
+    parser = argparse.ArgumentParser(
+        description="Times XPlane2Blender's hot paths against the code they replaced"
+    )
+    parser.add_argument(
+        "--blender",
+        default="blender",  # Use the blender in the system path
+        type=str,
+        help="Provide alternative path to Blender executable",
+    )
+    parser.add_argument(
+        "-f", "--filter", help="Only run benchmarks matching a regular expression", type=str
+    )
+    return parser
+
+
+def main() -> int:
+    try:
+        import bpy
+    except ImportError:
+        # Not in Blender yet, launch it and come back
+        argv = _make_argparse().parse_args(sys.argv[1:])
+        blender_args = [
+            argv.blender,
+            "--addons",
+            "io_xplane2blender",
+            "--factory-startup",
+            "-noaudio",
+            "-b",
+            "--python",
+            os.path.realpath(__file__),
+            "--",
+        ] + sys.argv[1:]
+        print(" ".join(blender_args))
+        enviro = {"BLENDER_USER_SCRIPTS": os.path.dirname(os.path.realpath(__file__))}
+        return subprocess.run(blender_args, universal_newlines=True, env=enviro).returncode
+
+    argv = _make_argparse().parse_args(sys.argv[sys.argv.index("--") + 1 :])
+    for name, func in BENCHMARKS.items():
+        if argv.filter and not re.search(argv.filter, name):
+            continue
+        print(("=== " + name + " ").ljust(75, "="))
+        func()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
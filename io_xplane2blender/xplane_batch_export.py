@@ -0,0 +1,323 @@
+"""
+Exports many .blend files at once from the command line, for CI and build scripts.
+
+    blender -b --addons io_xplane2blender --python io_xplane2blender/xplane_batch_export.py -- \\
+        scenery/ more.blend list_of_blends.txt --jobs 4 --report report.json
+
+Each path is a .blend file, a directory searched for .blend files, or a manifest
+listing one .blend per line (relative to the manifest, # starts a comment).
+Every .blend is exported by its own background Blender through the export operator,
+up to --jobs at a time, and a JSON report of each file's timings, outputs,
+errors, and warnings is written to --report. Exits with 1 if any file failed
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import bpy
+
+from io_xplane2blender import xplane_export_workers, xplane_helpers
+from io_xplane2blender.xplane_export import EXPORT_OT_ExportXPlane
+from io_xplane2blender.xplane_helpers import logger
+
+REPORT_VERSION = 1
+
+# Run as a script, __name__ is __main__, but workers import this by name
+_MODULE_NAME = "io_xplane2blender.xplane_batch_export"
+
+# How much of a failed worker's output is put in the report
+_FAILED_OUTPUT_TAIL = 2000
+
+
+def _make_argparse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="xplane_batch_export",
+        description="Exports the OBJs of many .blend files with XPlane2Blender",
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        help=".blend files, directories to search for them, or manifests listing them",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="How many .blend files are exported at the same time",
+    )
+    parser.add_argument(
+        "--report",
+        default="xplane_batch_report.json",
+        help="Where the JSON report is written",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="",
+        help="Folder the OBJs are exported to, relative to each .blend file",
+    )
+    parser.add_argument(
+        "--only-selected-roots",
+        default=False,
+        action="store_true",
+        help="Only export roots that were selected when each .blend was saved",
+    )
+    parser.add_argument(
+        "--root",
+        action="append",
+        default=[],
+        dest="root_names",
+        help="Only export roots with this name, can be given more than once",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Seconds a .blend may take before its export is stopped",
+    )
+    return parser
+
+
+def find_blend_files(paths: List[str]) -> List[str]:
+    """
+    Returns the absolute paths of every .blend file in paths, in order, without
+    duplicates. Hidden files, like the copies made for parallel exports, are skipped.
+
+    Raises ValueError if a path isn't a directory or an existing file
+    """
+    blend_files: List[str] = []
+
+    def add(path: str) -> None:
+        path = os.path.abspath(path)
+        if path not in blend_files:
+            blend_files.append(path)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+                for filename in sorted(filenames):
+                    if filename.endswith(".blend") and not filename.startswith("."):
+                        add(os.path.join(dirpath, filename))
+        elif not os.path.isfile(path):
+            raise ValueError(f"{path} is not a .blend file, directory, or manifest")
+        elif path.endswith(".blend"):
+            add(path)
+        else:
+            with open(path) as manifest:
+                for line in manifest:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        add(os.path.join(os.path.dirname(path), line))
+    return blend_files
+
+
+def _get_output_paths(
+    output_dir: str, only_selected_roots: bool, root_names: List[str]
+) -> List[str]:
+    """The OBJs the export operator will write for the roots it is asked to export"""
+    scene = bpy.context.scene
+    paths = []
+    for root in xplane_helpers.get_exportable_roots_in_scene(
+        scene, bpy.context.view_layer
+    ):
+        if only_selected_roots and not (
+            isinstance(root, bpy.types.Object) and root.select_get()
+        ):
+            continue
+        if root_names and root.name not in root_names:
+            continue
+        filename = EXPORT_OT_ExportXPlane._cleanFilename(
+            root.xplane.layer.name if root.xplane.layer.name else root.name
+        )
+        if not os.path.isabs(filename):
+            paths.append(EXPORT_OT_ExportXPlane._getOutputPath(filename, output_dir))
+    return paths
+
+
+def _stat_mtime(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def run_worker(job_path: str) -> None:
+    """
+    Run by each worker Blender, with the .blend to export open:
+    exports it, writes a report of it to the job's result path, and exits
+    """
+    with open(job_path) as job_file:
+        job = json.load(job_file)
+
+    # Files are already exported in parallel, one per worker
+    bpy.context.scene.xplane.export_workers = 1
+    output_paths = _get_output_paths(
+        job["output_dir"], job["only_selected_roots"], job["root_names"]
+    )
+    mtimes_before = {path: _stat_mtime(path) for path in output_paths}
+
+    start = time.perf_counter()
+    try:
+        bpy.ops.export.xplane_obj(
+            filepath=job["output_dir"],
+            export_is_relative=True,
+            only_selected_roots=job["only_selected_roots"],
+            root_names="\n".join(job["root_names"]),
+        )
+    except RuntimeError as e:
+        logger.error(str(e))
+    export_seconds = time.perf_counter() - start
+
+    outputs = []
+    for path in output_paths:
+        mtime = _stat_mtime(path)
+        if mtime is not None:
+            outputs.append(
+                {
+                    "path": path,
+                    "size": os.path.getsize(path),
+                    "written": mtime != mtimes_before[path],
+                }
+            )
+
+    with open(job["result_path"], "w") as result_file:
+        json.dump(
+            {
+                "export_seconds": export_seconds,
+                "outputs": outputs,
+                "messages": xplane_export_workers.serialize_log_messages(),
+            },
+            result_file,
+        )
+    sys.exit(1 if logger.hasErrors() else 0)
+
+
+def _export_blend_file(
+    blend_file: str, args: argparse.Namespace, tmpdir: str, index: int
+) -> Dict[str, Any]:
+    """Exports blend_file in a worker Blender and returns its entry in the report"""
+    job_path = os.path.join(tmpdir, f"job_{index}.json")
+    result_path = os.path.join(tmpdir, f"result_{index}.json")
+    with open(job_path, "w") as job_file:
+        json.dump(
+            {
+                "output_dir": args.output_dir,
+                "only_selected_roots": args.only_selected_roots,
+                "root_names": args.root_names,
+                "result_path": result_path,
+            },
+            job_file,
+        )
+
+    entry: Dict[str, Any] = {
+        "blend": blend_file,
+        "exit_code": None,
+        "seconds": 0.0,
+        "export_seconds": None,
+        "outputs": [],
+        "errors": [],
+        "warnings": [],
+    }
+    start = time.perf_counter()
+    try:
+        process = subprocess.run(
+            xplane_export_workers.worker_command(
+                blend_file, _MODULE_NAME, "run_worker", job_path
+            ),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            timeout=args.timeout,
+        )
+    except subprocess.TimeoutExpired:
+        entry["errors"].append(f"Export took longer than {args.timeout} seconds")
+        return entry
+    finally:
+        entry["seconds"] = time.perf_counter() - start
+    entry["exit_code"] = process.returncode
+
+    try:
+        with open(result_path) as result_file:
+            result = json.load(result_file)
+    except (OSError, ValueError):
+        entry["errors"].append(
+            f"Worker exited with code {process.returncode}:\n"
+            f"{process.stdout[-_FAILED_OUTPUT_TAIL:]}"
+        )
+        return entry
+
+    entry["export_seconds"] = result["export_seconds"]
+    entry["outputs"] = result["outputs"]
+    for message in result["messages"]:
+        if message["type"] == "error":
+            entry["errors"].append(message["message"])
+        elif message["type"] == "warning":
+            entry["warnings"].append(message["message"])
+    if process.returncode != 0 and not entry["errors"]:
+        entry["errors"].append(f"Worker exited with code {process.returncode}")
+    return entry
+
+
+def main(argv: List[str]) -> int:
+    """Runs a batch export with command line arguments argv, returns the exit code"""
+    args = _make_argparse().parse_args(argv)
+    try:
+        blend_files = find_blend_files(args.paths)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    if not blend_files:
+        print("No .blend files found in " + ", ".join(args.paths))
+        return 1
+
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="xplane_batch_export_") as tmpdir:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            entries = list(
+                pool.map(
+                    lambda i: _export_blend_file(blend_files[i], args, tmpdir, i),
+                    range(len(blend_files)),
+                )
+            )
+
+    failed = [entry for entry in entries if entry["errors"]]
+    report = {
+        "version": REPORT_VERSION,
+        "blender_version": bpy.app.version_string,
+        "seconds": time.perf_counter() - start,
+        "failed": len(failed),
+        "files": entries,
+    }
+    with open(args.report, "w") as report_file:
+        json.dump(report, report_file, indent=1)
+
+    for entry in entries:
+        print(
+            "%s: %s, %d OBJs, %d warnings, %.2fs"
+            % (
+                "FAILED" if entry["errors"] else "OK",
+                entry["blend"],
+                len(entry["outputs"]),
+                len(entry["warnings"]),
+                entry["seconds"],
+            )
+        )
+    print(
+        "Exported %d of %d .blend files, report written to %s"
+        % (len(entries) - len(failed), len(entries), args.report)
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(
+        main(sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else [])
+    )
@@ -1,9 +1,10 @@
 """The starting point for the export process, the start of the addon"""
 
+import json
 import os
 import os.path
 import sys
-from typing import IO, Any, Optional
+from typing import IO, Any, Dict, Optional
 
 import bpy
 import mathutils
@@ -11,9 +12,15 @@ import mathutils
 import io_xplane2blender
 from bpy_extras.io_utils import ExportHelper, ImportHelper
 
+from . import xplane_export_workers
 from .xplane_config import getDebug
 from .xplane_helpers import XPlaneLogger, logger
 from .xplane_types import xplane_file
+from .xplane_utils import xplane_manifest
+from .xplane_utils.xplane_profiler import profiler
+
+# Size of the buffer OBJs are streamed through on their way to disk
+OBJ_WRITE_BUFFER_SIZE = 1024 * 1024
 
 
 class XPLANE_MT_xplane_export_log(bpy.types.Menu):
@@ -59,6 +66,13 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
         default=False,
     )
 
+    root_names: bpy.props.StringProperty(
+        name="Root Names",
+        description="If set, only exportable roots with these names (one per line) will be exported",
+        default="",
+        options={"HIDDEN"},
+    )
+
     # Method: execute
     # Used from Blender when user invokes export.
     # Invokes the exporting.
@@ -68,7 +82,23 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
     def execute(self, context):
         # prepare logging
         self._startLogging()
+        try:
+            if (
+                bpy.context.scene.xplane.plugin_development
+                and bpy.context.scene.xplane.dev_profile_export
+            ):
+                profiler.start(bpy.context.scene.xplane.dev_profile_export_cprofile)
+            return self._export()
+        finally:
+            # Once, at the very end, so every OBJ is in the profile and the log
+            try:
+                if profiler.enabled:
+                    self._reportProfile()
+            finally:
+                self._endLogging()
 
+    def _export(self):
+        """Exports every root, returning execute's result"""
         debug = getDebug()
         export_directory = self.properties.filepath
 
@@ -81,7 +111,6 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
                     "Save your blend file before using the '%s' button"
                     % io_xplane2blender.xplane_ops.SCENE_OT_export_to_relative_dir.bl_label
                 )
-                self._endLogging()
                 showLogDialog()
                 return {"CANCELLED"}
 
@@ -91,6 +120,9 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
         ):
             breakpoint()
 
+        # OBJs whose contents were identical to what was already on disk
+        self.unchangedFiles = 0
+
         # store current frame as we will go back to it
         currentFrame = bpy.context.scene.frame_current
 
@@ -98,15 +130,100 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
         bpy.context.scene.frame_set(frame=1)
         bpy.context.view_layer.update()
 
+        # Incremental exports skip roots that haven't changed since they were last written
+        manifest: Optional[xplane_manifest.ExportManifest] = None
+        fingerprints: Dict[str, str] = {}
+        skippedRoots = 0
+        isDryRun = (
+            bpy.context.scene.xplane.plugin_development
+            and bpy.context.scene.xplane.dev_export_as_dry_run
+        )
+        if bpy.context.scene.xplane.incremental_export:
+            if bpy.context.blend_data.filepath:
+                manifest = xplane_manifest.ExportManifest(
+                    xplane_manifest.get_manifest_path(bpy.context.blend_data.filepath)
+                )
+            else:
+                logger.warn("Save your blend file to use Incremental Export")
+
+        # Roots can be split between background Blenders, see xplane_export_workers
+        rootNames = set(filter(None, self.root_names.split("\n")))
+        numWorkers = bpy.context.scene.xplane.export_workers
+        if numWorkers > 1 and rootNames:
+            numWorkers = 1
+        elif numWorkers > 1 and not bpy.context.blend_data.filepath:
+            logger.warn("Save your blend file to export with more than one worker")
+            numWorkers = 1
+        workerRoots = []
+
+        def rootOutputPath(exportable_root) -> Optional[str]:
+            layer_props = exportable_root.xplane.layer
+            filename = self._cleanFilename(
+                layer_props.name if layer_props.name else exportable_root.name
+            )
+            if os.path.isabs(filename):
+                return None
+            return self._getOutputPath(filename, export_directory)
+
+        def skipUnchangedRoot(exportable_root) -> bool:
+            nonlocal skippedRoots
+            fullpath = rootOutputPath(exportable_root)
+            if not fullpath:
+                return False
+            fingerprint = fingerprints[fullpath] = xplane_manifest.fingerprint_root(
+                exportable_root,
+                bpy.context.scene,
+                bpy.context.evaluated_depsgraph_get(),
+            )
+            if manifest.is_unchanged(fullpath, fingerprint):
+                logger.info("Skipped %s, unchanged since the last export" % fullpath)
+                skippedRoots += 1
+                return True
+            return False
+
+        def skipRoot(exportable_root) -> bool:
+            if rootNames and exportable_root.name not in rootNames:
+                return True
+            if manifest and skipUnchangedRoot(exportable_root):
+                return True
+            if numWorkers > 1:
+                workerRoots.append(exportable_root)
+                return True
+            return False
+
         xplaneFiles = xplane_file.createFilesFromBlenderRootObjects(
             bpy.context.scene, 
             bpy.context.view_layer,
-            self.only_selected_roots            
+            self.only_selected_roots,
+            skipRoot if rootNames or manifest or numWorkers > 1 else None,
         )
+        if workerRoots:
+            logger.info(
+                "Exporting %d roots with %d workers"
+                % (len(workerRoots), min(numWorkers, len(workerRoots)))
+            )
+            workerResults = xplane_export_workers.export_in_workers(
+                workerRoots,
+                numWorkers,
+                self.properties.filepath,
+                self.properties.export_is_relative,
+            )
+            for shardRootNames, succeeded in workerResults:
+                if not (manifest and succeeded and not isDryRun):
+                    continue
+                for exportable_root in workerRoots:
+                    fullpath = rootOutputPath(exportable_root)
+                    if (
+                        exportable_root.name in shardRootNames
+                        and fullpath in fingerprints
+                        and os.path.isfile(fullpath)
+                    ):
+                        manifest.record(fullpath, fingerprints[fullpath])
         for xplaneFile in xplaneFiles:
-            if not self._writeXPlaneFile(xplaneFile, export_directory):
+            with profiler.file(xplaneFile.filename):
+                written = self._writeXPlaneFile(xplaneFile, export_directory)
+            if not written:
                 if logger.hasErrors():
-                    self._endLogging()
                     showLogDialog()
 
                 if (
@@ -119,7 +236,20 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
                     logger.clearMessages()
                     continue
                 else:
+                    if manifest:
+                        manifest.save()
                     return {"CANCELLED"}
+            fullpath = self._getOutputPath(xplaneFile.filename, export_directory)
+            if (
+                manifest
+                and fullpath in fingerprints
+                and not isDryRun
+                and not logger.hasErrors()
+            ):
+                manifest.record(fullpath, fingerprints[fullpath])
+
+        if manifest:
+            manifest.save()
 
         # return to stored frame
         bpy.context.scene.frame_set(frame=currentFrame)
@@ -129,18 +259,30 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
         # if logger.hasErrors() or logger.hasWarnings():
         #     showLogDialog()
 
-        if not xplaneFiles:
+        if self.unchangedFiles:
+            logger.info(
+                "%d OBJs were unchanged and not rewritten" % self.unchangedFiles
+            )
+
+        if workerRoots:
+            if logger.hasErrors():
+                return {"CANCELLED"}
+            logger.success("Export finished without errors")
+            return {"FINISHED"}
+        elif not xplaneFiles and skippedRoots:
+            logger.success(
+                "Export finished, all %d roots were unchanged" % skippedRoots
+            )
+            return {"FINISHED"}
+        elif not xplaneFiles:
             logger.error(
                 "Could not find any Exportable Collections or Objects, did you forget check 'Exportable Collection' or 'Exportable Object'?"
             )
-            self._endLogging()
             return {"CANCELLED"}
         elif logger.hasErrors():
-            self._endLogging()
             return {"CANCELLED"}
         elif not logger.hasErrors() and xplaneFiles:
             logger.success("Export finished without errors")
-            self._endLogging()
             return {"FINISHED"}
 
     def _startLogging(self):
@@ -176,7 +318,82 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
     def _endLogging(self):
         if self.logFile:
             self.logFile.close()
+            self.logFile = None
+
+    def _reportProfile(self) -> None:
+        """
+        Stops the profiler, logs its timings, and writes the JSON and cProfile
+        files the plugin development settings ask for next to the .blend file
+        """
+        capture = profiler.stop()
+        logger.info("Export took %.3fs" % profiler.seconds)
+        for line in profiler.report():
+            logger.info("Profile of %s" % line)
+
+        write_json = bpy.context.scene.xplane.dev_profile_export_json
+        if not (write_json or capture):
+            return
+        if bpy.context.blend_data.filepath == "":
+            logger.warn("Save your blend file to write the export's profile")
+            return
+
+        stem = os.path.splitext(bpy.context.blend_data.filepath)[0]
+        if write_json:
+            with open(stem + ".xplane_profile.json", "w") as profileFile:
+                json.dump(profiler.to_json(), profileFile, indent=1)
+            logger.info("Wrote export profile to %s.xplane_profile.json" % stem)
+        if capture:
+            capture.dump_stats(stem + ".xplane_export.prof")
+            logger.info("Wrote cProfile capture to %s.xplane_export.prof" % stem)
+
+    @staticmethod
+    def _cleanFilename(filename: str) -> str:
+        """
+        Removes a leading "//" from a layer's filename and
+        changes any backslashes to foward slashes for file paths
+        """
+        if filename.find("//") == 0:
+            filename = filename.replace("//", "", 1)
+
+        return filename.replace("\\", "/")
+
+    @staticmethod
+    def _getOutputPath(filename: str, directory: str) -> str:
+        """
+        Returns the absolute path the OBJ for a cleaned, relative filename is written to
+        """
+        # Get the relative path
+        # Append .obj if needed
+        # Make paths based on the absolute path
+        relpath = os.path.normpath(os.path.join(directory, filename))
+        if not ".obj" in relpath:
+            relpath += ".obj"
+
+        return os.path.abspath(
+            os.path.join(os.path.dirname(bpy.context.blend_data.filepath), relpath)
+        )
+
+    @staticmethod
+    def _hasSameContents(path: str, otherPath: str) -> bool:
+        """
+        True if both files exist and are byte for byte the same.
+        Sizes are compared first, then the contents a buffer at a time,
+        stopping at the first difference
+        """
+        try:
+            if os.path.getsize(path) != os.path.getsize(otherPath):
+                return False
+            with open(path, "rb") as file, open(otherPath, "rb") as otherFile:
+                while True:
+                    chunk = file.read(OBJ_WRITE_BUFFER_SIZE)
+                    if chunk != otherFile.read(OBJ_WRITE_BUFFER_SIZE):
+                        return False
+                    if not chunk:
+                        return True
+        except OSError:
+            return False
 
+    @profiler.profiled("disk write")
     def _writeXPlaneFile(
         self, xplaneFile: xplane_file.XPlaneFile, directory: str
     ) -> bool:
@@ -190,11 +407,7 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
         if not xplaneFile.get_xplane_objects():
             return False
 
-        if xplaneFile.filename.find("//") == 0:
-            xplaneFile.filename = xplaneFile.filename.replace("//", "", 1)
-
-        # Change any backslashes to foward slashes for file paths
-        xplaneFile.filename = xplaneFile.filename.replace("\\", "/")
+        xplaneFile.filename = self._cleanFilename(xplaneFile.filename)
 
         if os.path.isabs(xplaneFile.filename):
             logger.error(
@@ -203,36 +416,47 @@ class EXPORT_OT_ExportXPlane(bpy.types.Operator, ExportHelper):
             )
             return False
 
-        # Get the relative path
-        # Append .obj if needed
-        # Make paths based on the absolute path
-        # Write
-        relpath = os.path.normpath(os.path.join(directory, xplaneFile.filename))
-        if not ".obj" in relpath:
-            relpath += ".obj"
-
-        fullpath = os.path.abspath(
-            os.path.join(os.path.dirname(bpy.context.blend_data.filepath), relpath)
-        )
-        out = xplaneFile.write()
-
-        if logger.hasErrors():
-            return False
-
+        fullpath = self._getOutputPath(xplaneFile.filename, directory)
         plugin_development = bpy.context.scene.xplane.plugin_development
         dry_run = bpy.context.scene.xplane.dev_export_as_dry_run
-        if not plugin_development or (plugin_development and not dry_run):
-            try:
-                os.makedirs(os.path.dirname(fullpath), exist_ok=True)
-            except OSError as e:
-                logger.error(e)
-            else:
-                with open(fullpath, "w") as objFile:
-                    logger.info("Writing %s" % fullpath)
-                    objFile.write(out)
-                    logger.success("Wrote %s" % fullpath)
-        else:
+        if plugin_development and dry_run:
+            with open(os.devnull, "w") as objFile:
+                xplaneFile.writeTo(objFile)
+            if logger.hasErrors():
+                return False
             logger.info('Skipped writing %s due to "Dry Run"' % (fullpath))
+            return True
+
+        try:
+            os.makedirs(os.path.dirname(fullpath), exist_ok=True)
+        except OSError as e:
+            logger.error(e)
+            return True
+
+        # The OBJ is streamed into a temporary file next to the real one,
+        # so a failed export never leaves a half written OBJ behind
+        tmppath = fullpath + ".tmp"
+        try:
+            with open(tmppath, "w", buffering=OBJ_WRITE_BUFFER_SIZE) as objFile:
+                xplaneFile.writeTo(objFile)
+            if logger.hasErrors():
+                os.remove(tmppath)
+                return False
+            if bpy.context.scene.xplane.only_write_changed_objs and self._hasSameContents(
+                tmppath, fullpath
+            ):
+                # Leaving it alone keeps its modification time
+                os.remove(tmppath)
+                logger.info("Unchanged %s, not rewritten" % fullpath)
+                self.unchangedFiles += 1
+                return True
+            logger.info("Writing %s" % fullpath)
+            os.replace(tmppath, fullpath)
+        except BaseException:
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            raise
+        logger.success("Wrote %s" % fullpath)
 
         return True
 
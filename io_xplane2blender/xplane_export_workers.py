@@ -0,0 +1,176 @@
+"""
+Exports a .blend's roots with several background Blender processes at once.
+
+The parent splits the roots it would export into shards and saves a copy of the
+.blend next to the original (so relative paths stay the same). Each worker opens the
+copy and runs the export operator on its shard only, then reports its XPlaneLogger
+messages back for the parent to merge into its own log
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Sequence, Tuple
+
+import bpy
+
+from io_xplane2blender import xplane_helpers
+from io_xplane2blender.xplane_helpers import ExportableRoot, logger
+
+# How much of a failed worker's output is put in the log
+_FAILED_OUTPUT_TAIL = 2000
+
+
+def shard_roots(root_weights: Dict[str, int], num_shards: int) -> List[List[str]]:
+    """
+    Splits root names into at most num_shards shards of about the same total weight
+    (longest processing time first: heaviest root to the lightest shard so far).
+    Shards are never empty
+    """
+    shards: List[Tuple[int, List[str]]] = [(0, []) for _ in range(num_shards)]
+    for name in sorted(root_weights, key=lambda name: (-root_weights[name], name)):
+        i = min(range(num_shards), key=lambda i: shards[i][0])
+        weight, names = shards[i]
+        shards[i] = (weight + root_weights[name], names + [name])
+    return [names for weight, names in shards if names]
+
+
+def worker_command(
+    blend_filepath: str, module_name: str, function_name: str, job_path: str
+) -> List[str]:
+    """
+    The command line for a background Blender that opens blend_filepath, with this
+    addon enabled, and calls module_name.function_name(job_path)
+    """
+    return [
+        bpy.app.binary_path,
+        "--addons",
+        __package__,
+        "-noaudio",
+        "-b",
+        blend_filepath,
+        "--python-expr",
+        f"import {module_name}; {module_name}.{function_name}({job_path!r})",
+    ]
+
+
+def serialize_log_messages() -> List[Dict[str, str]]:
+    """logger's messages, without their contexts, so they can be sent as JSON"""
+    return [
+        {"type": message["type"], "message": str(message["message"])}
+        for message in logger.messages
+    ]
+
+
+def export_in_workers(
+    exportable_roots: Sequence[ExportableRoot],
+    num_workers: int,
+    filepath: str,
+    export_is_relative: bool,
+) -> List[Tuple[List[str], bool]]:
+    """
+    Exports exportable_roots with up to num_workers background Blender processes,
+    merging their log messages into logger.
+
+    filepath and export_is_relative are given to each worker's export operator.
+    Returns each shard's root names and if it exported without errors
+    """
+    # Roots with the same name (a Collection and an Object) go to the same worker
+    root_weights: Dict[str, int] = {}
+    for root in exportable_roots:
+        root_weights[root.name] = root_weights.get(root.name, 0) + max(
+            1, len(xplane_helpers.get_potential_objects_in_exportable_root(root))
+        )
+    shards = shard_roots(root_weights, num_workers)
+
+    blend_filepath = bpy.context.blend_data.filepath
+    # Next to the original, so paths relative to the .blend still work
+    copy_path = os.path.join(
+        os.path.dirname(blend_filepath),
+        f".{os.path.splitext(os.path.basename(blend_filepath))[0]}.xplane_export.blend",
+    )
+    bpy.ops.wm.save_as_mainfile(filepath=copy_path, copy=True, check_existing=False)
+
+    results = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="xplane_export_") as tmpdir:
+            workers = []
+            for i, root_names in enumerate(shards):
+                job_path = os.path.join(tmpdir, f"job_{i}.json")
+                result_path = os.path.join(tmpdir, f"result_{i}.json")
+                with open(job_path, "w") as job_file:
+                    json.dump(
+                        {
+                            "filepath": filepath,
+                            "export_is_relative": export_is_relative,
+                            "root_names": root_names,
+                            "result_path": result_path,
+                        },
+                        job_file,
+                    )
+                output = open(os.path.join(tmpdir, f"output_{i}.txt"), "w+")
+                process = subprocess.Popen(
+                    worker_command(copy_path, __name__, "run_worker", job_path),
+                    stdout=output,
+                    stderr=subprocess.STDOUT,
+                    universal_newlines=True,
+                )
+                workers.append((root_names, process, output, result_path))
+
+            for root_names, process, output, result_path in workers:
+                returncode = process.wait()
+                output.seek(0)
+                try:
+                    with open(result_path) as result_file:
+                        messages = json.load(result_file)["messages"]
+                except (OSError, ValueError):
+                    messages = []
+                for message in messages:
+                    logger.log(message["type"], message["message"])
+
+                if returncode != 0 and not messages:
+                    logger.error(
+                        f"Export worker for {', '.join(root_names)} failed"
+                        f" (exit code {returncode}):\n{output.read()[-_FAILED_OUTPUT_TAIL:]}"
+                    )
+                output.close()
+                results.append(
+                    (
+                        root_names,
+                        returncode == 0
+                        and not any(m["type"] == "error" for m in messages),
+                    )
+                )
+    finally:
+        os.remove(copy_path)
+    return results
+
+
+def run_worker(job_path: str) -> None:
+    """
+    Run by each worker Blender: exports the roots the job asks for,
+    writes its log messages to the job's result path, and exits
+    """
+    with open(job_path) as job_file:
+        job = json.load(job_file)
+
+    # The parent already decided what to export and keeps the manifest
+    bpy.context.scene.xplane.export_workers = 1
+    bpy.context.scene.xplane.incremental_export = False
+    # Profiles reach the parent through the log, not files next to the copy
+    bpy.context.scene.xplane.dev_profile_export_json = False
+    bpy.context.scene.xplane.dev_profile_export_cprofile = False
+    try:
+        bpy.ops.export.xplane_obj(
+            filepath=job["filepath"],
+            export_is_relative=job["export_is_relative"],
+            root_names="\n".join(job["root_names"]),
+        )
+    except RuntimeError as e:
+        logger.error(str(e))
+
+    with open(job["result_path"], "w") as result_file:
+        json.dump({"messages": serialize_log_messages()}, result_file)
+    sys.exit(1 if logger.hasErrors() else 0)
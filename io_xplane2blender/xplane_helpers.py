@@ -8,6 +8,7 @@ from pathlib import Path
 
 import bpy
 import mathutils
+import numpy
 
 import io_xplane2blender
 from io_xplane2blender import xplane_config, xplane_constants, xplane_props
@@ -55,6 +56,66 @@ def floatToStr(n: float) -> str:
     return s
 
 
+# Magnitudes where '.8g' could switch to exponent notation, with some slack so
+# rounding at the edges of the range (or comparing as float32) can't sneak an
+# 'e' past the fast path
+_FLOAT_STR_EXPONENT_HIGH = 10.0 ** (PRECISION_OBJ_FLOAT - 1)
+_FLOAT_STR_EXPONENT_LOW = 1.001e-4
+
+
+def floatRowsToStr(
+    table: numpy.ndarray, prefix: str, first_index: Optional[int] = None
+) -> str:
+    """
+    Batch version of floatToStr for a 2D table. Each row becomes
+    prefix, its tab separated components and a newline, with every
+    component formatted exactly as floatToStr would. If first_index is given
+    each row also gets a '\t# <row number>' comment, counting from first_index.
+
+    Runs of rows with no exponent-prone components are formatted with one
+    %-format call, the rest fall back to floatToStr
+    """
+    # THIS IS A HOT PATH, DO NOT CHANGE WITHOUT PROFILING
+    num_rows, num_columns = table.shape
+    if not num_rows:
+        return ""
+
+    line = prefix + "\t".join([f"%.{PRECISION_OBJ_FLOAT}g"] * num_columns)
+    if first_index is not None:
+        line += "\t# %d"
+        table = numpy.column_stack(
+            (table, numpy.arange(first_index, first_index + num_rows))
+        )
+    line += "\n"
+
+    magnitudes = numpy.abs(table[:, :num_columns])
+    slow_rows = numpy.flatnonzero(
+        (
+            (magnitudes >= _FLOAT_STR_EXPONENT_HIGH)
+            | ((magnitudes < _FLOAT_STR_EXPONENT_LOW) & (magnitudes != 0))
+        ).any(axis=1)
+    )
+
+    chunks = []
+    start = 0
+    for slow_row in itertools.chain(slow_rows.tolist(), [num_rows]):
+        if start < slow_row:
+            chunks.append(
+                (line * (slow_row - start))
+                % tuple(table[start:slow_row].ravel().tolist())
+            )
+        if slow_row < num_rows:
+            values = table[slow_row].tolist()
+            chunks.append(
+                prefix
+                + "\t".join(map(floatToStr, values[:num_columns]))
+                + (f"\t# {first_index + slow_row}" if first_index is not None else "")
+                + "\n"
+            )
+        start = slow_row + 1
+    return "".join(chunks)
+
+
 def resolveBlenderPath(path: str) -> str:
     blenddir = os.path.dirname(bpy.context.blend_data.filepath)
 
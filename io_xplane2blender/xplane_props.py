@@ -1959,6 +1959,26 @@ class XPlaneSceneSettings(bpy.types.PropertyGroup):
             description = "Reveals Non-Root Collections"
     )
 
+    incremental_export: bpy.props.BoolProperty(
+        name = "Incremental Export",
+        description = "Skip roots whose contents and OBJ haven't changed since they were last exported. Their fingerprints are kept in a .xplane_manifest.json file next to the .blend file",
+        default = False
+    )
+
+    only_write_changed_objs: bpy.props.BoolProperty(
+        name = "Only Rewrite Changed OBJs",
+        description = "Leave OBJs whose exported contents are byte for byte the same as the file already on disk untouched, keeping their modification times",
+        default = False
+    )
+
+    export_workers: bpy.props.IntProperty(
+        name = "Export Workers",
+        description = "How many background Blenders export roots at the same time. With 1, roots are exported one after another in this Blender",
+        default = 1,
+        min = 1,
+        soft_max = 16
+    )
+
     log: bpy.props.BoolProperty(
         name = "Create Log File",
         description = "If checked the debug information will be written to a log file",
@@ -1995,6 +2015,21 @@ class XPlaneSceneSettings(bpy.types.PropertyGroup):
         description = 'Run exporter without actually writing .objs to disk',
         default = False)
 
+    dev_profile_export: bpy.props.BoolProperty(
+        name        = "Profile Export",
+        description = "Log the time and calls of each export phase for every OBJ, and which frames the keyframe scan visits and why",
+        default = False)
+
+    dev_profile_export_json: bpy.props.BoolProperty(
+        name        = "Write Profile JSON",
+        description = "Also write the export's phase timings to a .xplane_profile.json file next to the .blend file",
+        default = False)
+
+    dev_profile_export_cprofile: bpy.props.BoolProperty(
+        name        = "Capture cProfile",
+        description = "Run the export under cProfile and save its stats to a .xplane_export.prof file next to the .blend file, for pstats or snakeviz",
+        default = False)
+
     dev_fake_xplane2blender_version: bpy.props.StringProperty(
         name       = "Fake XPlane2Blender Version",
         description = "The Fake XPlane2Blender Version to re-run the upgrader with",
@@ -2007,6 +2042,62 @@ class XPlaneSceneSettings(bpy.types.PropertyGroup):
         default = False
     )
 
+    optimize_animations: bpy.props.BoolProperty(
+        name = "Merge Animation Blocks",
+        description = "When optimizing, also leave out ANIM blocks that do nothing and merge identical ANIM blocks of neighbouring objects",
+        default = False
+    )
+
+    optimize_keyframes: bpy.props.BoolProperty(
+        name = "Simplify Keyframes",
+        description = "When optimizing, also drop animation keyframes that linear interpolation of the keyframes around them reproduces within the tolerance below",
+        default = False
+    )
+
+    optimize_keyframes_tolerance: bpy.props.FloatProperty(
+        name = "Keyframe Tolerance",
+        description = "How far an interpolated keyframe can be (in meters for translations, degrees for rotations) from the original and still be dropped",
+        default = 0.0001,
+        min = 0.0,
+        precision = 6
+    )
+
+    optimize_vertex_cache: bpy.props.BoolProperty(
+        name = "Optimize Vertex Cache",
+        description = "When optimizing, also reorder each object's triangles and vertices for the GPU's vertex cache. Changes the draw order of triangles within an object",
+        default = False
+    )
+
+    optimize_weld: bpy.props.BoolProperty(
+        name = "Weld Nearby Vertices",
+        description = "When optimizing, also merge vertices whose position, normal, and UV are within the tolerances below. Merged vertices may move by up to the tolerance",
+        default = False
+    )
+
+    optimize_weld_normal_epsilon: bpy.props.FloatProperty(
+        name = "Normal Tolerance",
+        description = "How far apart two vertex normals can be (per component) and still be welded",
+        default = 0.001,
+        min = 0.0000001,
+        precision = 6
+    )
+
+    optimize_weld_position_epsilon: bpy.props.FloatProperty(
+        name = "Position Tolerance",
+        description = "How far apart two vertex positions can be (per axis, in meters) and still be welded",
+        default = 0.0001,
+        min = 0.0000001,
+        precision = 6
+    )
+
+    optimize_weld_uv_epsilon: bpy.props.FloatProperty(
+        name = "UV Tolerance",
+        description = "How far apart two vertex UV coordinates can be (per component) and still be welded",
+        default = 0.0001,
+        min = 0.0000001,
+        precision = 6
+    )
+
     version: bpy.props.EnumProperty(
         name = "X-Plane Version",
         default = VERSION_1210,
@@ -27,7 +27,7 @@ relationships, it cannot be assumed that the XPlaneBone Tree and Blender Hierarc
 """
 
 import math
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import bpy
 import mathutils
@@ -39,6 +39,7 @@ from io_xplane2blender.xplane_types.xplane_keyframe import XPlaneKeyframe
 from io_xplane2blender.xplane_types.xplane_keyframe_collection import (
     XPlaneKeyframeCollection,
 )
+from io_xplane2blender.xplane_utils.xplane_profiler import profiler
 
 # from xplane_object import XPlaneObject
 
@@ -66,8 +67,15 @@ class XPlaneBone:
         self.blenderObject = blender_obj
         self.blenderBone = blender_bone
         self.xplaneObject = xplane_obj
-        self.parent = parent_xplane_bone
         self.children: List["XPlaneBone"] = []
+        # Cached by getIndent, reset whenever this branch is reparented
+        self._indent: Optional[str] = None
+        # Cached by the matrix getters once fillMatrixCache says this branch is final,
+        # for the frame in _matrices_frame. Reset whenever this branch is reparented
+        self._cache_matrices = False
+        self._matrices: Dict[str, Any] = {}
+        self._matrices_frame: Optional[int] = None
+        self.parent = parent_xplane_bone
 
         if self.xplaneObject:
             assert (
@@ -108,6 +116,22 @@ class XPlaneBone:
         self.datarefs: Dict[str, xplane_props.XPlaneDataref] = {}
         self.collectAnimations()
 
+    @property
+    def parent(self) -> Optional["XPlaneBone"]:
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["XPlaneBone"]) -> None:
+        self._parent = parent
+        # Reparenting changes the depth of this whole branch
+        branch = [self]
+        while branch:
+            bone = branch.pop()
+            bone._indent = None
+            bone._cache_matrices = False
+            bone._matrices.clear()
+            branch.extend(bone.children)
+
     def sortChildren(self) -> None:
         def getWeight(xplaneBone) -> int:
             if xplaneBone.xplaneObject:
@@ -160,6 +184,7 @@ class XPlaneBone:
             or self.isDataRefAnimatedForRotation()
         )
 
+    @profiler.profiled("collect animations")
     def collectAnimations(self) -> None:
         """
         Collects animation_data from blenderObject, and pairs it with xplane datarefs
@@ -246,10 +271,7 @@ class XPlaneBone:
         Note: Unit tests, like the ones in xplane_file,
         test against the output of this method!
         """
-        count_parents = (
-            lambda bone: 1 + count_parents(bone.parent) if bone.parent else 0
-        )
-        prefix = "" if ignore_indent_level else f"{count_parents(self)} "
+        prefix = "" if ignore_indent_level else f"{len(self.getIndent())} "
 
         if self.blenderBone:
             return f"{prefix}Bone: {self.blenderBone.name}"
@@ -273,10 +295,22 @@ class XPlaneBone:
             assert False, "Cannot call getBlenderName on a root bone"
 
     def getIndent(self) -> str:
-        count_parents = (
-            lambda bone: 1 + count_parents(bone.parent) if bone.parent else 0
-        )
-        return "\t" * count_parents(self)
+        """
+        One tab per parent. Cached, since the writers ask for it for every line
+        """
+        if self._indent is None:
+            # Walk up to the nearest bone that already knows its indent,
+            # iteratively so deep hierarchies can't hit the recursion limit
+            branch = []
+            bone = self
+            while bone is not None and bone._indent is None:
+                branch.append(bone)
+                bone = bone.parent
+            indent = bone._indent + "\t" if bone is not None else ""
+            for bone in reversed(branch):
+                bone._indent = indent
+                indent += "\t"
+        return self._indent
 
     def getFirstAnimatedParent(self) -> Optional[str]:
         if self.parent == None:
@@ -293,7 +327,7 @@ class XPlaneBone:
     # If we want to emit a mesh, this is where the mesh lives.  The world matrix might be "more"
     # transforms than post-animation if there is a static rotation after a dynamic translation.
     #
-    def getBlenderWorldMatrix(self) -> mathutils.Matrix:
+    def _computeBlenderWorldMatrix(self) -> mathutils.Matrix:
         if self.blenderBone:
             # Blender bones in their current pose (which matches the shape of all data
             # blocks 'right now') are stored as a transform in the pose bone relative
@@ -327,7 +361,7 @@ class XPlaneBone:
     #
     # It is only legal to ask for this if (1) a bone is animated and (2) it is not the root
     # bone.
-    def getPreAnimationMatrix(self) -> mathutils.Matrix:
+    def _computePreAnimationMatrix(self) -> mathutils.Matrix:
         if self.parent == None:
             # No one should ever need the pre-animation matrix of the root bone -
             # we only need this to get a bake matrix between two animations.
@@ -415,7 +449,7 @@ class XPlaneBone:
     # This matrix represents the world space pose of the bone just after all dynamic animation.  EVERY
     # bone has this, because everything "on" the bone (sub-bones, meshes) is attached to this pose.
     #
-    def getPostAnimationMatrix(self) -> mathutils.Matrix:
+    def _computePostAnimationMatrix(self) -> mathutils.Matrix:
         if self.parent == None:
             # WARNING: If the root bone has been scaled then the scale does NOT apply to the OBJ.
             # This is probably technically correct based on some insane fine-print reading of export-by-object
@@ -481,7 +515,7 @@ class XPlaneBone:
     #
     # The bake matrix for animations for bone X is the static transform _from X's parent bone to X before its animations.
     # In other words, once we are in X's parent's coordinate system, we need to do this bake to then apply our animations.
-    def getBakeMatrixForMyAnimations(self) -> mathutils.Matrix:
+    def _computeBakeMatrixForMyAnimations(self) -> mathutils.Matrix:
         parent_bone = self.getFirstAnimatedParent()
         if parent_bone == None:
             # If we have no parent bone, our bake matrix goes from global coordinates TO our pre-animation pose.
@@ -502,7 +536,7 @@ class XPlaneBone:
     # This API gets the bake matrix to be applied to output-able primitives that are attached to -this- bone.
     # In other words, this is a helper for how to bake our lights, meshes, etc.
     #
-    def getBakeMatrixForAttached(self) -> mathutils.Matrix:
+    def _computeBakeMatrixForAttached(self) -> mathutils.Matrix:
         # Our anchor bone is the thing we are attached to - it might be us, or it might be our parent.
         if self.isAnimated():
             my_anchor_bone = self  # The anchor bone is the last bone to be animated -
@@ -521,6 +555,69 @@ class XPlaneBone:
             # Find the relative matrix from the post-animation of our last animated bone to our final post animation transform.
             return anchor_post_anim.inverted_safe() @ my_final_world
 
+    # MATRIX CACHE
+    #
+    # Every child object and animation writer asks for these matrices, often of the same bone, so once the
+    # bone tree is final each one is computed at most once per frame.
+    #
+    def fillMatrixCache(self) -> None:
+        """
+        Turns on matrix caching for this now final branch and computes
+        every matrix its objects and animation writers will ask for
+        """
+        branch = [self]
+        while branch:
+            bone = branch.pop()
+            bone._cache_matrices = True
+            bone.getBakeMatrixForAttached()
+            if bone.parent and bone.isAnimated():
+                bone.getBakeMatrixForMyAnimations()
+                bone.getPreAnimationScale()
+            branch.extend(bone.children)
+
+    def _getCached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns compute()'s result, computing it only once per frame after fillMatrixCache.
+        Callers must copy what they return
+        """
+        if not self._cache_matrices:
+            return compute()
+
+        frame = bpy.context.scene.frame_current
+        if self._matrices_frame != frame:
+            self._matrices.clear()
+            self._matrices_frame = frame
+        try:
+            return self._matrices[name]
+        except KeyError:
+            value = self._matrices[name] = compute()
+            return value
+
+    def getBlenderWorldMatrix(self) -> mathutils.Matrix:
+        return self._getCached("world", self._computeBlenderWorldMatrix).copy()
+
+    def getPreAnimationMatrix(self) -> mathutils.Matrix:
+        return self._getCached("pre", self._computePreAnimationMatrix).copy()
+
+    def getPreAnimationScale(self) -> mathutils.Vector:
+        """Returns the scale part of the pre-animation matrix"""
+        return self._getCached(
+            "pre_scale", lambda: self.getPreAnimationMatrix().decompose()[2]
+        ).copy()
+
+    def getPostAnimationMatrix(self) -> mathutils.Matrix:
+        return self._getCached("post", self._computePostAnimationMatrix).copy()
+
+    def getBakeMatrixForMyAnimations(self) -> mathutils.Matrix:
+        return self._getCached(
+            "bake_animations", self._computeBakeMatrixForMyAnimations
+        ).copy()
+
+    def getBakeMatrixForAttached(self) -> mathutils.Matrix:
+        return self._getCached(
+            "bake_attached", self._computeBakeMatrixForAttached
+        ).copy()
+
     def __str__(self) -> str:
         def toString(bone: "XPlaneBone", indent: str = "") -> str:
             out = indent + bone.getName() + "\n"
@@ -533,13 +630,13 @@ class XPlaneBone:
         out = toString(self)
         return out
 
-    def writeAnimationPrefix(self) -> None:
+    def writeAnimationPrefix(self) -> str:
         debug = getDebug()
         indent = self.getIndent()
-        o = ""
+        o = []
 
         if debug:
-            o += indent + "# " + self.getName() + "\n"
+            o.append(indent + "# " + self.getName() + "\n")
             """
             if self.blenderBone:
                 poseBone = self.blenderObject.pose.bones[self.blenderBone.name]
@@ -574,26 +671,26 @@ class XPlaneBone:
         )
 
         if not isAnimated and not hasAnimationAttributes:
-            return o
+            return "".join(o)
 
         # and postMatrix is not preMatrix
         if (isAnimated) or hasAnimationAttributes:
-            o += indent + "ANIM_begin\n"
+            o.append(indent + "ANIM_begin\n")
 
         if isAnimated:  # and postMatrix is not preMatrix:
             # write out static translations of bake
             bakeMatrix = self.getBakeMatrixForMyAnimations()
-            o += self._writeStaticTranslation(bakeMatrix)
-            o += self._writeStaticRotation(bakeMatrix)
+            o.append(self._writeStaticTranslation(bakeMatrix))
+            o.append(self._writeStaticRotation(bakeMatrix))
 
             for dataref in sorted(list(self.animations.keys())):
-                o += self._writeTranslationKeyframes(dataref)
+                o.append(self._writeTranslationKeyframes(dataref))
             for dataref in sorted(list(self.animations.keys())):
-                o += self._writeRotationKeyframes(dataref)
+                o.append(self._writeRotationKeyframes(dataref))
 
-        o += self._writeAnimAttributes()
+        o.append(self._writeAnimAttributes())
 
-        return o
+        return "".join(o)
 
     def _writeStaticTranslation(self, bakeMatrix: mathutils.Matrix) -> None:
         debug = getDebug()
@@ -628,7 +725,7 @@ class XPlaneBone:
     def _writeStaticRotation(self, bakeMatrix: mathutils.Matrix) -> str:
         debug = getDebug()
         indent = self.getIndent()
-        o = ""
+        o = []
         bakeMatrix = bakeMatrix
         rotation = list(
             map(
@@ -639,10 +736,10 @@ class XPlaneBone:
 
         # ignore noop rotations
         if rotation == (0, 0, 0):
-            return o
+            return ""
 
         if debug:
-            o += indent + "# static rotation\n"
+            o.append(indent + "# static rotation\n")
 
         # Ben says: this is SLIGHTLY counter-intuitive...Blender axes are
         # globally applied in a Euler, so in our XYZ, X is affected -by- Y
@@ -666,13 +763,13 @@ class XPlaneBone:
             # ignore zero rotation
             if not round(deg, xplane_constants.PRECISION_KEYFRAME) == 0:
                 tab = "\t"
-                o += (
+                o.append(
                     f"{indent}ANIM_rotate"
                     f"\t{tab.join(map(floatToStr,vec_b_to_x(axis)))}"
                     f"\t{tab.join(map(floatToStr, [deg, deg]))}\n"
                 )
 
-        return o
+        return "".join(o)
 
     def _writeKeyframesLoop(self, dataref: str) -> str:
         o = ""
@@ -683,49 +780,65 @@ class XPlaneBone:
                 o += f"{indent}\tANIM_keyframe_loop\t{self.datarefs[dataref].loop}\n"
         return o
 
+    def _simplifyKeyframeTable(self, dataref: str, table: list, attr: str) -> list:
+        """
+        Returns table without the keyframes the optimize_keyframes setting
+        can drop, or table itself if it is off
+        """
+        scene_settings = bpy.context.scene.xplane
+        if not (scene_settings.optimize and scene_settings.optimize_keyframes):
+            return table
+        loop = self.datarefs[dataref].loop if dataref in self.datarefs else 0.0
+        return XPlaneKeyframeCollection.simplify_keyframe_table(
+            table, attr, scene_settings.optimize_keyframes_tolerance, loop
+        )
+
     def _writeTranslationKeyframes(self, dataref: str) -> str:
         debug = getDebug()
         keyframes = self.animations[dataref]
 
-        o = ""
+        o = []
 
         if not self.isDataRefAnimatedForTranslation():
-            return o
+            return ""
 
         # Apply scaling to translations
-        pre_loc, pre_rot, pre_scale = self.getPreAnimationMatrix().decompose()
+        pre_scale = self.getPreAnimationScale()
 
         totalTrans = 0
         indent = self.getIndent()
 
         if debug:
-            o += f"{indent}# translation keyframes\n"
+            o.append(f"{indent}# translation keyframes\n")
 
-        o += f"{indent}ANIM_trans_begin\t{dataref}\n"
+        o.append(f"{indent}ANIM_trans_begin\t{dataref}\n")
 
         for keyframe in keyframes:
             totalTrans += sum(map(abs, keyframe.location))
 
-            o += (
+        for value, location in self._simplifyKeyframeTable(
+            dataref, keyframes.getTranslationKeyframeTable(), "location"
+        ):
+            o.append(
                 f"{indent}ANIM_trans_key"
-                f"\t{floatToStr(keyframe.dataref_value)}"
-                f"\t{floatToStr(keyframe.location[0] * pre_scale[0])}"
-                f"\t{floatToStr(keyframe.location[2] * pre_scale[2])}"
-                f"\t{floatToStr(-keyframe.location[1] * pre_scale[1])}"
+                f"\t{floatToStr(value)}"
+                f"\t{floatToStr(location[0] * pre_scale[0])}"
+                f"\t{floatToStr(location[2] * pre_scale[2])}"
+                f"\t{floatToStr(-location[1] * pre_scale[1])}"
                 f"\n"
             )
 
-        o += self._writeKeyframesLoop(dataref)
-        o += f"{indent}ANIM_trans_end\n"
+        o.append(self._writeKeyframesLoop(dataref))
+        o.append(f"{indent}ANIM_trans_end\n")
 
         # do not write zero translations
         if totalTrans == 0:
             return ""
 
-        return o
+        return "".join(o)
 
     def _writeAxisAngleRotationKeyframes(self, dataref, keyframes) -> str:
-        o = ""
+        o = []
         indent = self.getIndent()
         totalRot = 0
 
@@ -734,32 +847,36 @@ class XPlaneBone:
 
         if len(axes) == 3:
             # decompose to eulers and return euler rotation instead
-            o = self._writeEulerRotationKeyframes(dataref, keyframes.asEuler())
-            return o
+            return self._writeEulerRotationKeyframes(dataref, keyframes.asEuler())
         elif len(axes) == 1:
             refAxis = axes[0]
 
         tab = "\t"
-        o += (
+        o.append(
             f"{indent}ANIM_rotate_begin"
             f"\t{tab.join(map(floatToStr, vec_b_to_x(refAxis)))}"
             f"\t{dataref}\n"
         )
 
-        for keyframe in keyframes:
-            deg = math.degrees(keyframe.rotation[0])
+        (axis_table,) = keyframes.getRotationKeyframeTables()
+        for value, deg in axis_table.table:
             totalRot += abs(deg)
 
-            o += f"{indent}ANIM_rotate_key\t{floatToStr(keyframe.dataref_value)}\t{floatToStr(deg)}\n"
+        for value, deg in self._simplifyKeyframeTable(
+            dataref, axis_table.table, "degrees"
+        ):
+            o.append(
+                f"{indent}ANIM_rotate_key\t{floatToStr(value)}\t{floatToStr(deg)}\n"
+            )
 
-        o += self._writeKeyframesLoop(dataref)
-        o += f"{indent}ANIM_rotate_end\n"
+        o.append(self._writeKeyframesLoop(dataref))
+        o.append(f"{indent}ANIM_rotate_end\n")
 
         # do not write zero rotations
         if round(totalRot, xplane_constants.PRECISION_KEYFRAME) == 0:
             return ""
 
-        return o
+        return "".join(o)
 
     def _writeQuaternionRotationKeyframes(self, dataref, keyframes) -> str:
         # Writing axis angle will automatically convert quaternions to AA and write it
@@ -767,77 +884,82 @@ class XPlaneBone:
 
     def _writeEulerRotationKeyframes(self, dataref, keyframes) -> str:
         debug = getDebug()
-        o = ""
+        o = []
         indent = self.getIndent()
         axes, final_rotation_mode = keyframes.getReferenceAxes()
         totalRot = 0
 
-        for axis, order in zip(
-            axes, XPlaneKeyframeCollection.EULER_AXIS_ORDERING[final_rotation_mode]
-        ):
-            ao = ""
+        for axis, axis_table in zip(axes, keyframes.getRotationKeyframeTables()):
+            ao = []
             totalAxisRot = 0
 
             tab = "\t"
-            ao += (
+            ao.append(
                 f"{indent}ANIM_rotate_begin"
                 f"\t{tab.join(map(floatToStr, vec_b_to_x(axis)))}"
                 f"\t{dataref}\n"
             )
 
-            for keyframe in keyframes:
-                deg = math.degrees(keyframe.rotation[order])
+            for value, deg in axis_table.table:
                 totalRot += abs(deg)
                 totalAxisRot += abs(deg)
-                ao += f"{indent}ANIM_rotate_key\t{floatToStr(keyframe.dataref_value)}\t{floatToStr(deg)}\n"
 
-            ao += self._writeKeyframesLoop(dataref)
-            ao += f"{indent}ANIM_rotate_end\n"
+            for value, deg in self._simplifyKeyframeTable(
+                dataref, axis_table.table, "degrees"
+            ):
+                ao.append(
+                    f"{indent}ANIM_rotate_key\t{floatToStr(value)}\t{floatToStr(deg)}\n"
+                )
+
+            ao.append(self._writeKeyframesLoop(dataref))
+            ao.append(f"{indent}ANIM_rotate_end\n")
 
             # do not write non-animated axis
             if round(totalAxisRot, xplane_constants.PRECISION_KEYFRAME) > 0:
-                o += ao
+                o.extend(ao)
 
         # do not write zero rotations
         if round(totalRot, xplane_constants.PRECISION_KEYFRAME) == 0:
             return ""
 
-        return o
+        return "".join(o)
 
     def _writeRotationKeyframes(self, dataref) -> str:
         debug = getDebug()
         keyframes = self.animations[dataref]
-        o = ""
+        o = []
 
         if not self.isDataRefAnimatedForRotation():
-            return o
+            return ""
 
         if debug:
-            o += f"{self.getIndent()}# rotation keyframes\n"
+            o.append(f"{self.getIndent()}# rotation keyframes\n")
 
         rotationMode = keyframes[0].rotationMode
 
         if rotationMode == "AXIS_ANGLE":
-            o += self._writeAxisAngleRotationKeyframes(dataref, keyframes)
+            o.append(self._writeAxisAngleRotationKeyframes(dataref, keyframes))
         elif rotationMode == "QUATERNION":
-            o += self._writeQuaternionRotationKeyframes(dataref, keyframes)
+            o.append(self._writeQuaternionRotationKeyframes(dataref, keyframes))
         else:
-            o += self._writeEulerRotationKeyframes(dataref, keyframes)
+            o.append(self._writeEulerRotationKeyframes(dataref, keyframes))
 
-        return o
+        return "".join(o)
 
     def _writeAnimAttributes(self) -> str:
-        o = ""
+        o = []
 
         if self.xplaneObject == None:
-            return o
+            return ""
 
         for name in self.xplaneObject.animAttributes:
             attr = self.xplaneObject.animAttributes[name]
             for i in range(len(attr.value)):
-                o += f"{self.getIndent()}{attr.name}\t{attr.getValueAsString(i=i)}\n"
+                o.append(
+                    f"{self.getIndent()}{attr.name}\t{attr.getValueAsString(i=i)}\n"
+                )
 
-        return o
+        return "".join(o)
 
     def writeAnimationSuffix(self) -> str:
         o = ""
@@ -1,5 +1,5 @@
 import re
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 import bpy
 
@@ -10,7 +10,6 @@ from io_xplane2blender.xplane_types import (
     xplane_file,
     xplane_object,
 )
-from io_xplane2blender.xplane_types.xplane_attributes import XPlaneAttributes
 
 from ..xplane_config import getDebug
 from ..xplane_constants import *
@@ -101,6 +100,19 @@ class XPlaneCommands:
         # these attributes/commands are not persistant and must always be rewritten
         self.inpersistant = {"ATTR_axis_detent_range", "ATTR_manip_wheel"}
 
+        # Lookup tables resolved from self.reseters on first use, so the regexes
+        # run once per attribute name instead of once per attribute written.
+        # See _getSetterPatterns and _getResetterPatterns, addReseter clears them
+        #
+        # attribute name -> the setter patterns it fully matches, in sorted order
+        self._setter_patterns: Dict[str, Tuple[str, ...]] = {}
+        # resetter -> the setter patterns it resets
+        self._resetter_patterns: Optional[Dict[str, Tuple[str, ...]]] = None
+
+        # int - How many ANIM blocks the optimize_animations setting removed
+        # from the last plan made by _planXPlaneBone
+        self.removed_anim_blocks = 0
+
         # Initializes the state machine to match X-Plane's defaults
         # thus preventing unneeded ATTRs
         self.written = {
@@ -127,10 +139,28 @@ class XPlaneCommands:
             2,
             3,
         }, f"LOD bucket index ({lod_bucket_index}) must be None or a real bucket index"
-        o = ""
-        o += self.writeXPlaneBone(self.xplaneFile.rootBone, lod_bucket_index)
+        return self.writeXPlaneBone(self.xplaneFile.rootBone, lod_bucket_index)
 
-        return o
+    def writeLods(self, lod_bucket_indices: Iterable[int]) -> Iterator[str]:
+        """
+        Yields what write(lod_bucket_index=i) would return for each i in
+        lod_bucket_indices, in order, while walking the bone tree and writing
+        every bone's animation only once for all of them.
+
+        The buckets still have to be written one after another,
+        each one starts from the attribute state the last one left behind
+        """
+        plan = self._planXPlaneBone(self.xplaneFile.rootBone)
+        for lod_bucket_index in lod_bucket_indices:
+            assert lod_bucket_index in {
+                0,
+                1,
+                2,
+                3,
+            }, f"LOD bucket index ({lod_bucket_index}) must be a real bucket index"
+            o = []
+            self._emitPlan(plan, lod_bucket_index, o)
+            yield "".join(o)
 
     def writeXPlaneBone(
         self, xplaneBone: xplane_bone.XPlaneBone, lod_bucket_index: Optional[int]
@@ -146,33 +176,127 @@ class XPlaneCommands:
             2,
             3,
         }, f"LOD bucket index ({lod_bucket_index}) must be None or a real bucket index"
-        o = ""
-        o += xplaneBone.writeAnimationPrefix()
-
-        xplaneObject = xplaneBone.xplaneObject
-        xplaneObjectWritten = False
-
-        if xplaneObject and not xplaneObject.export_animation_only:
-            if lod_bucket_index is None:
-                o += self._writeXPlaneObjectPrefix(xplaneObject)
-                xplaneObjectWritten = True
-            elif (
-                lod_bucket_index is not None
-                and xplaneObject.effective_buckets[lod_bucket_index]
-            ):
-                o += self._writeXPlaneObjectPrefix(xplaneObject)
-                xplaneObjectWritten = True
+        o = []
+        self._emitPlan(self._planXPlaneBone(xplaneBone), lod_bucket_index, o)
+        return "".join(o)
 
-        # write bone children
-        for childBone in xplaneBone.children:
-            o += self.writeXPlaneBone(childBone, lod_bucket_index)
+    def _planXPlaneBone(
+        self, xplaneBone: xplane_bone.XPlaneBone
+    ) -> List[Union[str, Tuple[xplane_object.XPlaneObject, bool]]]:
+        """
+        Flattens an XPlaneBone and its children into the order writeXPlaneBone writes them in.
+        Animations don't depend on the LOD bucket or on what was written before,
+        so they are written here, once. The XPlaneObjects' prefixes and suffixes do,
+        so they are left as (xplaneObject, is_prefix) for _emitPlan to write.
+
+        The tree is walked with an explicit stack instead of recursion,
+        so a deep hierarchy's text isn't copied again at every level on the way back up
+        (and can't hit Python's recursion limit)
+
+        With the optimize_animations setting, ANIM blocks that don't transform or
+        hide anything are left out, and a bone's ANIM block is merged into its
+        previous sibling's when both would write exactly the same animation
+        """
+        plan: List[Union[str, Tuple[xplane_object.XPlaneObject, bool]]] = []
+        text: List[str] = []
+        scene_settings = bpy.context.scene.xplane
+        optimize_animations = (
+            scene_settings.optimize and scene_settings.optimize_animations
+        )
+        self.removed_anim_blocks = 0
+        # Bones whose empty ANIM block was left out, so their ANIM_end is too
+        elided: Set[xplane_bone.XPlaneBone] = set()
+        # The animation prefix of every open bone
+        prefixes: Dict[xplane_bone.XPlaneBone, str] = {}
+        # The last closed bone, its prefix, and its suffix (while still the last text)
+        last_closed: Optional[Tuple[xplane_bone.XPlaneBone, str, str]] = None
+
+        def add_object(xplaneObject: xplane_object.XPlaneObject, is_prefix: bool):
+            if text:
+                plan.append("".join(text))
+                text.clear()
+            plan.append((xplaneObject, is_prefix))
+
+        # Entries are (bone, False) for a bone still to be opened and
+        # (bone, True) for a bone whose children are done
+        stack: List[Tuple[xplane_bone.XPlaneBone, bool]] = [(xplaneBone, False)]
+        while stack:
+            xplaneBone, childrenDone = stack.pop()
+            xplaneObject = xplaneBone.xplaneObject
+            writesObject = bool(
+                xplaneObject and not xplaneObject.export_animation_only
+            )
 
-        if xplaneObject and xplaneObjectWritten:
-            o += self._writeXPlaneObjectSuffix(xplaneObject)
+            if childrenDone:
+                if writesObject:
+                    add_object(xplaneObject, False)
+                prefix = prefixes.pop(xplaneBone)
+                if xplaneBone in elided:
+                    last_closed = None
+                    continue
+                suffix = xplaneBone.writeAnimationSuffix()
+                text.append(suffix)
+                last_closed = (xplaneBone, prefix, suffix)
+                continue
+
+            prefix = prefixes[xplaneBone] = xplaneBone.writeAnimationPrefix()
+            if optimize_animations and prefix:
+                if prefix == f"{xplaneBone.getIndent()}ANIM_begin\n":
+                    # Nothing happens in this block, children can do without it
+                    elided.add(xplaneBone)
+                    self.removed_anim_blocks += 1
+                    prefix = ""
+                elif (
+                    last_closed
+                    and last_closed[0].parent is xplaneBone.parent
+                    and last_closed[1] == prefix
+                    and text
+                    and text[-1] is last_closed[2]
+                ):
+                    # Stay in our previous sibling's identical block
+                    # instead of closing it just to open it again
+                    text.pop()
+                    self.removed_anim_blocks += 1
+                    prefix = ""
+            last_closed = None
+            text.append(prefix)
+            if writesObject:
+                add_object(xplaneObject, True)
+
+            # close this bone after all its children have been written
+            stack.append((xplaneBone, True))
+            stack.extend(
+                (childBone, False) for childBone in reversed(xplaneBone.children)
+            )
 
-        o += xplaneBone.writeAnimationSuffix()
+        if text:
+            plan.append("".join(text))
+        return plan
 
-        return o
+    def _emitPlan(
+        self,
+        plan: List[Union[str, Tuple[xplane_object.XPlaneObject, bool]]],
+        lod_bucket_index: Optional[int],
+        o: List[str],
+    ) -> None:
+        """
+        Appends the pieces of a _planXPlaneBone plan's output for lod_bucket_index to o,
+        to be joined once by the caller
+        """
+        for entry in plan:
+            if isinstance(entry, str):
+                o.append(entry)
+                continue
+
+            xplaneObject, is_prefix = entry
+            if (
+                lod_bucket_index is None
+                or xplaneObject.effective_buckets[lod_bucket_index]
+            ):
+                if is_prefix:
+                    o.append(self._writeXPlaneObjectPrefix(xplaneObject))
+                else:
+                    o.append(self._writeXPlaneObjectSuffix(xplaneObject))
 
     def _writeXPlaneObjectPrefix(self, xplaneObject):
         o = ""
@@ -259,6 +383,39 @@ class XPlaneCommands:
 
     def addReseter(self, attr: str, reseter: str) -> None:
         self.reseters[attr] = reseter
+        self._setter_patterns.clear()
+        self._resetter_patterns = None
+
+    def _getSetterPatterns(self, attr: str) -> Tuple[str, ...]:
+        """
+        Returns the (sorted) setter patterns of self.reseters that attr fully matches
+        """
+        try:
+            return self._setter_patterns[attr]
+        except KeyError:
+            patterns = tuple(
+                setterPattern
+                for setterPattern in sorted(self.reseters.keys())
+                if re.fullmatch(setterPattern, attr)
+            )
+            self._setter_patterns[attr] = patterns
+            return patterns
+
+    def _getResetterPatterns(self, attr: str) -> Tuple[str, ...]:
+        """
+        Returns the setter patterns attr is the resetter for, if any
+        """
+        if self._resetter_patterns is None:
+            resetter_patterns = {}
+            for setterPattern in sorted(self.reseters.keys()):
+                resetter_patterns.setdefault(self.reseters[setterPattern], []).append(
+                    setterPattern
+                )
+            self._resetter_patterns = {
+                resetter: tuple(patterns)
+                for resetter, patterns in resetter_patterns.items()
+            }
+        return self._resetter_patterns.get(attr, ())
 
     # Method: attributeIsReseter
     # Determines if a given attribute is a resetter.
@@ -282,55 +439,28 @@ class XPlaneCommands:
         resetter that "undoes" it.  Given any resetter, this
         returns all setters.
         """
-
-        found = []
-        setterPatterns = sorted(list(self.reseters.keys()))
-
-        for setterPattern in setterPatterns:
-            resetter = self.reseters[setterPattern]
-            compiledPattern = re.compile(setterPattern)
-
-            # The attribute is a setter - the resetter is a counter part
-            if compiledPattern.fullmatch(attr):
-                found.append(resetter)
-
-            # The pattern is a resetter or ONE of the setters.
-            # Every other setter but us is a counterpart.
-            if attr == resetter or compiledPattern.fullmatch(attr):
-                allWritten = sorted(list(self.written.keys()))
-                for oneWritten in allWritten:
-                    if compiledPattern.fullmatch(oneWritten):
-                        # We have to check for ourselves - we might be taking every written attribute
-                        # that is a SETTER that matches the reg-ex, e.g. we are ATTR_cockpit and we found
-                        # ATTR_cockpit|ATTR_cockpit_region.  So take ATTR_cockpit_region but NOT us.
-                        if oneWritten != attr:
-                            found.append(oneWritten)
+        setterPatterns = self._getSetterPatterns(attr)
+
+        # The attribute is a setter - the resetter is a counter part
+        found = [self.reseters[setterPattern] for setterPattern in setterPatterns]
+
+        # The pattern is a resetter or ONE of the setters.
+        # Every other setter but us is a counterpart.
+        counterpartPatterns = set(setterPatterns).union(self._getResetterPatterns(attr))
+        if counterpartPatterns:
+            for oneWritten in sorted(self.written.keys()):
+                # We have to check for ourselves - we might be taking every written attribute
+                # that is a SETTER that matches the reg-ex, e.g. we are ATTR_cockpit and we found
+                # ATTR_cockpit|ATTR_cockpit_region.  So take ATTR_cockpit_region but NOT us.
+                if oneWritten != attr and not counterpartPatterns.isdisjoint(
+                    self._getSetterPatterns(oneWritten)
+                ):
+                    found.append(oneWritten)
         return found
 
-    def writeReseters(self, xplaneObject: xplane_object.XPlaneObject) -> str:
-        """Writes ATTR_s needed to reset previous commands for a given XPlaneObject"""
-        debug = getDebug()
-        o = ""
-        indent = xplaneObject.xplaneBone.getIndent()
-
-        # create a temporary attributes dict
-        attributes = XPlaneAttributes()
-        # add custom attributes
-        for attr in xplaneObject.attributes:
-            if xplaneObject.attributes[attr].getValue():
-                attributes.add(xplaneObject.attributes[attr])
-
-        # add material attributes if any
-        if hasattr(xplaneObject, "material"):
-            for attr in xplaneObject.material.attributes:
-                if xplaneObject.material.attributes[attr].getValue():
-                    attributes.add(xplaneObject.material.attributes[attr])
-        # add cockpit attributes
-        for attr in xplaneObject.cockpitAttributes:
-            if xplaneObject.cockpitAttributes[attr].getValue():
-                attributes.add(xplaneObject.cockpitAttributes[attr])
-
-        WHITE_LIST = {
+    # Every known OBJ directive (except manips), see writeReseters
+    WHITE_LIST = frozenset(
+        {
             "ATTR_hud_glass",
             "ATTR_hud_reset",
             "ATTR_light_level",
@@ -357,6 +487,39 @@ class XPlaneCommands:
             "ATTR_solid_camera",
             "ATTR_no_solid_camera",
         }
+    )
+
+    def writeReseters(self, xplaneObject: xplane_object.XPlaneObject) -> str:
+        """Writes ATTR_s needed to reset previous commands for a given XPlaneObject"""
+        debug = getDebug()
+        o = ""
+        indent = xplaneObject.xplaneBone.getIndent()
+
+        # The names of the attributes this XPlaneObject will write.
+        # Like XPlaneAttributes.add, the values of repeated names are merged into
+        # the first attribute with that name
+        attributes: Dict[str, xplane_attribute.XPlaneAttribute] = {}
+
+        def add(attr: xplane_attribute.XPlaneAttribute) -> None:
+            if attr.name in attributes:
+                attributes[attr.name].addValues(attr.getValues())
+            else:
+                attributes[attr.name] = attr
+
+        # add custom attributes
+        for attr in xplaneObject.attributes.values():
+            if attr.getValue():
+                add(attr)
+
+        # add material attributes if any
+        if hasattr(xplaneObject, "material"):
+            for attr in xplaneObject.material.attributes.values():
+                if attr.getValue():
+                    add(attr)
+        # add cockpit attributes
+        for attr in xplaneObject.cockpitAttributes.values():
+            if attr.getValue():
+                add(attr)
 
         #  ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
         # <What's up with WHITE_LIST? IT'S A STUPID HACK!>
@@ -369,20 +532,18 @@ class XPlaneCommands:
         # because the next XPlaneObject passed in "has" it already.
         #
         # *
-        for attr in WHITE_LIST:
-            attributes.add(xplane_attribute.XPlaneAttribute(attr))
-
-        attributeNames = sorted(attributes.keys())
+        matchingAttributes: Dict[str, List[str]] = {}
+        for attr in sorted(attributes.keys() | self.WHITE_LIST):
+            for setterPattern in self._getSetterPatterns(attr):
+                matchingAttributes.setdefault(setterPattern, []).append(attr)
 
         # This is the attributes we have already stated that MIGHT need to be reset.
-        writtenNames = sorted(self.written.keys())
-        for setterPattern in sorted(self.reseters.keys()):
-            resetingAttr = self.reseters[setterPattern]
-            pattern = re.compile(setterPattern)
-
-            matchingWritten = [x for x in writtenNames if pattern.fullmatch(x)]
-            matchingAttribute = [x for x in attributeNames if pattern.fullmatch(x)]
+        matchingWrittens: Dict[str, List[str]] = {}
+        for written in sorted(self.written.keys()):
+            for setterPattern in self._getSetterPatterns(written):
+                matchingWrittens.setdefault(setterPattern, []).append(written)
 
+        for setterPattern, matchingAttribute in matchingAttributes.items():
             # Now that the added white list trick is in place,
             # we'll nearly always have 2 matching attributes
             if ("ATTR_cockpit" in matchingAttribute and len(matchingAttribute) > 5) or (
@@ -393,14 +554,17 @@ class XPlaneCommands:
                 )
                 print(matchingAttribute)
 
+        for setterPattern in sorted(matchingWrittens.keys()):
+            matchingWritten = matchingWrittens[setterPattern]
             if len(matchingWritten) > 1:
                 print("WARNING: multiple written attributes matched %s" % setterPattern)
                 print(matchingWritten)
 
-            if matchingWritten and not matchingAttribute:
+            if setterPattern not in matchingAttributes:
                 # only reset attributes that wont be written with this object again
                 # logger.info('writing Reseter for %s: %s' % (attr,self.reseters[attr]))
                 # write reseter and add it to written
+                resetingAttr = self.reseters[setterPattern]
                 o += indent + resetingAttr + "\n"
                 self.written[resetingAttr] = True
 
@@ -12,14 +12,30 @@ the header and XPlaneBone tree contents to a string
 """
 
 import collections
+import collections.abc
 import dataclasses
 import itertools
+import io
 import operator
 from pprint import pprint
-from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 import bpy
 import mathutils
+import numpy
+from bpy.app.handlers import persistent
 
 from io_xplane2blender import xplane_constants, xplane_helpers, xplane_props
 from io_xplane2blender.tests import test_creation_helpers
@@ -28,6 +44,7 @@ from io_xplane2blender.xplane_types import (
     xplane_material,
     xplane_material_utils,
 )
+from io_xplane2blender.xplane_utils.xplane_profiler import profiler
 
 from ..xplane_helpers import (
     BlenderParentType,
@@ -54,23 +71,32 @@ def createFilesFromBlenderRootObjects(
     scene: bpy.types.Scene, 
     view_layer: bpy.types.ViewLayer,
     only_selected_roots: bool = False,    
+    skip_root: Optional[Callable[[ExportableRoot], bool]] = None,
 ) -> List["XPlaneFile"]:
     """
     Returns a list of all created XPlaneFiles from all valid roots found,
     ignoring any that could not be created.
 
-    view_layer is needed to test exportability
+    view_layer is needed to test exportability. Exportable roots skip_root
+    returns True for aren't created at all
     """
     xplane_files: List["XPlaneFile"] = []
     
-    if only_selected_roots:
-        potential_roots = [ob for ob in scene.objects if ob.select_get()]
-    else:
-        potential_roots = (
-            scene.objects[:] + xplane_helpers.get_collections_in_scene(scene)[1:]
-        )
+    with profiler.phase("root discovery"):
+        if only_selected_roots:
+            potential_roots = [ob for ob in scene.objects if ob.select_get()]
+        else:
+            potential_roots = (
+                scene.objects[:] + xplane_helpers.get_collections_in_scene(scene)[1:]
+            )
     
     for potential_root in potential_roots:
+        if (
+            skip_root
+            and xplane_helpers.is_exportable_root(potential_root, view_layer)
+            and skip_root(potential_root)
+        ):
+            continue
         try:
             xplane_file = createFileFromBlenderRootObject(potential_root, view_layer)
         except NotExportableRootError as e:
@@ -78,13 +104,10 @@ def createFilesFromBlenderRootObjects(
         else:
             xplane_files.append(xplane_file)
 
-    # Without this the cache never gets cleared
-    # and no new animations are exported without a restart
-    _all_keyframe_infos.clear()
-
     return xplane_files
 
 
+@profiler.profiled("root discovery")
 def createFileFromBlenderRootObject(
     potential_root: PotentialRoot, view_layer: bpy.types.ViewLayer
 ) -> "XPlaneFile":
@@ -129,7 +152,8 @@ def createFileFromBlenderRootObject(
     filename = layer_props.name if layer_props.name else exportable_root.name
 
     xplane_file = XPlaneFile(filename, layer_props)
-    xplane_file.create_xplane_bone_hiearchy(exportable_root)
+    with profiler.file(filename):
+        xplane_file.create_xplane_bone_hiearchy(exportable_root)
     bpy.context.scene.frame_set(1)
     assert xplane_file.rootBone, "Root Bone was not assigned during __init__ function"
     return xplane_file
@@ -147,76 +171,512 @@ class LocRotPerFrame:
     ]
 
 
+# Index of each rotation_mode in PoseSnapshot.rotation_mode
+_ROTATION_MODES = ("QUATERNION", "XYZ", "XZY", "YXZ", "YZX", "ZXY", "ZYX", "AXIS_ANGLE")
+_ROTATION_MODE_CODES = {mode: code for code, mode in enumerate(_ROTATION_MODES)}
+
+
+class PoseSnapshot:
+    """
+    Every pose bone's location and rotation channels at each scanned frame,
+    in frames x bones x channels arrays filled with foreach_get
+    """
+
+    def __init__(self, armature: bpy.types.Object, frames: Iterable[int]) -> None:
+        self.frames = sorted(frames)
+        self._frame_indices = {frame_num: i for i, frame_num in enumerate(self.frames)}
+        self._pose_bones = armature.pose.bones
+        self.bone_indices = {bone.name: i for i, bone in enumerate(self._pose_bones)}
+
+        shape = (len(self.frames), len(self._pose_bones))
+        self.location = numpy.empty(shape + (3,), dtype=numpy.float32)
+        self.rotation_mode = numpy.empty(shape, dtype=numpy.uint8)
+        self.rotation_quaternion = numpy.empty(shape + (4,), dtype=numpy.float32)
+        self.rotation_euler = numpy.empty(shape + (3,), dtype=numpy.float32)
+        self.rotation_axis_angle = numpy.empty(shape + (4,), dtype=numpy.float32)
+
+    def capture(self, frame_num: int) -> None:
+        """Copies every pose bone's current channels into frame_num's row"""
+        i = self._frame_indices[frame_num]
+        for data_path in (
+            "location",
+            "rotation_quaternion",
+            "rotation_euler",
+            "rotation_axis_angle",
+        ):
+            self._pose_bones.foreach_get(data_path, getattr(self, data_path)[i].ravel())
+        # foreach_get can't read enums
+        self.rotation_mode[i] = [
+            _ROTATION_MODE_CODES[bone.rotation_mode] for bone in self._pose_bones
+        ]
+
+    def loc_rot(self, frame_num: int, bone_index: int) -> LocRotPerFrame:
+        """Returns what a LocRotPerFrame copied from the pose bone would be"""
+        i = self._frame_indices[frame_num]
+        rotation_mode = _ROTATION_MODES[self.rotation_mode[i, bone_index]]
+        if rotation_mode == "QUATERNION":
+            rotation = mathutils.Quaternion(
+                self.rotation_quaternion[i, bone_index].tolist()
+            )
+        elif rotation_mode == "AXIS_ANGLE":
+            rotation = tuple(self.rotation_axis_angle[i, bone_index].tolist())
+        else:
+            rotation = mathutils.Euler(
+                self.rotation_euler[i, bone_index].tolist(), rotation_mode
+            )
+        return LocRotPerFrame(
+            frame_num,
+            mathutils.Vector(self.location[i, bone_index].tolist()),
+            rotation_mode,
+            rotation,
+        )
+
+
+class PoseBoneFrames(collections.abc.Mapping):
+    """
+    A pose bone's keyed frames and their LocRotPerFrame, read from
+    a PoseSnapshot as XPlaneKeyframe asks for them
+    """
+
+    def __init__(
+        self, snapshot: PoseSnapshot, bone_name: str, frames: Iterable[int]
+    ) -> None:
+        self._snapshot = snapshot
+        self._bone_index = snapshot.bone_indices[bone_name]
+        self._frames = frozenset(frames)
+
+    def __getitem__(self, frame_num: int) -> LocRotPerFrame:
+        if frame_num not in self._frames:
+            raise KeyError(frame_num)
+        return self._snapshot.loc_rot(frame_num, self._bone_index)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self._frames))
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
 ObjectBoneNameKey = Tuple[str, str]
-FrameToLocRotPerFrame = Dict[int, LocRotPerFrame]
+FrameToLocRotPerFrame = Union[Dict[int, LocRotPerFrame], PoseBoneFrames]
 
 
-# IMPORTANT! You must clear this cache when finished exporting all your OBJs,
-# or you'll never export new animations! We clear in
-# - xplane_file.createFilesFromBlenderRootObjects - from using the export operator
-# - tests/__init__.exportExportableRoot - from using a test
+# This cache persists between exports. The handlers at the bottom of this section
+# forget an Object's (and its bones') entries when its action, armature, constraints,
+# parent or anything else about it changes, and everything on load, undo or redo.
+# Tests may still clear it to start from scratch, like
+# - tests/__init__.exportExportableRoot
 _all_keyframe_infos: Dict[
     str, Dict[ObjectBoneNameKey, FrameToLocRotPerFrame]
 ] = collections.defaultdict(dict)
 
+# Names of Objects, by scene, with an owner only the depsgraph could scan.
+# Drivers can move them when anything changes
+_depsgraph_dependent_owners: Dict[str, Set[str]] = collections.defaultdict(set)
+
+# True while _pre_scan_keyframes is calling frame_set, so we don't
+# invalidate what we're in the middle of scanning
+_scanning_keyframes = False
+
 
-def _pre_scan_all_keyframes():
-    """Returns a copy of all this scene's LocRotPerFrame, scanning for it as needed"""
+def _collect_keyframe_owners(exportable_root: ExportableRoot) -> List[bpy.types.Object]:
+    """
+    Returns every Object in this scene whose animation exportable_root's XPlaneBones
+    could read: all Objects under the root and their parents, even out of collection ones
+    """
+    if isinstance(exportable_root, bpy.types.Collection):
+        under_root = list(exportable_root.all_objects)
+    else:
+        under_root = [exportable_root]
+        to_visit = [exportable_root]
+        while to_visit:
+            children = to_visit.pop().children
+            under_root.extend(children)
+            to_visit.extend(children)
+
+    scene_objects = bpy.context.scene.objects
+    seen: Set[str] = set()
+    owners: List[bpy.types.Object] = []
+    for obj in under_root:
+        while obj and obj.name not in seen:
+            seen.add(obj.name)
+            if obj.name in scene_objects:
+                owners.append(obj)
+            obj = obj.parent
+    return owners
+
+
+def _keyed_dataref_frames(obj: bpy.types.Object) -> Dict[Optional[str], Set[int]]:
+    """
+    Returns the integer frames keyed by the xplane.datarefs fcurves of obj
+    (under None) and each of its pose bones (under the bone's name)
+    """
+
+    frames: Dict[Optional[str], Set[int]] = collections.defaultdict(set)
+
+    def add_frames(bone_name: Optional[str], fcurve: bpy.types.FCurve) -> None:
+        frames[bone_name].update(
+            int(kf.co[0]) for kf in fcurve.keyframe_points if kf.co[0].is_integer()
+        )
+
+    try:
+        fcurves = obj.animation_data.action.fcurves
+    except AttributeError:
+        fcurves = []
+    for fcurve in fcurves:
+        if fcurve.data_path.startswith("xplane.datarefs"):
+            add_frames(None, fcurve)
+
+    if obj.type == "ARMATURE":
+        # bone animation data resides in the armature objects .data block
+        try:
+            fcurves = obj.data.animation_data.action.fcurves
+        except AttributeError:
+            fcurves = []
+        for fcurve in fcurves:
+            data_path = fcurve.data_path
+            name_end = data_path.find('"].xplane.datarefs')
+            if data_path.startswith('bones["') and name_end != -1:
+                bone_name = data_path[len('bones["') : name_end]
+                if bone_name in obj.pose.bones:
+                    add_frames(bone_name, fcurve)
+    return frames
+
+
+# The only channels a LocRotPerFrame is ever made from
+_TRANSFORM_DATA_PATHS = {
+    "location",
+    "rotation_axis_angle",
+    "rotation_euler",
+    "rotation_quaternion",
+}
+
+TransformFCurves = Dict[Tuple[str, int], bpy.types.FCurve]
+
+
+def _fcurve_evaluable_channels(
+    obj: bpy.types.Object, bone_name: Optional[str]
+) -> Optional[TransformFCurves]:
+    """
+    Classifies obj (or its pose bone bone_name) as "fcurve-evaluable" or
+    "needs depsgraph".
+
+    Returns its action's transform fcurves, keyed by (data_path, array_index),
+    when its local location and rotation at any frame come only from them and
+    its own current values. Returns None when only frame_set can tell:
+    drivers, NLA, action blending, constraints, animated rotation_mode or
+    muted channels.
+    """
+    scene_render = bpy.context.scene.render
+    if scene_render.frame_map_old != scene_render.frame_map_new:
+        return None
+
+    rotatable = obj.pose.bones[bone_name] if bone_name else obj
+    if obj.constraints or rotatable.constraints:
+        return None
+
+    anim = obj.animation_data
+    if anim and (
+        anim.drivers
+        or anim.nla_tracks
+        or getattr(anim, "action_blend_type", "REPLACE") != "REPLACE"
+        or getattr(anim, "action_influence", 1.0) != 1.0
+    ):
+        return None
+    elif not anim or not anim.action:
+        return {}
+
+    # Pose bone channels live in the armature object's action
+    prefix = f'pose.bones["{bone_name}"].' if bone_name else ""
+    fcurves: TransformFCurves = {}
+    for fcurve in anim.action.fcurves:
+        if not fcurve.data_path.startswith(prefix):
+            continue
+        channel = fcurve.data_path[len(prefix) :]
+        if channel == "rotation_mode":
+            return None
+        elif channel in _TRANSFORM_DATA_PATHS:
+            if fcurve.mute or (fcurve.group and fcurve.group.mute):
+                return None
+            fcurves[(channel, fcurve.array_index)] = fcurve
+    return fcurves
+
+
+def _evaluate_loc_rot(
+    rotatable: Union[bpy.types.Object, bpy.types.PoseBone],
+    fcurves: TransformFCurves,
+    frame_num: int,
+) -> LocRotPerFrame:
+    """
+    Returns what frame_set(frame_num) would leave in rotatable's location and
+    rotation, for an owner _fcurve_evaluable_channels accepted
+    """
+
+    def evaluate(data_path: str, current: Iterable[float]) -> List[float]:
+        return [
+            fcurves[(data_path, i)].evaluate(frame_num)
+            if (data_path, i) in fcurves
+            else value
+            for i, value in enumerate(current)
+        ]
+
+    rotation_mode = rotatable.rotation_mode
+    if rotation_mode == "QUATERNION":
+        rotation = mathutils.Quaternion(
+            evaluate("rotation_quaternion", rotatable.rotation_quaternion)
+        )
+    elif rotation_mode == "AXIS_ANGLE":
+        rotation = tuple(
+            evaluate("rotation_axis_angle", rotatable.rotation_axis_angle)
+        )
+    else:
+        rotation = mathutils.Euler(
+            evaluate("rotation_euler", rotatable.rotation_euler),
+            rotatable.rotation_euler.order,
+        )
+
+    return LocRotPerFrame(
+        frame_num,
+        mathutils.Vector(evaluate("location", rotatable.location)),
+        rotation_mode,
+        rotation,
+    )
+
+
+@dataclasses.dataclass
+class FrameVisit:
+    """
+    Everything the keyframe scan reads at one frame, so it all shares one frame_set,
+    and which owners ("Object" or "Armature/Bone") keyed it
+    """
+
+    owners: List[
+        Tuple[ObjectBoneNameKey, Union[bpy.types.Object, bpy.types.PoseBone]]
+    ] = dataclasses.field(default_factory=list)
+    snapshots: List[PoseSnapshot] = dataclasses.field(default_factory=list)
+    reasons: List[str] = dataclasses.field(default_factory=list)
+
+
+def _describe_frame_plan(frame_plan: Dict[int, FrameVisit]) -> str:
+    """
+    Summarizes which frames a frame plan visits for which owners,
+    with runs of frames for the same owners written as ranges, like "1-3: Cube, Armature/Bone"
+    """
+    runs: List[Tuple[int, int, Tuple[str, ...]]] = []
+    for frame_num in sorted(frame_plan):
+        reasons = tuple(sorted(frame_plan[frame_num].reasons))
+        if runs and runs[-1][1] == frame_num - 1 and runs[-1][2] == reasons:
+            runs[-1] = (runs[-1][0], frame_num, reasons)
+        else:
+            runs.append((frame_num, frame_num, reasons))
+    return "; ".join(
+        f"{start if start == end else f'{start}-{end}'}: {', '.join(reasons)}"
+        for start, end, reasons in runs
+    )
+
+
+@profiler.profiled("keyframe scan")
+def _pre_scan_keyframes(
+    exportable_root: ExportableRoot, use_fcurve_evaluation: bool = True
+) -> None:
+    """
+    Fills this scene's _all_keyframe_infos with the LocRotPerFrame of every
+    Object and bone exportable_root could animate, scanning for them as needed.
+
+    When use_fcurve_evaluation is True, "fcurve-evaluable" owners are read
+    straight from their fcurves and only frames keyed by owners that need
+    the depsgraph cost a frame_set
+    """
 
     ###--- THIS IS A HOTPATH -------------------------------------------------
     # Do not change without profiling
     #
-    # Calling frame_set __once__ per every keyframe in a scene is
-    # a huge performance win. We cache the results in case the user has multiple roots
-    # in a scene
-
-    global _all_keyframe_infos
-    if bpy.context.scene.name in _all_keyframe_infos:
-        return
-    else:
-        scene_keyframe_infos = collections.defaultdict(dict)
-
-    # A set of all keyframes that could have data we care about
-    frames_to_visit = sorted(
-        {
-            int(kf.co[0])
-            for action in bpy.data.actions
-            for fcurve in action.fcurves
-            for kf in fcurve.keyframe_points
-            if kf.co[0].is_integer()
-        }
+    # Calling frame_set __once__ per every keyframe the root uses is
+    # a huge performance win. We only visit frames keyed by the xplane.datarefs
+    # of Objects and bones the root could export, never unrelated actions,
+    # and we cache the results in case the user has multiple roots in a scene
+    # or exports again without changing anything
+
+    global _scanning_keyframes
+    scene = bpy.context.scene
+    # Flushes any pending edits through the handlers before we trust the cache
+    bpy.context.view_layer.update()
+    scene_keyframe_infos = _all_keyframe_infos[scene.name]
+
+    # Only the frames keyed by owners that need the depsgraph are visited
+    frame_plan: Dict[int, FrameVisit] = collections.defaultdict(FrameVisit)
+    fcurve_evaluated_owners = 0
+    cached_owners = 0
+    # Pose bones are snapshot all at once per armature
+    armatures: Dict[str, bpy.types.Object] = {}
+    bone_frames_per_armature: Dict[str, Dict[str, Set[int]]] = collections.defaultdict(
+        dict
     )
 
+    # --- Begin owners to scan -------------------
+    for obj in _collect_keyframe_owners(exportable_root):
+        for bone_name, frames in _keyed_dataref_frames(obj).items():
+            key = (obj.name, bone_name)
+            # Already scanned for a previous root
+            if key in scene_keyframe_infos:
+                cached_owners += 1
+                continue
+            scene_keyframe_infos[key] = {}
+            rotatable = obj.pose.bones[bone_name] if bone_name else obj
+            fcurves = (
+                _fcurve_evaluable_channels(obj, bone_name)
+                if use_fcurve_evaluation
+                else None
+            )
+            if fcurves is None:
+                _depsgraph_dependent_owners[scene.name].add(obj.name)
+                if bone_name:
+                    armatures[obj.name] = obj
+                    bone_frames_per_armature[obj.name][bone_name] = frames
+                    for frame_num in frames:
+                        frame_plan[frame_num].reasons.append(f"{obj.name}/{bone_name}")
+                else:
+                    for frame_num in frames:
+                        frame_plan[frame_num].owners.append((key, rotatable))
+                        frame_plan[frame_num].reasons.append(obj.name)
+            else:
+                fcurve_evaluated_owners += 1
+                scene_keyframe_infos[key].update(
+                    (frame_num, _evaluate_loc_rot(rotatable, fcurves, frame_num))
+                    for frame_num in frames
+                )
+    # --- End owners to scan ---------------------
+
+    snapshots: Dict[str, PoseSnapshot] = {
+        armature_name: PoseSnapshot(
+            armatures[armature_name], set().union(*bone_frames.values())
+        )
+        for armature_name, bone_frames in bone_frames_per_armature.items()
+    }
+    for snapshot in snapshots.values():
+        for frame_num in snapshot.frames:
+            frame_plan[frame_num].snapshots.append(snapshot)
+
+    if (
+        bpy.context.scene.xplane.plugin_development
+        and bpy.context.scene.xplane.dev_profile_export
+    ):
+        logger.info(
+            f"Keyframe scan for {exportable_root.name} visits {len(frame_plan)} frames"
+            f" ({fcurve_evaluated_owners} owners read from fcurves, {cached_owners} cached)"
+            + (f": {_describe_frame_plan(frame_plan)}" if frame_plan else "")
+        )
+
     # --- Begin frames to visit-------------------
-    for frame_num in frames_to_visit:
-        bpy.context.scene.frame_set(frame_num)
-
-        # --- Begin objects to visit -------------
-        for obj in bpy.context.scene.objects:
-            if obj.type == "ARMATURE":
-                # --- Begin bones to visit -------
-                for bone in obj.pose.bones:
-                    l = LocRotPerFrame(
-                        frame_num,
-                        bone.location.copy(),
-                        bone.rotation_mode,
-                        xplane_helpers.get_rotation_from_rotatable(bone),
-                    )
+    _scanning_keyframes = True
+    try:
+        for frame_num in sorted(frame_plan):
+            scene.frame_set(frame_num)
+            frame_visit = frame_plan[frame_num]
+            for key, rotatable in frame_visit.owners:
+                scene_keyframe_infos[key][frame_num] = LocRotPerFrame(
+                    frame_num,
+                    rotatable.location.copy(),
+                    rotatable.rotation_mode,
+                    xplane_helpers.get_rotation_from_rotatable(rotatable),
+                )
+            for snapshot in frame_visit.snapshots:
+                snapshot.capture(frame_num)
+        # Collection happens at frame 1, even when nothing needed frame_set
+        if scene.frame_current != 1:
+            scene.frame_set(1)
+    finally:
+        _scanning_keyframes = False
+    # --- End frames to visit---------------------
 
-                    scene_keyframe_infos[(obj.name, bone.name)][frame_num] = l
-                # --- End bones to visit ---------
-            l = LocRotPerFrame(
-                frame_num,
-                obj.location.copy(),
-                obj.rotation_mode,
-                xplane_helpers.get_rotation_from_rotatable(obj),
+    for armature_name, bone_frames in bone_frames_per_armature.items():
+        for bone_name, frames in bone_frames.items():
+            scene_keyframe_infos[(armature_name, bone_name)] = PoseBoneFrames(
+                snapshots[armature_name], bone_name, frames
             )
-            scene_keyframe_infos[(obj.name, None)][frame_num] = l
-        # --- End objects to visit ---------------
-    # --- End frames to visit---------------------
-    bpy.context.scene.frame_set(1)
-    _all_keyframe_infos[bpy.context.scene.name] = scene_keyframe_infos
-    return
+
+
+def invalidate_keyframe_infos(obj_names: Iterable[str]) -> None:
+    """Forgets the cached LocRotPerFrame of these Objects and their bones, in every scene"""
+    obj_names = set(obj_names)
+    for scene_name, scene_keyframe_infos in _all_keyframe_infos.items():
+        for key in [key for key in scene_keyframe_infos if key[0] in obj_names]:
+            del scene_keyframe_infos[key]
+        _depsgraph_dependent_owners[scene_name] -= obj_names
+
+
+def _changed_keyframe_owners(
+    depsgraph: bpy.types.Depsgraph, during_frame_change: bool
+) -> Set[str]:
+    """
+    Returns the names of Objects whose cached LocRotPerFrame the depsgraph's
+    updates could have changed.
+
+    A frame change updates every animated Object without changing its keyframes,
+    so then only edited Actions and Armatures count
+    """
+    changed_objects: Set[str] = set()
+    changed_datablocks = set()
+    for update in depsgraph.updates:
+        changed_id = update.id.original
+        if isinstance(changed_id, bpy.types.Object):
+            if not during_frame_change:
+                changed_objects.add(changed_id.name)
+        elif isinstance(changed_id, (bpy.types.Action, bpy.types.Armature)):
+            changed_datablocks.add(changed_id)
+
+    if changed_datablocks:
+        for obj in bpy.data.objects:
+            anim_datablocks = {obj.data}
+            for anim in (obj.animation_data, getattr(obj.data, "animation_data", None)):
+                if anim:
+                    anim_datablocks.add(anim.action)
+            if not changed_datablocks.isdisjoint(anim_datablocks):
+                changed_objects.add(obj.name)
+
+    if changed_objects:
+        for dependent_owners in _depsgraph_dependent_owners.values():
+            changed_objects |= dependent_owners
+    return changed_objects
+
+
+@persistent
+def _keyframe_infos_depsgraph_update_handler(
+    scene: bpy.types.Scene, depsgraph: Optional[bpy.types.Depsgraph] = None
+) -> None:
+    if not _all_keyframe_infos or _scanning_keyframes:
+        return
+    invalidate_keyframe_infos(
+        _changed_keyframe_owners(
+            depsgraph or bpy.context.evaluated_depsgraph_get(), False
+        )
+    )
+
+
+@persistent
+def _keyframe_infos_frame_change_handler(
+    scene: bpy.types.Scene, depsgraph: Optional[bpy.types.Depsgraph] = None
+) -> None:
+    if not _all_keyframe_infos or _scanning_keyframes:
+        return
+    invalidate_keyframe_infos(
+        _changed_keyframe_owners(
+            depsgraph or bpy.context.evaluated_depsgraph_get(), True
+        )
+    )
+
+
+@persistent
+def _keyframe_infos_clear_handler(dummy) -> None:
+    _all_keyframe_infos.clear()
+    _depsgraph_dependent_owners.clear()
+
+
+bpy.app.handlers.depsgraph_update_post.append(_keyframe_infos_depsgraph_update_handler)
+bpy.app.handlers.frame_change_post.append(_keyframe_infos_frame_change_handler)
+bpy.app.handlers.load_post.append(_keyframe_infos_clear_handler)
+bpy.app.handlers.undo_post.append(_keyframe_infos_clear_handler)
+bpy.app.handlers.redo_post.append(_keyframe_infos_clear_handler)
 
 
 class XPlaneFile:
@@ -247,13 +707,14 @@ class XPlaneFile:
         # Header assumes that its xplaneFile is completely formed
         self.header = XPlaneHeader(self, 8)
 
-        # You'll never ever forget to call XPlaneFile, so,
-        # we stick this here
-        _pre_scan_all_keyframes()
-
+    @profiler.profiled("bone hierarchy")
     def create_xplane_bone_hiearchy(
         self, exportable_root: ExportableRoot
     ) -> Optional[XPlaneObject]:
+        # XPlaneBones read their keyframes from the cache as they're made,
+        # so it must be filled before we start recursing
+        _pre_scan_keyframes(exportable_root)
+
         def allowed_children(
             parent_like: Union[bpy.types.Collection, bpy.types.Object]
         ) -> List[bpy.types.Object]:
@@ -624,6 +1085,10 @@ class XPlaneFile:
         else:
             assert False, f"Unsupported root_object type {type(exportable_root)}"
 
+        # The tree is final, every bone's matrices can now be computed just once
+        if self.rootBone:
+            self.rootBone.fillMatrixCache()
+
     def get_xplane_objects(self) -> List["XPlaneObject"]:
         """
         Returns a list of all XPlaneObjects collected by recursing down the
@@ -643,6 +1108,7 @@ class XPlaneFile:
 
         return get_xplane_objects_from_bone_tree(self.rootBone)
 
+    @profiler.profiled("material validation")
     def validateMaterials(self) -> bool:
         objects = self.get_xplane_objects()
 
@@ -711,6 +1177,7 @@ class XPlaneFile:
 
         return materials
 
+    @profiler.profiled("material validation")
     def compareMaterials(self, refMaterials):
         materials = self.getMaterials()
 
@@ -759,9 +1226,35 @@ class XPlaneFile:
     def write(self) -> str:
         """
         Writes the contents of the file to one giant string with \n's,
-        to be written to a file or compared in a unit test
+        to be compared in a unit test. Exporting uses writeTo instead
+        """
+        out = io.StringIO()
+        self.writeTo(out)
+        return out.getvalue()
+
+    def writeTo(self, out: TextIO) -> None:
+        """
+        Streams the contents of the file into out, section by section,
+        so the whole OBJ never has to be held in memory as one string.
+
+        Nothing is written if validation fails, but errors found while writing
+        can leave out partially written. Check logger.hasErrors() afterwards
         """
         self.mesh.collectXPlaneObjects(self.get_xplane_objects())
+        if bpy.context.scene.xplane.optimize and bpy.context.scene.xplane.optimize_weld:
+            logger.info(
+                f"Welding nearby vertices in {self.filename} saved {self.mesh.welded_vertices} vertices"
+            )
+        if (
+            bpy.context.scene.xplane.optimize
+            and bpy.context.scene.xplane.optimize_vertex_cache
+            and self.mesh.vertex_cache_triangles
+        ):
+            logger.info(
+                f"Vertex cache optimization in {self.filename} changed its ACMR from"
+                f" {self.mesh.vertex_cache_misses_before / self.mesh.vertex_cache_triangles:.3f}"
+                f" to {self.mesh.vertex_cache_misses_after / self.mesh.vertex_cache_triangles:.3f}"
+            )
 
         # - validateMaterials() > every object's material's XPlaneMaterial.isValid > xplane_material_utils.validate
         # - getReferenceMaterials can end up revalidating all of self.getMaterials
@@ -772,13 +1265,14 @@ class XPlaneFile:
         # and no "reference material" can be used without all materials being consistenly correct.
         # The downside is tediousness when one material is slightly wrong
         if not self.validateMaterials():
-            return ""
+            return
         if not self.validateOptions():
-            return ""
+            return
 
-        self.referenceMaterials = xplane_material_utils.getReferenceMaterials(
-            self.getMaterials(), self.options.export_type
-        )
+        with profiler.phase("material validation"):
+            self.referenceMaterials = xplane_material_utils.getReferenceMaterials(
+                self.getMaterials(), self.options.export_type
+            )
 
         refMatNames = [refMat.name for refMat in self.referenceMaterials if refMat]
         logger.info(
@@ -790,37 +1284,33 @@ class XPlaneFile:
         #    logger.info('Autodetect textures overridden for file %s: not fully checking manually entered textures against Blender-based reference materials\' textures' % (self.filename))
 
         if not self.compareMaterials(self.referenceMaterials):
-            return ""
+            return
 
-        o = ""
-        o += self.header.write()
-        o += "\n"
+        out.write(self.header.write())
+        out.write("\n")
 
-        meshOut = self.mesh.write()
-        o += meshOut
-
-        if len(meshOut):
-            o += "\n"
+        if self.mesh.writeTo(out):
+            out.write("\n")
 
         # TODO: Deprecate this one day...
         lightsOut = self.lights.write()
-        o += lightsOut
+        out.write(lightsOut)
 
         if len(lightsOut):
-            o += "\n"
-
-        lodsOut = self._writeLods()
-        o += lodsOut
+            out.write("\n")
 
-        if len(lodsOut):
-            o += "\n"
+        if self._writeLodsTo(out):
+            out.write("\n")
 
-        o += self.writeFooter()
+        out.write(self.writeFooter())
 
-        return o
-
-    def _writeLods(self) -> str:
-        o = ""
+    @profiler.profiled("commands")
+    def _writeLodsTo(self, out: TextIO) -> int:
+        """
+        Streams the commands into out, once per LOD bucket if there are any.
+        Returns the number of characters written
+        """
+        written = 0
         num_lods = int(self.options.lods)
 
         if num_lods:
@@ -831,7 +1321,7 @@ class XPlaneFile:
                 logger.error(
                     f"{self.filename}'s LOD buckets must start at 0, is {defined_buckets[0].near}"
                 )
-                return o
+                return written
 
             for bucket_number in range(0, int(self.options.lods)):
                 near = self.options.lod[bucket_number].near
@@ -841,7 +1331,7 @@ class XPlaneFile:
                     logger.error(
                         f"{self.filename}'s LOD bucket #{bucket_number+1}'s Near and Far match: ({near}, {far})"
                     )
-                    return o
+                    return written
                 # LOD spec #3
                 elif near > far:
                     logger.error(
@@ -929,11 +1419,21 @@ class XPlaneFile:
             # -----------------------------------------------------------------
             # LOD spec #1, this is written before the first ever
             # or subsequent calls to commands.write
-            for lod_bucket_index, lod_bucket in enumerate(defined_buckets):
-                o += f"ATTR_LOD\t{lod_bucket.near}\t{lod_bucket.far}\n"
-                o += self.commands.write(lod_bucket_index=lod_bucket_index)
+            # The bone tree is walked (and its animations written) once for all buckets
+            for lod_bucket, commandsOut in zip(
+                defined_buckets, self.commands.writeLods(range(len(defined_buckets)))
+            ):
+                written += out.write(f"ATTR_LOD\t{lod_bucket.near}\t{lod_bucket.far}\n")
+                written += out.write(commandsOut)
         else:
-            o += self.commands.write(lod_bucket_index=None)
+            written += out.write(self.commands.write(lod_bucket_index=None))
+
+        if (
+            bpy.context.scene.xplane.optimize
+            and bpy.context.scene.xplane.optimize_animations
+        ):
+            logger.info(
+                f"Merging animation blocks in {self.filename} removed {self.commands.removed_anim_blocks} ANIM blocks"
+            )
 
-        # print(o)
-        return o
+        return written
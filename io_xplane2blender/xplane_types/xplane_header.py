@@ -22,6 +22,7 @@ from .xplane_attribute import XPlaneAttribute, XPlaneAttributeName
 from .xplane_attributes import XPlaneAttributes
 
 from ..xplane_utils.xplane_effective_gloss import get_effective_gloss
+from ..xplane_utils.xplane_profiler import profiler
 
 
 class XPlaneHeader:
@@ -155,6 +156,7 @@ class XPlaneHeader:
         # previously labeled object attributes, it must be the last thing
         self.attributes.add(XPlaneAttribute("POINT_COUNTS", None))
 
+    @profiler.profiled("header init")
     def _init(self):
         """
         This must be called after all other collection is done. This is needed
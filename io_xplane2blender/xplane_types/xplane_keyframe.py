@@ -1,5 +1,4 @@
-import copy
-from typing import Tuple
+from typing import Tuple, Union
 
 import bpy
 import mathutils
@@ -9,6 +8,23 @@ from io_xplane2blender.xplane_constants import PRECISION_KEYFRAME
 
 
 class XPlaneKeyframe:
+    """
+    A keyframe's dataref value, location and rotation, copied out of Blender.
+
+    Treat XPlaneKeyframes as immutable: conversions return new ones that share
+    every unchanged field, so nothing ever needs to be (deep)copied
+    """
+
+    __slots__ = (
+        "dataref",
+        "dataref_values_index",
+        "dataref_value",
+        "frame_num",
+        "location",
+        "rotationMode",
+        "rotation",
+    )
+
     def __init__(
         self,
         keyframe: bpy.types.Keyframe,
@@ -83,11 +99,9 @@ class XPlaneKeyframe:
             self.rotation = mathutils.Euler(angles, order)
             assert isinstance(self.rotation, mathutils.Euler)
 
-        self.scale = copy.copy(blenderObject.scale)
-
     def __str__(self) -> str:
-        # TODO: We aren't printing out the bone, or saving it, because we haven't solved the deepcopy
-        # of xplaneBone. Currently, that just poses an issue for debugging (and if all you need is the name
+        # TODO: We aren't printing out the bone, or saving it, to keep keyframes small.
+        # Currently, that just poses an issue for debugging (and if all you need is the name
         # of the bone to track it down, you can certainly store the name!)
         return "Value={} Dataref={} Rotation Mode={} Rotation=({}) Location=({})".format(
             self.dataref_value,
@@ -97,31 +111,48 @@ class XPlaneKeyframe:
             self.location,
         )
 
-    def asAA(self) -> "XPlaneKeyframe":
+    def withRotation(
+        self,
+        rotation_mode: str,
+        rotation: Union[
+            mathutils.Euler, mathutils.Quaternion, Tuple[float, mathutils.Vector]
+        ],
+    ) -> "XPlaneKeyframe":
         """
-        Returns a copy of this keyframe converted to AA (as needed)
+        Returns a new keyframe with this one's dataref, value and location
+        and the given rotation
         """
-        keyframe = copy.deepcopy(self)
+        keyframe = XPlaneKeyframe.__new__(XPlaneKeyframe)
+        keyframe.dataref = self.dataref
+        keyframe.dataref_values_index = self.dataref_values_index
+        keyframe.dataref_value = self.dataref_value
+        keyframe.frame_num = self.frame_num
+        keyframe.location = self.location
+        keyframe.rotationMode = rotation_mode
+        keyframe.rotation = rotation
+        return keyframe
 
+    def asAA(self) -> "XPlaneKeyframe":
+        """
+        Returns this keyframe converted to AA (as needed)
+        """
         if self.rotationMode == "AXIS_ANGLE":
-            pass
+            keyframe = self
         elif self.rotationMode == "QUATERNION":
-            axisAngle = keyframe.rotation.normalized().to_axis_angle()
-            keyframe.rotation = (axisAngle[1], axisAngle[0].normalized())
-        else:
-            rotation = keyframe.rotation
-            euler_axis = mathutils.Euler(
-                (rotation.x, rotation.y, rotation.z), rotation.order
+            axisAngle = self.rotation.normalized().to_axis_angle()
+            keyframe = self.withRotation(
+                "AXIS_ANGLE", (axisAngle[1], axisAngle[0].normalized())
             )
-
+        else:
             # Very annoyingly, to_axis_angle and blenderObject.rotation_axis_angle disagree
             # about (angle, axis_x, axis_y, axis_z) vs (axis, (angle))
-            new_rotation = euler_axis.to_quaternion().to_axis_angle()
+            new_rotation = self.rotation.to_quaternion().to_axis_angle()
             new_rotation_axis = new_rotation[0]
             new_rotation_angle = new_rotation[1]
-            keyframe.rotation = (new_rotation_angle, new_rotation_axis.normalized())
+            keyframe = self.withRotation(
+                "AXIS_ANGLE", (new_rotation_angle, new_rotation_axis.normalized())
+            )
 
-        keyframe.rotationMode = "AXIS_ANGLE"
         assert isinstance(keyframe.rotation, tuple)
         assert isinstance(keyframe.rotation[0], float)
         assert isinstance(keyframe.rotation[1], mathutils.Vector)
@@ -130,39 +161,35 @@ class XPlaneKeyframe:
 
     def asEuler(self) -> "XPlaneKeyframe":
         """
-        Returns a copy of this keyframe converted to Euler (XZY) (as needed)
+        Returns this keyframe converted to Euler (XZY) (as needed)
         """
-        keyframe = copy.deepcopy(self)
         if self.rotationMode == "AXIS_ANGLE":
-            angle = keyframe.rotation[0]
-            axis = keyframe.rotation[1]
+            angle = self.rotation[0]
+            axis = self.rotation[1]
             # Why the heck XZY?  Jonathan's 2.49 exporter decomposes Eulers using XYZ (because that is the ONLY
             # decomposition available in 2.49), but it does so in X-Plane space.  So this is an axis renaming
             # (since we alway work in Blender space) so that it comes out the same in X-Plane.
-            keyframe.rotation = mathutils.Quaternion(axis, angle).to_euler("XZY")
-            keyframe.rotationMode = keyframe.rotation.order
-            return keyframe
+            rotation = mathutils.Quaternion(axis, angle).to_euler("XZY")
+            return self.withRotation(rotation.order, rotation)
         elif self.rotationMode == "QUATERNION":
-            keyframe.rotation = keyframe.rotation.to_euler("XZY")
-            keyframe.rotationMode = keyframe.rotation.order
-            return keyframe
+            rotation = self.rotation.to_euler("XZY")
+            return self.withRotation(rotation.order, rotation)
         else:
-            return keyframe
+            return self
 
     def asQuaternion(self) -> "XPlaneKeyframe":
         """
-        Returns a copy of this keyframe converted to Quaternion (as needed)
+        Returns this keyframe converted to Quaternion (as needed)
         """
-        keyframe = copy.deepcopy(self)
         if self.rotationMode == "AXIS_ANGLE":
-            angle = keyframe.rotation[0]
-            axis = keyframe.rotation[1]
-            keyframe.rotation = mathutils.Quaternion(axis, angle).normalized()
-            keyframe.rotationMode = "QUATERNION"
-            return keyframe
+            angle = self.rotation[0]
+            axis = self.rotation[1]
+            return self.withRotation(
+                "QUATERNION", mathutils.Quaternion(axis, angle).normalized()
+            )
         elif self.rotationMode == "QUATERNION":
-            return keyframe
+            return self
         else:
-            keyframe.rotation = keyframe.rotation.to_quaternion().normalized()
-            keyframe.rotationMode = "QUATERNION"
-            return keyframe
+            return self.withRotation(
+                "QUATERNION", self.rotation.to_quaternion().normalized()
+            )
@@ -1,8 +1,7 @@
-import copy
 import math
 from collections import namedtuple
 from collections.abc import MutableSequence, Iterable
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import bpy
 import mathutils
@@ -10,6 +9,7 @@ from mathutils import Vector
 
 from io_xplane2blender import xplane_constants
 from io_xplane2blender.xplane_helpers import round_vec
+from io_xplane2blender.xplane_utils import xplane_rotations
 from io_xplane2blender.xplane_types.xplane_keyframe import XPlaneKeyframe
 
 
@@ -32,84 +32,67 @@ class XPlaneKeyframeCollection(MutableSequence):
         data - A list of XPlaneKeyframes, all with the same dataref and
         rotationMode, at least 2 entries big.
 
-        XPlaneKeyframeCollection may mutate some of the keyframe data to maintain a reference
-        axis of animation.
+        XPlaneKeyframeCollection may replace some of its keyframes with flipped ones to maintain
+        a reference axis of animation. data and its keyframes are never changed.
         """
 
         super().__init__()
         assert data is not None and len(data) >= 2
         assert len({kf.dataref for kf in data}) == 1
         assert len({kf.rotationMode for kf in data}) == 1
-        self._list = copy.deepcopy(data)
-
-        # _makeReferenceAxes uses a "cute but regrettable" recursive strategy for
-        # converting Quaternions->AA->Euler as needed
-        def _makeReferenceAxes(keyframes):
-            axes = []
-            if keyframes.getRotationMode() == "QUATERNION":
-                keyframes.toAA()
-
-            if keyframes.getRotationMode() == "AXIS_ANGLE":
-                refAxis = None
-                refAxisInv = None
-
-                for keyframe in keyframes:
-                    angle = keyframe.rotation[0]
-                    axis = keyframe.rotation[1]
-
-                    def round_vector(vec, ndigits=5):
-                        v = Vector([round(comp, ndigits) for comp in vec])
-                        return v
-
-                    """
-                    This section covers the following cases
-                    - keyframe has 0 degrees of rotation, so no axis should be produced
-                    - refAxis and axis are the same. If this happens for all keyframes, 1 reference axis will be returned! Yay!
-                    - Correct axis that are the same as the previous reference axes, just inverted
-                    - If at least two axis are different, we convert to Euler angles
-                    """
-                    if round(angle, 5) == 0:
-                        continue
-                    elif refAxis == None:
-                        refAxis = axis
-                        refAxisInv = refAxis * -1
-                    elif round_vector(refAxis) == round_vector(axis):
-                        continue
-                    elif round_vector(refAxisInv) == round_vector(axis):
-                        keyframe.rotation = (angle * -1, axis * -1)
-                    else:
-                        return _makeReferenceAxes(keyframes.toEuler())
+        self._list = list(data)
 
-                # If our AA's W component was 0 the whole time, we need a default
-                if refAxis == None:
-                    refAxis = mathutils.Vector((0, 0, 1))
-                axes.append(refAxis)
-            else:
-                try:
-                    eulerAxesOrdering = self.EULER_AXIS_ORDERING[
-                        keyframes.getRotationMode()
-                    ]
-                    eulerAxes = [
-                        mathutils.Vector((1.0, 0.0, 0.0)),
-                        mathutils.Vector((0.0, 1.0, 0.0)),
-                        mathutils.Vector((0.0, 0.0, 1.0)),
-                    ]
-                    for axis in eulerAxesOrdering:
-                        axes.append(eulerAxes[axis])
-                except:
-                    raise Exception(
-                        "Rotation mode %s doesn't exist in eulerAxisMap"
-                        % (keyframes.getRotationMode())
-                    )
+        self._referenceAxes = self._makeReferenceAxes()
+        assert len(self._referenceAxes) == 1 or len(self._referenceAxes) == 3
+        assert all(isinstance(axis, Vector) for axis in self._referenceAxes)
 
-            assert len(axes) == 1 or len(axes) == 3
-            assert (
-                len([axis for axis in axes if not isinstance(axis, mathutils.Vector)])
-                == 0
+    def _makeReferenceAxes(self) -> List[Vector]:
+        """
+        Converts Quaternions->AA->Euler as needed and returns the reference axis
+        (or axes) of animation. All of the AA keyframes are checked at once by
+        xplane_rotations.find_reference_axis
+        """
+        if self.getRotationMode() == "QUATERNION":
+            self.toAA()
+
+        if self.getRotationMode() == "AXIS_ANGLE":
+            """
+            This covers the following cases
+            - keyframe has 0 degrees of rotation, so no axis should be produced
+            - refAxis and axis are the same. If this happens for all keyframes, 1 reference axis will be returned! Yay!
+            - Correct axis that are the same as the previous reference axes, just inverted
+            - If at least two axis are different, we convert to Euler angles
+            """
+            ref_row, flips, is_shared = xplane_rotations.find_reference_axis(
+                xplane_rotations.axis_angles_to_array(
+                    keyframe.rotation for keyframe in self
+                ),
+                ndigits=5,
             )
-            return axes, keyframes.getRotationMode()
+            for i in flips.nonzero()[0].tolist():
+                angle, axis = self[i].rotation
+                self[i] = self[i].withRotation("AXIS_ANGLE", (angle * -1, axis * -1))
 
-        self._referenceAxes, final_rotation_mode = _makeReferenceAxes(self)
+            if is_shared:
+                # If our AA's W component was 0 the whole time, we need a default
+                if ref_row is None:
+                    return [mathutils.Vector((0, 0, 1))]
+                return [self[ref_row].rotation[1]]
+            self.toEuler()
+
+        try:
+            eulerAxesOrdering = self.EULER_AXIS_ORDERING[self.getRotationMode()]
+        except KeyError:
+            raise Exception(
+                "Rotation mode %s doesn't exist in eulerAxisMap"
+                % (self.getRotationMode())
+            )
+        eulerAxes = [
+            mathutils.Vector((1.0, 0.0, 0.0)),
+            mathutils.Vector((0.0, 1.0, 0.0)),
+            mathutils.Vector((0.0, 0.0, 1.0)),
+        ]
+        return [eulerAxes[axis] for axis in eulerAxesOrdering]
 
     def __repr__(self):
         return "<{0} {1}>".format(self.__class__.__name__, self._list)
@@ -247,7 +230,7 @@ class XPlaneKeyframeCollection(MutableSequence):
     # Returns list  of tuples of (keyframe.dataref_value, keyframe.location)
     # with location being a Vector in Blender form and scaled by the scaling amount
     def getTranslationKeyframeTableWScale(self):
-        pre_scale = self[0].xplaneBone.getPreAnimationMatrix().decompose()[2]
+        pre_scale = self[0].xplaneBone.getPreAnimationScale()
         return [
             (value, location * pre_scale)
             for value, location in self.getTranslationKeyframeTable()
@@ -274,6 +257,41 @@ class XPlaneKeyframeCollection(MutableSequence):
         self._list = [keyframe.asQuaternion() for keyframe in self]
         return self
 
+    @staticmethod
+    def _find_1st_non_clamping(keyframes, attr: str) -> int:
+        """
+        Returns the index of the first keyframe whose "location" or "degrees"
+        (attr) differs from the next one's, the last of any leading clamping keyframes.
+
+        Raises ValueError if there are less than 2 keyframes or all are the same
+        """
+        ndigits = xplane_constants.PRECISION_KEYFRAME
+
+        def cmp_location(current, next_keyframe):
+            return round_vec(current.location, ndigits) != round_vec(
+                next_keyframe.location, ndigits
+            )
+
+        def cmp_rotation(current, next_keyframe):
+            return round(current.degrees, ndigits) != round(
+                next_keyframe.degrees, ndigits
+            )
+
+        if attr == "location":
+            cmp_fn = cmp_location
+        elif attr == "degrees":
+            cmp_fn = cmp_rotation
+
+        if len(keyframes) < 2:
+            raise ValueError("Keyframe table is less than 2 entries long")
+
+        for i in range(len(keyframes) - 1):
+            if cmp_fn(keyframes[i], keyframes[i + 1]):
+                break
+        else:  # nobreak
+            raise ValueError("No non-clamping found")
+        return i
+
     @staticmethod
     def filter_clamping_keyframes(
         keyframe_collection: "XPlaneKeyframeCollection", attr: str
@@ -294,33 +312,7 @@ class XPlaneKeyframeCollection(MutableSequence):
         #   List[TranslationKeyframe[keyframe.value, keyframe.location]]
         # elif attr == 'degrees
         #   List[RotationKeyframe['value','degrees']] from List[Tuple[axis, List[Tuple['value','degrees']]]]
-        ndigits = xplane_constants.PRECISION_KEYFRAME
-
-        def find_1st_non_clamping(keyframes, attr) -> int:
-            def cmp_location(current, next_keyframe):
-                return round_vec(current.location, ndigits) != round_vec(
-                    next_keyframe.location, ndigits
-                )
-
-            def cmp_rotation(current, next_keyframe):
-                return round(current.degrees, ndigits) != round(
-                    next_keyframe.degrees, ndigits
-                )
-
-            if attr == "location":
-                cmp_fn = cmp_location
-            elif attr == "degrees":
-                cmp_fn = cmp_rotation
-
-            if len(keyframes) < 2:
-                raise ValueError("Keyframe table is less than 2 entries long")
-
-            for i in range(len(keyframes) - 1):
-                if cmp_fn(keyframes[i], keyframes[i + 1]):
-                    break
-            else:  # nobreak
-                raise ValueError("No non-clamping found")
-            return i
+        find_1st_non_clamping = XPlaneKeyframeCollection._find_1st_non_clamping
 
         if attr == "location":
             try:
@@ -365,3 +357,73 @@ class XPlaneKeyframeCollection(MutableSequence):
             if all(table == [] for axis, table in new_keyframe_table):
                 raise ValueError("XPlaneKeyframeCollection had only clamping keyframes")
             return new_keyframe_table
+
+    @staticmethod
+    def simplify_keyframe_table(
+        table: List[Tuple[float, Union[Vector, float]]],
+        attr: str,
+        tolerance: float,
+        loop: float = 0.0,
+    ) -> List[Tuple[float, Union[Vector, float]]]:
+        """
+        Returns a new keyframe table without the interior keyframes that
+        linear interpolation between the kept keyframes around them reproduces
+        to within tolerance. attr specifies which keyframe attribute is interpolated,
+        and must be "location" or "degrees" (like filter_clamping_keyframes).
+
+        Never dropped are
+        - the first and last keyframes
+        - the first and last non-clamping keyframes, so clamping still starts and ends
+          at the same dataref values
+        - keyframes on a multiple of loop (the value of ANIM_keyframe_loop, 0 for none),
+          where the animation wraps around
+        - keyframes next to one with the same dataref value (a jump)
+        """
+        assert attr in ("location", "degrees")
+        if len(table) < 3:
+            return list(table)
+
+        values = [entry[0] for entry in table]
+        if attr == "location":
+            outputs = [tuple(entry.location) for entry in table]
+        else:
+            outputs = [(entry.degrees,) for entry in table]
+
+        protected = {0, len(table) - 1}
+        find_1st_non_clamping = XPlaneKeyframeCollection._find_1st_non_clamping
+        try:
+            protected.add(find_1st_non_clamping(table, attr))
+            protected.add(
+                len(table) - 1 - find_1st_non_clamping(list(reversed(table)), attr)
+            )
+        except ValueError:
+            pass
+        if loop > 0:
+            protected.update(
+                i
+                for i, value in enumerate(values)
+                if math.isclose(math.remainder(value, loop), 0, abs_tol=1e-9)
+            )
+
+        def reproduced(i: int, start: int, end: int) -> bool:
+            span = values[end] - values[start]
+            if span == 0:
+                return False
+            t = (values[i] - values[start]) / span
+            if not 0 < t < 1:
+                return False
+            return all(
+                abs(a + (b - a) * t - c) <= tolerance
+                for a, b, c in zip(outputs[start], outputs[end], outputs[i])
+            )
+
+        kept = [0]
+        for i in range(1, len(table) - 1):
+            # i can only go if it, and everything dropped since the last kept keyframe,
+            # lies on the line from the last kept keyframe to the next one
+            if i in protected or not all(
+                reproduced(j, kept[-1], i + 1) for j in range(kept[-1] + 1, i + 1)
+            ):
+                kept.append(i)
+        kept.append(len(table) - 1)
+        return [table[i] for i in kept]
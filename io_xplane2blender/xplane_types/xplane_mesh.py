@@ -1,21 +1,310 @@
 import array
 import collections
+import io
 import re
-import time
-from typing import List, Optional
+from typing import List, Optional, TextIO, Tuple
 
 import bpy
 import mathutils
+import numpy
 
 from io_xplane2blender import xplane_helpers
 
 from ..xplane_config import getDebug
 from ..xplane_constants import *
-from ..xplane_helpers import floatToStr, logger
+from ..xplane_helpers import floatRowsToStr, logger
+from ..xplane_utils.xplane_profiler import profiler
 from .xplane_face import XPlaneFace
 from .xplane_object import XPlaneObject
 
 
+def _collect_vt_block(
+    mesh: bpy.types.Mesh, uv_layer: Optional[bpy.types.MeshUVLoopLayer]
+) -> numpy.ndarray:
+    """
+    Turns the loop triangles of an already transformed mesh into a
+    (3 * len(mesh.loop_triangles), 8) array of VT entries,
+    one row per corner, in the order they'll be written to the IDX table.
+
+    Data is pulled out of Blender in bulk with foreach_get and kept in
+    float32 (like mathutils does), so the rows have exactly the same values
+    as building each entry by hand with vec_b_to_x.
+    """
+    ######################################################################
+    # WARNING! This is a hot path! So don't change it without profiling! #
+    ######################################################################
+    loop_triangles = mesh.loop_triangles
+    num_tris = len(loop_triangles)
+
+    cos = numpy.empty(len(mesh.vertices) * 3, dtype=numpy.float32)
+    mesh.vertices.foreach_get("co", cos)
+    cos.shape = (-1, 3)
+
+    # BAD NAME ALERT!
+    # mesh.vertices is the actual vertex table,
+    # tri.vertices is indices in that vertex table
+    tri_vertices = numpy.empty(num_tris * 3, dtype=numpy.int32)
+    loop_triangles.foreach_get("vertices", tri_vertices)
+    tri_loops = numpy.empty(num_tris * 3, dtype=numpy.int32)
+    loop_triangles.foreach_get("loops", tri_loops)
+    tri_normals = numpy.empty(num_tris * 3, dtype=numpy.float32)
+    loop_triangles.foreach_get("normal", tri_normals)
+    tri_split_normals = numpy.empty(num_tris * 9, dtype=numpy.float32)
+    loop_triangles.foreach_get("split_normals", tri_split_normals)
+    tri_use_smooth = numpy.empty(num_tris, dtype=bool)
+    loop_triangles.foreach_get("use_smooth", tri_use_smooth)
+
+    # To reverse the winding order for X-Plane from CCW to CW,
+    # we take every triangle's corners backwards
+    tri_vertices = tri_vertices.reshape(num_tris, 3)[:, ::-1].ravel()
+    tri_loops = tri_loops.reshape(num_tris, 3)[:, ::-1].ravel()
+    split_normals = tri_split_normals.reshape(num_tris, 3, 3)[:, ::-1, :]
+    normals = numpy.where(
+        tri_use_smooth[:, numpy.newaxis, numpy.newaxis],
+        split_normals,
+        tri_normals.reshape(num_tris, 1, 3),
+    ).reshape(-1, 3)
+
+    vt_block = numpy.empty((num_tris * 3, 8), dtype=numpy.float32)
+    # Blender's (x, y, z) becomes X-Plane's (x, z, -y), see vec_b_to_x
+    positions = cos[tri_vertices]
+    vt_block[:, 0] = positions[:, 0]
+    vt_block[:, 1] = positions[:, 2]
+    vt_block[:, 2] = -positions[:, 1]
+    vt_block[:, 3] = normals[:, 0]
+    vt_block[:, 4] = normals[:, 2]
+    vt_block[:, 5] = -normals[:, 1]
+
+    if uv_layer:
+        uvs = numpy.empty(len(uv_layer.data) * 2, dtype=numpy.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        vt_block[:, 6:8] = uvs.reshape(-1, 2)[tri_loops]
+    else:
+        vt_block[:, 6:8] = 0.0
+
+    return vt_block
+
+
+# Odd 64-bit constants used to mix the four 64-bit words of a VT row into one hash
+_ROW_HASH_MULTIPLIERS = numpy.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5],
+    dtype=numpy.uint64,
+)
+
+
+def _first_seen_unique_rows(
+    words: numpy.ndarray, valid_rows: numpy.ndarray, num_rows: int
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    words is a (len(valid_rows), K) uint64 array, the bits of each valid row to match on.
+    Rows not in valid_rows never match anything.
+
+    Returns (first_rows, inverse), see dedup_vt_block
+    """
+    hashes = words[:, 0] * _ROW_HASH_MULTIPLIERS[0]
+    for i in range(1, words.shape[1]):
+        hashes ^= words[:, i] * _ROW_HASH_MULTIPLIERS[i % len(_ROW_HASH_MULTIPLIERS)]
+        hashes ^= hashes >> numpy.uint64(29)
+
+    _, first, inverse = numpy.unique(hashes, return_index=True, return_inverse=True)
+    inverse = inverse.ravel()
+    if (words != words[first[inverse]]).any():
+        # A hash collision, almost impossible, but we can't be wrong.
+        # Fallback to comparing whole rows, which is slower
+        row_bytes = numpy.dtype((numpy.void, words.dtype.itemsize * words.shape[1]))
+        _, first, inverse = numpy.unique(
+            numpy.ascontiguousarray(words).view(row_bytes).ravel(),
+            return_index=True,
+            return_inverse=True,
+        )
+        inverse = inverse.ravel()
+
+    # Every row points at the first row that looks like it.
+    # Invalid rows only ever point at themselves
+    representatives = numpy.arange(num_rows)
+    representatives[valid_rows] = valid_rows[first][inverse]
+    first_rows = numpy.flatnonzero(representatives == numpy.arange(num_rows))
+    return first_rows, numpy.searchsorted(first_rows, representatives)
+
+
+def dedup_vt_block(vt_block: numpy.ndarray) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Finds the duplicate rows of an (N, 8) float32 VT block in one batch.
+    Rows match when every component compares equal, exactly like
+    the tuple keys of the old per-corner dictionary (so -0.0 matches 0.0
+    and a row with a NaN never matches anything).
+
+    Returns (first_rows, inverse):
+    - first_rows are the row numbers of each unique row's first occurrence,
+      in first seen order
+    - inverse maps every row to its position in first_rows,
+      so vt_block[first_rows][inverse] is the same as vt_block
+    """
+    ######################################################################
+    # WARNING! This is a hot path! So don't change it without profiling! #
+    ######################################################################
+    # Adding 0.0 turns -0.0 into 0.0, so equal floats have equal bits
+    keys = numpy.ascontiguousarray(vt_block + numpy.float32(0.0), dtype=numpy.float32)
+    valid_rows = numpy.flatnonzero(~numpy.isnan(keys).any(axis=1))
+    # 8 float32s are 4 uint64 words
+    words = keys[valid_rows].view(numpy.uint64)
+    return _first_seen_unique_rows(words, valid_rows, len(vt_block))
+
+
+def weld_vt_block(
+    vt_block: numpy.ndarray,
+    position_epsilon: float,
+    normal_epsilon: float,
+    uv_epsilon: float,
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Like dedup_vt_block, but rows also match when they are merely close.
+    Each row's position, normal and UV are rounded to the nearest multiple of their
+    epsilon, hashed like a spatial grid, and rows landing in the same grid cell
+    are welded to the first of them seen.
+    A welded row is never further than an epsilon (per component)
+    from the row it was welded to.
+
+    Returns (first_rows, inverse), see dedup_vt_block
+    """
+    epsilons = numpy.array(
+        [position_epsilon] * 3 + [normal_epsilon] * 3 + [uv_epsilon] * 2,
+        dtype=numpy.float64,
+    )
+    assert (epsilons > 0).all(), f"Weld tolerances must be greater than 0: {epsilons}"
+    cells = numpy.rint(vt_block / epsilons)
+    valid_rows = numpy.flatnonzero(numpy.isfinite(cells).all(axis=1))
+    words = numpy.ascontiguousarray(cells[valid_rows].astype(numpy.int64)).view(
+        numpy.uint64
+    )
+    return _first_seen_unique_rows(words, valid_rows, len(vt_block))
+
+
+# The post-transform vertex cache size triangles are reordered for and ACMR
+# is measured against. Real GPUs vary, 16 entries is a conservative middle
+VERTEX_CACHE_SIZE = 16
+
+
+def vertex_cache_misses(
+    indices: numpy.ndarray, cache_size: int = VERTEX_CACHE_SIZE
+) -> int:
+    """
+    Simulates a FIFO post-transform vertex cache of cache_size entries
+    drawing indices, returns how many vertices had to be transformed.
+    Divide by the number of triangles for the ACMR (average cache miss ratio)
+    """
+    cache = collections.deque(maxlen=cache_size)
+    misses = 0
+    for vertex in indices.tolist():
+        if vertex not in cache:
+            cache.append(vertex)
+            misses += 1
+    return misses
+
+
+def tipsify_triangles(
+    indices: numpy.ndarray, num_vertices: int, cache_size: int = VERTEX_CACHE_SIZE
+) -> numpy.ndarray:
+    """
+    Reorders the triangles of a flat triangle list (indices into a block of
+    num_vertices vertices) for post-transform vertex cache locality, using
+    Tipsify from Sander, Nehab and Barczak's "Fast Triangle Reordering for
+    Vertex Locality and Reduced Overdraw" (2007).
+
+    Triangles are kept whole and keep their winding, only their order changes
+    """
+    triangles = indices.reshape(-1, 3)
+    num_triangles = len(triangles)
+    if num_triangles < 2:
+        return indices.copy()
+
+    # Vertex -> triangle adjacency, as a CSR table
+    corners = triangles.ravel()
+    adjacency = (numpy.argsort(corners, kind="stable") // 3).tolist()
+    adjacency_starts = numpy.zeros(num_vertices + 1, dtype=numpy.int64)
+    numpy.cumsum(
+        numpy.bincount(corners, minlength=num_vertices), out=adjacency_starts[1:]
+    )
+    adjacency_starts = adjacency_starts.tolist()
+
+    triangle_list = triangles.tolist()
+    live_triangles = numpy.bincount(corners, minlength=num_vertices).tolist()
+    cache_times = [0] * num_vertices
+    emitted = [False] * num_triangles
+    dead_ends = []
+    out = []
+
+    timestamp = cache_size + 1
+    cursor = 0
+    fanning = 0
+    while fanning >= 0:
+        candidates = []
+        for triangle in adjacency[
+            adjacency_starts[fanning] : adjacency_starts[fanning + 1]
+        ]:
+            if emitted[triangle]:
+                continue
+            emitted[triangle] = True
+            out.append(triangle)
+            for vertex in triangle_list[triangle]:
+                dead_ends.append(vertex)
+                candidates.append(vertex)
+                live_triangles[vertex] -= 1
+                if timestamp - cache_times[vertex] > cache_size:
+                    cache_times[vertex] = timestamp
+                    timestamp += 1
+
+        # Pick the candidate still in the cache the longest,
+        # if it'll still be there after fanning around it
+        fanning = -1
+        best_priority = -1
+        for vertex in candidates:
+            if live_triangles[vertex] > 0:
+                priority = 0
+                if (
+                    timestamp - cache_times[vertex] + 2 * live_triangles[vertex]
+                    <= cache_size
+                ):
+                    priority = timestamp - cache_times[vertex]
+                if priority > best_priority:
+                    best_priority = priority
+                    fanning = vertex
+
+        if fanning == -1:
+            # Dead end, back track through recently used vertices,
+            # then fall back to the next vertex with triangles left
+            while dead_ends:
+                vertex = dead_ends.pop()
+                if live_triangles[vertex] > 0:
+                    fanning = vertex
+                    break
+            else:
+                while cursor < num_vertices:
+                    if live_triangles[cursor] > 0:
+                        fanning = cursor
+                        break
+                    cursor += 1
+
+    return triangles[out].ravel()
+
+
+def reorder_vertices_by_first_use(
+    indices: numpy.ndarray, num_vertices: int
+) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """
+    Finds the order a block of num_vertices vertices should be in so that
+    indices reference them in first use order, for vertex fetch locality.
+
+    Returns (order, new_indices), where block[order] is the reordered block
+    and new_indices index into it. Unreferenced vertices are dropped
+    """
+    used, first_uses = numpy.unique(indices, return_index=True)
+    order = used[numpy.argsort(first_uses)]
+    remap = numpy.empty(num_vertices, dtype=numpy.int64)
+    remap[order] = numpy.arange(len(order))
+    return order, remap[indices]
+
+
 class XPlaneMesh:
     """
     Stores the data for the OBJ's mesh - its VT and IDX tables.
@@ -24,23 +313,59 @@ class XPlaneMesh:
     unlike the many XPlaneObjects per file
     """
 
+    # How many rows of the VT table (or lines of IDX10) are formatted at once
+    # when streaming the tables out
+    WRITE_CHUNK_SIZE = 65536
+
     def __init__(self):
-        # Contains all OBJ VT directives, data in the order as specified by the OBJ8 spec
-        self.vertices = (
-            []
-        )  # type: List[Tuple[float, float, float, float, float, float, float, float]]
+        # Contains all OBJ VT directives, data in the order as specified by the OBJ8 spec.
+        # Only the first globalindex rows are in use, the rest is room to grow.
+        # Use XPlaneMesh.vertices to read it
+        self._vt_table = numpy.empty((0, 8), dtype=numpy.float32)
         # array - contains all face indices
         self.indices = array.array("i")  # type: List[int]
         # int - Stores the current global vertex index.
         self.globalindex = 0
+        # int - How many vertices the optimize_weld setting merged that
+        # exact matching alone would have kept
+        self.welded_vertices = 0
+        # int - Triangles the optimize_vertex_cache setting reordered, and how many
+        # vertex cache misses they had before and after, for the ACMR
+        self.vertex_cache_triangles = 0
+        self.vertex_cache_misses_before = 0
+        self.vertex_cache_misses_after = 0
         self.debug = []
 
+    @property
+    def vertices(self) -> numpy.ndarray:
+        """
+        The VT table as an (N, 8) float32 array view. Each row is
+        (x, y, z, nx, ny, nz, u, v), already in X-Plane's coordinate system
+        """
+        return self._vt_table[: self.globalindex]
+
+    def _appendVertices(self, vt_block: numpy.ndarray) -> None:
+        """Appends the rows of an (N, 8) array to the VT table, growing it as needed"""
+        end = self.globalindex + len(vt_block)
+        if end > len(self._vt_table):
+            grown = numpy.empty(
+                (max(end, 2 * len(self._vt_table)), 8), dtype=numpy.float32
+            )
+            grown[: self.globalindex] = self.vertices
+            self._vt_table = grown
+        self._vt_table[self.globalindex : end] = vt_block
+        self.globalindex = end
+
+    def _appendIndices(self, indices: numpy.ndarray) -> None:
+        self.indices.frombytes(indices.astype(numpy.int32).tobytes())
+
     # Method: collectXPlaneObjects
     # Fills the <vertices> and <indices> from a list of <XPlaneObjects>.
     # This method works recursively on the children of each <XPlaneObject>.
     #
     # Parameters:
     #   list xplaneObjects - list of <XPlaneObjects>.
+    @profiler.profiled("mesh collection")
     def collectXPlaneObjects(self, xplaneObjects: List[XPlaneObject]) -> None:
         debug = getDebug()
 
@@ -83,148 +408,135 @@ class XPlaneMesh:
                     mesh.calc_normals_split()
                 
                 mesh.calc_loop_triangles()
-                loop_triangles = mesh.loop_triangles
                 try:
                     uv_layer = mesh.uv_layers[xplaneObject.material.uv_name]
                 except (KeyError, TypeError) as e:
                     uv_layer = None
 
-                TempFace = collections.namedtuple(
-                    "TempFace",
-                    field_names=[
-                        "original_face",  # type: bpy.types.MeshLoopTriangle
-                        "indices",  # type: Tuple[float, float, float]
-                        "normal",  # type: Tuple[float, float, float]
-                        "split_normals",  # type: Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]
-                        "uvs",  # type: Tuple[mathutils.Vector, mathutils.Vector, mathutils.Vector]
-                    ],
-                )
-                tmp_faces = []  # type: List[TempFace]
-                for tri in mesh.loop_triangles:
-                    tmp_face = TempFace(
-                        original_face=tri,
-                        # BAD NAME ALERT!
-                        # mesh.vertices is the actual vertex table,
-                        # tri.vertices is indices in that vertex table
-                        indices=tri.vertices,
-                        normal=tri.normal,
-                        split_normals=tri.split_normals,
-                        uvs=tuple(
-                            uv_layer.data[loop_index].uv for loop_index in tri.loops
+                vt_block = _collect_vt_block(mesh, uv_layer)
+
+                if bpy.context.scene.xplane.optimize:
+                    # Optimization Algorithm:
+                    # Find every matching vt_entry in this object's part of the vertex table.
+                    # Only the first of each is added to the global vertices list,
+                    # the duplicates' indices point to it
+                    first_rows, inverse = dedup_vt_block(vt_block)
+                    if bpy.context.scene.xplane.optimize_weld:
+                        weld_first_rows, weld_inverse = weld_vt_block(
+                            vt_block[first_rows],
+                            bpy.context.scene.xplane.optimize_weld_position_epsilon,
+                            bpy.context.scene.xplane.optimize_weld_normal_epsilon,
+                            bpy.context.scene.xplane.optimize_weld_uv_epsilon,
                         )
-                        if uv_layer
-                        else (mathutils.Vector((0.0, 0.0)),) * 3,
-                    )
-                    tmp_faces.append(tmp_face)
-
-                vertices_dct = {}
-                for tmp_face in tmp_faces:
-                    # To reverse the winding order for X-Plane from CCW to CW,
-                    # we iterate backwards through the mesh data structures
-                    for i in reversed(range(0, 3)):
-                        index = tmp_face.indices[i]
-                        vertex = xplane_helpers.vec_b_to_x(mesh.vertices[index].co)
-                        normal = xplane_helpers.vec_b_to_x(
-                            tmp_face.split_normals[i]
-                            if tmp_face.original_face.use_smooth
-                            else tmp_face.normal
+                        self.welded_vertices += len(first_rows) - len(weld_first_rows)
+                        first_rows = first_rows[weld_first_rows]
+                        inverse = weld_inverse[inverse]
+                    if bpy.context.scene.xplane.optimize_vertex_cache:
+                        # Reorder this object's triangles (its TRIS range) for the
+                        # GPU's vertex cache, then its vertices into first use order
+                        self.vertex_cache_triangles += len(inverse) // 3
+                        self.vertex_cache_misses_before += vertex_cache_misses(inverse)
+                        inverse = tipsify_triangles(inverse, len(first_rows))
+                        self.vertex_cache_misses_after += vertex_cache_misses(inverse)
+                        order, inverse = reorder_vertices_by_first_use(
+                            inverse, len(first_rows)
                         )
-                        uv = tmp_face.uvs[i]
-                        vt_entry = tuple(vertex[:] + normal[:] + uv[:])
-
-                        # Optimization Algorithm:
-                        # Try to find a matching vt_entry's index in the mesh's index table
-                        # If found, skip adding to global vertices list
-                        # If not found (-1), append the new vert, save its vertex
-                        if bpy.context.scene.xplane.optimize:
-                            vindex = vertices_dct.get(vt_entry, -1)
-                        else:
-                            vindex = -1
-
-                        if vindex == -1:
-                            vindex = self.globalindex
-                            self.vertices.append(vt_entry)
-                            self.globalindex += 1
-
-                        if bpy.context.scene.xplane.optimize:
-                            vertices_dct[vt_entry] = vindex
-
-                        self.indices.append(vindex)
+                        first_rows = first_rows[order]
+                    block_indices = self.globalindex + inverse
+                    self._appendVertices(vt_block[first_rows])
+                else:
+                    block_indices = numpy.arange(
+                        self.globalindex, self.globalindex + len(vt_block)
+                    )
+                    self._appendVertices(vt_block)
+                self._appendIndices(block_indices)
 
-                    # store the faces in the prim
+                # store the faces in the prim
+                if len(vt_block):
                     xplaneObject.indices[1] = len(self.indices)
 
                 evaluated_obj.to_mesh_clear()
 
-    def writeVertices(self) -> str:
+    @profiler.profiled("mesh writing")
+    def writeVerticesTo(self, out: TextIO) -> int:
         """
-        Turns the collected vertices into the OBJ's VT table
+        Streams the collected vertices into out as the OBJ's VT table,
+        a chunk at a time. Returns the number of characters written
         """
         ######################################################################
         # WARNING! This is a hot path! So don't change it without profiling! #
         ######################################################################
-        # print("Begin XPlaneMesh.writeVertices")
-        # start = time.perf_counter()
         debug = getDebug()
-        tab = f"\t"
-        if debug:
-            s = "".join(
-                f"VT\t"
-                f"{tab.join(floatToStr(component) for component in line)}"
-                f"\t# {i}"
-                f"\n"
-                for i, line in enumerate(self.vertices)
-            )
-            # print("end XPlaneMesh.writeVertices " + str(time.perf_counter()-start))
-            return s
-        else:
-            s = "".join(
-                f"VT\t" f"{tab.join(floatToStr(component) for component in line)}" f"\n"
-                for line in self.vertices
+        vertices = self.vertices
+        written = 0
+        for chunk_start in range(0, len(vertices), self.WRITE_CHUNK_SIZE):
+            written += out.write(
+                floatRowsToStr(
+                    vertices[chunk_start : chunk_start + self.WRITE_CHUNK_SIZE],
+                    "VT\t",
+                    chunk_start if debug else None,
+                )
             )
-            # print("end XPlaneMesh.writeVertices " + str(time.perf_counter()-start))
-            return s
+        return written
 
-    def writeIndices(self) -> str:
+    def writeVertices(self) -> str:
         """
-        Turns the collected indices into the OBJ's IDX10/IDX table
+        Turns the collected vertices into the OBJ's VT table
+        """
+        out = io.StringIO()
+        self.writeVerticesTo(out)
+        return out.getvalue()
+
+    @profiler.profiled("mesh writing")
+    def writeIndicesTo(self, out: TextIO) -> int:
+        """
+        Streams the collected indices into out as the OBJ's IDX10/IDX table,
+        a chunk at a time. Returns the number of characters written
         """
         ######################################################################
         # WARNING! This is a hot path! So don't change it without profiling! #
         ######################################################################
-        o = ""
-        # print("Begin XPlaneMesh.writeIndices")
-        # start = time.perf_counter()
-
         s_idx10 = "IDX10\t%d\t%d\t%d\t%d\t%d\t%d\t%d\t%d\t%d\t%d\n"
         s_idx = "IDX\t%d\n"
         partition_point = len(self.indices) - (len(self.indices) % 10)
+        chunk_size = self.WRITE_CHUNK_SIZE * 10
+
+        written = 0
+        for chunk_start in range(0, partition_point, chunk_size):
+            chunk = self.indices[chunk_start : min(chunk_start + chunk_size, partition_point)]
+            written += out.write((s_idx10 * (len(chunk) // 10)) % tuple(chunk))
 
-        if len(self.indices) >= 10:
-            o += "".join(
+        written += out.write(
+            "".join(
                 [
-                    s_idx10 % (*self.indices[i : i + 10],)
-                    for i in range(0, partition_point - 1, 10)
+                    s_idx % (self.indices[i])
+                    for i in range(partition_point, len(self.indices))
                 ]
             )
-
-        o += "".join(
-            [
-                s_idx % (self.indices[i])
-                for i in range(partition_point, len(self.indices))
-            ]
         )
-        # print("End XPlaneMesh.writeIndices: " + str(time.perf_counter()-start))
-        return o
+        return written
 
-    def write(self):
-        o = ""
-        debug = False
+    def writeIndices(self) -> str:
+        """
+        Turns the collected indices into the OBJ's IDX10/IDX table
+        """
+        out = io.StringIO()
+        self.writeIndicesTo(out)
+        return out.getvalue()
+
+    def writeTo(self, out: TextIO) -> int:
+        """
+        Streams the VT and IDX tables into out,
+        returns the number of characters written
+        """
+        written = self.writeVerticesTo(out)
+        if written:
+            written += out.write("\n")
+        written += self.writeIndicesTo(out)
 
-        verticesOut = self.writeVertices()
-        o += verticesOut
-        if len(verticesOut):
-            o += "\n"
-        o += self.writeIndices()
+        return written
 
-        return o
+    def write(self) -> str:
+        out = io.StringIO()
+        self.writeTo(out)
+        return out.getvalue()
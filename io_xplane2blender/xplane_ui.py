@@ -400,7 +400,23 @@ def scene_layout(layout: bpy.types.UILayout, scene: bpy.types.Scene):
     advanced_box = layout.box()
     advanced_box.label(text="Advanced Settings")
     advanced_column = advanced_box.column()
+    advanced_column.prop(scene.xplane, "incremental_export")
+    advanced_column.prop(scene.xplane, "only_write_changed_objs")
+    advanced_column.prop(scene.xplane, "export_workers")
     advanced_column.prop(scene.xplane, "optimize")
+    if scene.xplane.optimize:
+        advanced_column.prop(scene.xplane, "optimize_vertex_cache")
+        advanced_column.prop(scene.xplane, "optimize_animations")
+        keyframes_box = advanced_column.box()
+        keyframes_box.prop(scene.xplane, "optimize_keyframes")
+        if scene.xplane.optimize_keyframes:
+            keyframes_box.prop(scene.xplane, "optimize_keyframes_tolerance")
+        weld_box = advanced_column.box()
+        weld_box.prop(scene.xplane, "optimize_weld")
+        if scene.xplane.optimize_weld:
+            weld_box.prop(scene.xplane, "optimize_weld_position_epsilon")
+            weld_box.prop(scene.xplane, "optimize_weld_normal_epsilon")
+            weld_box.prop(scene.xplane, "optimize_weld_uv_epsilon")
     advanced_column.prop(scene.xplane, "debug")
 
     if scene.xplane.debug:
@@ -420,6 +436,10 @@ def scene_dev_layout(layout: bpy.types.UILayout, scene: bpy.types.Scene):
         dev_box_column.prop(scene.xplane, "dev_enable_breakpoints")
         dev_box_column.prop(scene.xplane, "dev_continue_export_on_error")
         dev_box_column.prop(scene.xplane, "dev_export_as_dry_run")
+        dev_box_column.prop(scene.xplane, "dev_profile_export")
+        if scene.xplane.dev_profile_export:
+            dev_box_column.prop(scene.xplane, "dev_profile_export_json")
+            dev_box_column.prop(scene.xplane, "dev_profile_export_cprofile")
         # Exact same operator, more convient place
         dev_box_column.operator("scene.export_to_relative_dir", icon="EXPORT")
         op = dev_box_column.operator(
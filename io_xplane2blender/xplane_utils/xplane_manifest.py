@@ -0,0 +1,289 @@
+"""
+Fingerprints of everything an exportable root's OBJ is made from, and the
+manifest next to the .blend file that remembers them between exports.
+
+Incremental exports skip a root when its fingerprint, and the OBJ written
+from it last time, are both unchanged
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import bpy
+import numpy
+
+from io_xplane2blender import xplane_config, xplane_helpers
+from io_xplane2blender.xplane_helpers import ExportableRoot, logger
+
+MANIFEST_VERSION = 1
+
+# Settings that only change the UI or how the export runs, not what is exported
+_UI_ONLY_PROPERTIES = {
+    "rna_type",
+    "command_search_window_state",
+    "dataref_search_window_state",
+    "expanded",
+    "expanded_non_exporting_collections",
+    "export_workers",
+}
+
+
+def get_manifest_path(blend_filepath: str) -> str:
+    """The manifest sits next to the .blend, as <name>.xplane_manifest.json"""
+    return os.path.splitext(blend_filepath)[0] + ".xplane_manifest.json"
+
+
+def _plain(value: Any) -> Any:
+    """Turns bpy_prop_arrays (of any dimension) and mathutils types into tuples"""
+    if isinstance(value, str):
+        return value
+    try:
+        return tuple(_plain(item) for item in value)
+    except TypeError:
+        return value
+
+
+def _hash_rna(hasher: "hashlib._Hash", struct: bpy.types.bpy_struct) -> None:
+    """
+    Hashes every property of struct, recursing into nested property groups and
+    collections. Pointers to other datablocks are hashed by name
+    """
+    for prop in struct.bl_rna.properties:
+        identifier = prop.identifier
+        if identifier in _UI_ONLY_PROPERTIES:
+            continue
+        value = getattr(struct, identifier, None)
+        hasher.update(identifier.encode())
+        if prop.type == "POINTER":
+            if value is None:
+                hasher.update(b"None")
+            elif isinstance(value, bpy.types.ID):
+                hasher.update(value.name_full.encode())
+            else:
+                _hash_rna(hasher, value)
+        elif prop.type == "COLLECTION":
+            for item in value:
+                _hash_rna(hasher, item)
+        else:
+            hasher.update(repr(_plain(value)).encode())
+
+
+def _hash_array(hasher: "hashlib._Hash", collection, attr: str, dtype, width: int) -> None:
+    """Hashes attr of every item in a bpy_prop_collection, fetched in bulk"""
+    values = numpy.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attr, values)
+    hasher.update(values.tobytes())
+
+
+def _hash_action(hasher: "hashlib._Hash", anim_data_owner: bpy.types.ID) -> None:
+    """Hashes the keyframes of an ID's action, its drivers, and its NLA strips"""
+    anim_data = anim_data_owner.animation_data
+    if not anim_data:
+        return
+    if anim_data.action:
+        hasher.update(anim_data.action.name_full.encode())
+        for fcurve in anim_data.action.fcurves:
+            hasher.update(f"{fcurve.data_path}[{fcurve.array_index}]".encode())
+            hasher.update(repr((fcurve.mute, fcurve.extrapolation)).encode())
+            keyframe_points = fcurve.keyframe_points
+            for attr in ("co", "handle_left", "handle_right"):
+                _hash_array(hasher, keyframe_points, attr, numpy.float32, 2)
+            hasher.update(
+                repr([point.interpolation for point in keyframe_points]).encode()
+            )
+    for driver in anim_data.drivers:
+        hasher.update(
+            f"{driver.data_path}[{driver.array_index}]{driver.driver.expression}".encode()
+        )
+    for track in anim_data.nla_tracks:
+        hasher.update(repr((track.name, track.mute)).encode())
+        for strip in track.strips:
+            hasher.update(
+                repr(
+                    (strip.name, strip.action.name_full if strip.action else None)
+                ).encode()
+            )
+
+
+def _hash_evaluated_mesh(
+    hasher: "hashlib._Hash", obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph
+) -> None:
+    """Hashes the positions, normals, and UVs of obj's mesh, with modifiers applied"""
+    evaluated_obj = obj.evaluated_get(depsgraph)
+    mesh = evaluated_obj.to_mesh(preserve_all_data_layers=False, depsgraph=depsgraph)
+    try:
+        if hasattr(mesh, "calc_normals_split"):
+            mesh.calc_normals_split()
+        mesh.calc_loop_triangles()
+        _hash_array(hasher, mesh.vertices, "co", numpy.float32, 3)
+        loop_triangles = mesh.loop_triangles
+        _hash_array(hasher, loop_triangles, "vertices", numpy.int32, 3)
+        _hash_array(hasher, loop_triangles, "loops", numpy.int32, 3)
+        _hash_array(hasher, loop_triangles, "split_normals", numpy.float32, 9)
+        _hash_array(hasher, loop_triangles, "material_index", numpy.int32, 1)
+        for uv_layer in mesh.uv_layers:
+            hasher.update(uv_layer.name.encode())
+            _hash_array(hasher, uv_layer.data, "uv", numpy.float32, 2)
+    finally:
+        evaluated_obj.to_mesh_clear()
+
+
+def _collect_root_objects(exportable_root: ExportableRoot) -> List[bpy.types.Object]:
+    """
+    Every Object the root's OBJ could be made from, including the parents
+    whose transforms reach into it
+    """
+    objects = xplane_helpers.get_potential_objects_in_exportable_root(exportable_root)
+    if isinstance(exportable_root, bpy.types.Object):
+        objects.append(exportable_root)
+
+    seen = set()
+    ordered = []
+    for obj in objects:
+        while obj is not None and obj.name not in seen:
+            seen.add(obj.name)
+            ordered.append(obj)
+            obj = obj.parent
+    return sorted(ordered, key=lambda obj: obj.name)
+
+
+def fingerprint_root(
+    exportable_root: ExportableRoot,
+    scene: bpy.types.Scene,
+    depsgraph: bpy.types.Depsgraph,
+) -> str:
+    """
+    Returns a hex digest of everything exportable_root's OBJ is made from,
+    taken in the current frame: the exporter and export settings,
+    the root's properties (layer options, texture paths), and for each of its
+    Objects their transforms, visibility, xplane properties, constraints,
+    keyframes, evaluated meshes, materials, and light and armature data
+    """
+    hasher = hashlib.sha256()
+    hasher.update(
+        repr(
+            (xplane_config.CURRENT_ADDON_VERSION, xplane_config.CURRENT_DATA_MODEL_VERSION)
+        ).encode()
+    )
+    _hash_rna(hasher, scene.xplane)
+
+    hasher.update(exportable_root.name_full.encode())
+    if isinstance(exportable_root, bpy.types.Collection):
+        hasher.update(
+            repr((exportable_root.hide_viewport, exportable_root.hide_render)).encode()
+        )
+        _hash_rna(hasher, exportable_root.xplane)
+
+    for obj in _collect_root_objects(exportable_root):
+        hasher.update(obj.name_full.encode())
+        hasher.update(
+            repr(
+                (
+                    obj.type,
+                    obj.parent.name_full if obj.parent else None,
+                    obj.parent_type,
+                    obj.parent_bone,
+                    _plain(obj.matrix_world),
+                    _plain(obj.matrix_basis),
+                    obj.rotation_mode,
+                    obj.hide_viewport,
+                    obj.hide_render,
+                    obj.hide_get(),
+                    sorted(collection.name_full for collection in obj.users_collection),
+                )
+            ).encode()
+        )
+        _hash_rna(hasher, obj.xplane)
+        for constraint in obj.constraints:
+            _hash_rna(hasher, constraint)
+        _hash_action(hasher, obj)
+
+        for slot in obj.material_slots:
+            material = slot.material
+            hasher.update(repr((slot.link, material and material.name_full)).encode())
+            if material:
+                _hash_rna(hasher, material.xplane)
+
+        if obj.type == "MESH":
+            _hash_evaluated_mesh(hasher, obj, depsgraph)
+        elif obj.type == "LIGHT":
+            _hash_rna(hasher, obj.data)
+        elif obj.type == "ARMATURE":
+            _hash_action(hasher, obj.data)
+            for bone in obj.data.bones:
+                hasher.update(
+                    repr(
+                        (
+                            bone.name,
+                            bone.parent.name if bone.parent else None,
+                            _plain(bone.matrix_local),
+                        )
+                    ).encode()
+                )
+                _hash_rna(hasher, bone.xplane)
+            for pose_bone in obj.pose.bones:
+                hasher.update(
+                    repr((_plain(pose_bone.matrix_basis), pose_bone.rotation_mode)).encode()
+                )
+                for constraint in pose_bone.constraints:
+                    _hash_rna(hasher, constraint)
+
+    return hasher.hexdigest()
+
+
+class ExportManifest:
+    """
+    The fingerprints of the roots last exported, and the size and
+    modification time of the OBJs they were written to.
+    Entries are keyed by the OBJ's path, relative to the manifest
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._entries: Dict[str, Dict[str, Union[str, int]]] = {}
+        try:
+            with open(path) as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warn(f"Ignoring unreadable export manifest {path}: {e}")
+            return
+        if manifest.get("version") == MANIFEST_VERSION:
+            self._entries = manifest.get("roots", {})
+
+    def _key(self, obj_path: str) -> str:
+        return os.path.relpath(obj_path, os.path.dirname(self.path)).replace("\\", "/")
+
+    def is_unchanged(self, obj_path: str, fingerprint: str) -> bool:
+        """True if obj_path was written from fingerprint and hasn't been touched since"""
+        entry = self._entries.get(self._key(obj_path))
+        if not entry or entry["fingerprint"] != fingerprint:
+            return False
+        try:
+            stat = os.stat(obj_path)
+        except OSError:
+            return False
+        return entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns
+
+    def record(self, obj_path: str, fingerprint: str) -> None:
+        """Remembers that obj_path was just written from fingerprint"""
+        stat = os.stat(obj_path)
+        self._entries[self._key(obj_path)] = {
+            "fingerprint": fingerprint,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def save(self) -> None:
+        tmppath = self.path + ".tmp"
+        with open(tmppath, "w") as manifest_file:
+            json.dump(
+                {"version": MANIFEST_VERSION, "roots": self._entries},
+                manifest_file,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmppath, self.path)
@@ -0,0 +1,137 @@
+"""
+Wall time and call counts of each phase of an export, per OBJ, for finding out
+where export time goes. Turned on by the Profile Export plugin development setting.
+
+Phases are timed by their own time: while a phase runs inside another, only the
+inner one is charged, so the phases of an OBJ add up to the time spent on it
+"""
+
+import cProfile
+import dataclasses
+import functools
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Phases that happen outside of any one OBJ, like finding the roots
+EXPORT_PHASES = "(export)"
+
+
+@dataclasses.dataclass
+class PhaseTiming:
+    seconds: float = 0.0
+    calls: int = 0
+
+
+class ExportProfiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.seconds = 0.0
+        # filename -> phase name -> timing, in the order they were first seen
+        self.timings: Dict[str, Dict[str, PhaseTiming]] = {}
+        self._files: List[str] = []
+        # [start, seconds spent in nested phases] for each running phase
+        self._stack: List[List[float]] = []
+        self._start = 0.0
+        self._cprofile: Optional[cProfile.Profile] = None
+
+    def start(self, capture_cprofile: bool = False) -> None:
+        """Forgets the last export's timings and starts timing phases"""
+        if self._cprofile:
+            self._cprofile.disable()
+        self._cprofile = None
+        self.enabled = True
+        self.timings = {}
+        self._files = []
+        self._stack = []
+        if capture_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._start = time.perf_counter()
+
+    def stop(self) -> Optional[cProfile.Profile]:
+        """Stops timing, returning the cProfile capture if one was asked for"""
+        self.seconds = time.perf_counter() - self._start
+        self.enabled = False
+        capture, self._cprofile = self._cprofile, None
+        if capture:
+            capture.disable()
+        return capture
+
+    @contextmanager
+    def file(self, filename: str) -> Iterator[None]:
+        """Phases run inside this are charged to filename's OBJ"""
+        if not self.enabled:
+            yield
+            return
+        self._files.append(filename)
+        try:
+            yield
+        finally:
+            self._files.pop()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Times everything inside this, except other phases, as the phase name"""
+        if not self.enabled:
+            yield
+            return
+        running = [time.perf_counter(), 0.0]
+        self._stack.append(running)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - running[0]
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] += elapsed
+            timing = self.timings.setdefault(
+                self._files[-1] if self._files else EXPORT_PHASES, {}
+            ).setdefault(name, PhaseTiming())
+            timing.seconds += elapsed - running[1]
+            timing.calls += 1
+
+    def profiled(self, name: str) -> Callable[[Callable], Callable]:
+        """Decorator that times every call of a function as the phase name"""
+
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.phase(name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def report(self) -> List[str]:
+        """One line per OBJ, slowest phases first"""
+        lines = []
+        for filename, phases in self.timings.items():
+            lines.append(
+                f"{filename}: {sum(t.seconds for t in phases.values()):.3f}s ("
+                + ", ".join(
+                    f"{name} {timing.seconds:.3f}s/{timing.calls}"
+                    for name, timing in sorted(
+                        phases.items(), key=lambda item: -item[1].seconds
+                    )
+                )
+                + ")"
+            )
+        return lines
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "files": {
+                filename: {
+                    name: dataclasses.asdict(timing) for name, timing in phases.items()
+                }
+                for filename, phases in self.timings.items()
+            },
+        }
+
+
+profiler = ExportProfiler()
@@ -0,0 +1,95 @@
+"""
+Batch versions of the per keyframe rotation checks XPlaneKeyframeCollection
+makes to find its reference axis, working on all of a dataref's axis-angle
+rotations at once as an (N x 4) array of (angle, x, y, z) rows.
+
+Everything here reproduces exactly what Python's round and mathutils.Vector's
+== (which allows 1 float32 ULP of difference) decide, so the choices made,
+and the ANIM_rotate_keys written, are the same as checking one keyframe at a time.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy
+
+# mathutils.Vector.__eq__ allows this many float32 ULPs of difference
+VECTOR_EQ_MAX_ULPS = 1
+
+
+def axis_angles_to_array(rotations: Iterable[Tuple[float, Iterable[float]]]) -> numpy.ndarray:
+    """
+    Returns (angle, axis) rotations as an (N x 4) array of (angle, x, y, z) rows
+    """
+    return numpy.array(
+        [(angle, *axis) for angle, axis in rotations], dtype=numpy.float64
+    ).reshape(-1, 4)
+
+
+def round_like_python(values: numpy.ndarray, ndigits: int) -> numpy.ndarray:
+    """
+    Returns values rounded exactly as Python's round(value, ndigits) would.
+
+    numpy.round rounds value * 10**ndigits while Python rounds the exact decimal
+    value of the float. They can only disagree right next to a tie, so only those
+    few values are rounded by Python
+    """
+    rounded = numpy.round(values, ndigits)
+    with numpy.errstate(invalid="ignore"):
+        scaled = values * 10.0 ** ndigits
+        near_tie = numpy.abs(scaled - numpy.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, ndigits) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def float32_equal_ulps(
+    a: numpy.ndarray, b: numpy.ndarray, max_ulps: int = VECTOR_EQ_MAX_ULPS
+) -> numpy.ndarray:
+    """
+    Returns where a and b, as float32s, are within max_ulps of each other,
+    the same test mathutils uses to compare Vectors (EXPP_FloatsAreEqual)
+    """
+    ai = numpy.asarray(a, dtype=numpy.float32).view(numpy.int32).astype(numpy.int64)
+    bi = numpy.asarray(b, dtype=numpy.float32).view(numpy.int32).astype(numpy.int64)
+    # Flips the magnitude bits when the signs differ, like the original
+    signs_differ = numpy.where((ai ^ bi) < 0, 0x7FFFFFFF, 0)
+    diff = (ai ^ signs_differ) - bi
+    # The original's int arithmetic wraps
+    diff = (diff + 2 ** 31) % 2 ** 32 - 2 ** 31
+    return (max_ulps + diff >= 0) & (max_ulps - diff >= 0)
+
+
+def find_reference_axis(
+    axis_angles: numpy.ndarray, ndigits: int
+) -> Tuple[Optional[int], numpy.ndarray, bool]:
+    """
+    Given an (N x 4) array of (angle, x, y, z) rows, decides if they all
+    rotate around one shared reference axis.
+
+    Returns the row whose axis is the reference axis (None if every angle
+    rounds to 0), a mask of the rows whose axis is the reference axis inverted
+    and must be flipped, and if every axis was shared. When they aren't
+    (and the rotations must be decomposed to Eulers instead) only the rows before
+    the first differing axis are flipped, as checking one at a time would have.
+
+    The reference axis is the first rotating row's. Axes are compared after
+    rounding to ndigits
+    """
+    angles = axis_angles[:, 0]
+    axes = axis_angles[:, 1:]
+    rotating = round_like_python(angles, ndigits) != 0
+    if not rotating.any():
+        return None, numpy.zeros(len(axis_angles), dtype=bool), True
+
+    ref_row = int(numpy.argmax(rotating))
+    rounded_axes = round_like_python(axes, ndigits).astype(numpy.float32)
+    ref_axis = rounded_axes[ref_row]
+    same = float32_equal_ulps(rounded_axes, ref_axis).all(axis=1)
+    inverted = float32_equal_ulps(rounded_axes, -ref_axis).all(axis=1)
+
+    flips = rotating & ~same & inverted
+    differing = rotating & ~same & ~inverted
+    if differing.any():
+        flips[int(numpy.argmax(differing)) :] = False
+        return ref_row, flips, False
+    return ref_row, flips, True
@@ -0,0 +1,63 @@
+import json
+import os
+import shutil
+import sys
+
+import bpy
+
+from io_xplane2blender import xplane_batch_export
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+
+__dirname__ = os.path.dirname(__file__)
+
+BATCH_FOLDER = os.path.join(get_tmp_folder(), "batch_export")
+
+
+class TestBatchExport(XPlaneTestCase):
+    def _save_blend(self, relpath: str, root_names) -> str:
+        create_initial_test_setup()
+        for name in root_names:
+            create_datablock_collection(name).xplane.is_exportable_collection = True
+            create_datablock_mesh(DatablockInfo("MESH", f"{name}_cube", collection=name))
+        blend_path = os.path.join(BATCH_FOLDER, relpath)
+        os.makedirs(os.path.dirname(blend_path), exist_ok=True)
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, check_existing=False)
+        return blend_path
+
+    def test_directory_exported_with_report(self) -> None:
+        shutil.rmtree(BATCH_FOLDER, ignore_errors=True)
+        airport = self._save_blend("airport.blend", ("hangar", "tower"))
+        fences = self._save_blend(os.path.join("props", "fences.blend"), ("fence",))
+
+        self.assertEqual(
+            xplane_batch_export.find_blend_files([BATCH_FOLDER]), [airport, fences]
+        )
+        # A typo is reported, not raised
+        self.assertEqual(
+            xplane_batch_export.main([os.path.join(BATCH_FOLDER, "airprot")]), 1
+        )
+
+        report_path = os.path.join(BATCH_FOLDER, "report.json")
+        exit_code = xplane_batch_export.main(
+            [BATCH_FOLDER, "--jobs", "2", "--root", "hangar", "--root", "fence", "--report", report_path]
+        )
+        self.assertEqual(exit_code, 0)
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+
+        self.assertEqual(report["failed"], 0)
+        self.assertEqual([entry["blend"] for entry in report["files"]], [airport, fences])
+        for entry, obj_name in zip(report["files"], ("hangar.obj", "fence.obj")):
+            self.assertEqual(entry["exit_code"], 0)
+            self.assertEqual(entry["errors"], [])
+            self.assertEqual(len(entry["outputs"]), 1)
+            output = entry["outputs"][0]
+            self.assertEqual(os.path.basename(output["path"]), obj_name)
+            self.assertTrue(output["written"])
+            self.assertEqual(output["size"], os.path.getsize(output["path"]))
+        # Filtered out by --root
+        self.assertFalse(os.path.exists(os.path.join(BATCH_FOLDER, "tower.obj")))
+
+
+runTestCases([TestBatchExport])
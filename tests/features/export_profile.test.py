@@ -0,0 +1,54 @@
+import json
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_helpers import logger
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestExportProfile(XPlaneTestCase):
+    def test_phases_timed_per_obj(self) -> None:
+        create_initial_test_setup()
+        create_datablock_collection("profiled").xplane.is_exportable_collection = True
+        create_datablock_mesh(DatablockInfo("MESH", "door", collection="profiled"))
+        set_animation_data(bpy.data.objects["door"], T_2_FRAMES_1_X)
+        bpy.context.scene.xplane.plugin_development = True
+        bpy.context.scene.xplane.dev_profile_export = True
+        bpy.context.scene.xplane.dev_profile_export_json = True
+
+        blend_path = os.path.join(get_tmp_folder(), "export_profile.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, check_existing=False)
+        bpy.ops.scene.export_to_relative_dir(initial_dir="export_profile")
+        self.assertLoggerErrors(0)
+
+        self.assertTrue(
+            any(m["message"].startswith("Profile of profiled: ") for m in logger.findInfos())
+        )
+        with open(os.path.splitext(blend_path)[0] + ".xplane_profile.json") as profile_file:
+            profile = json.load(profile_file)
+        self.assertIn("root discovery", profile["files"]["(export)"])
+        phases = profile["files"]["profiled"]
+        for phase in (
+            "keyframe scan",
+            "bone hierarchy",
+            "collect animations",
+            "mesh collection",
+            "material validation",
+            "header init",
+            "commands",
+            "disk write",
+        ):
+            self.assertIn(phase, phases)
+            self.assertGreater(phases[phase]["calls"], 0)
+        self.assertGreaterEqual(
+            profile["seconds"],
+            sum(timing["seconds"] for file in profile["files"].values() for timing in file.values()),
+        )
+
+
+runTestCases([TestExportProfile])
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_helpers import logger
+from io_xplane2blender.xplane_utils import xplane_manifest
+
+__dirname__ = os.path.dirname(__file__)
+
+EXPORT_FOLDER = "incremental_export"
+
+
+class TestIncrementalExport(XPlaneTestCase):
+    def _export(self):
+        bpy.ops.scene.export_to_relative_dir(initial_dir=EXPORT_FOLDER)
+        self.assertLoggerErrors(0)
+        return sorted(
+            os.path.basename(m["message"].split(",")[0][len("Skipped ") :])
+            for m in logger.findInfos()
+            if m["message"].startswith("Skipped ")
+        )
+
+    def test_only_changed_roots_exported(self) -> None:
+        create_initial_test_setup()
+        bpy.context.scene.xplane.incremental_export = True
+        for name in ("unchanged", "edited"):
+            create_datablock_collection(name).xplane.is_exportable_collection = True
+            create_datablock_mesh(DatablockInfo("MESH", f"{name}_cube", collection=name))
+
+        blend_path = os.path.join(get_tmp_folder(), "incremental_export.blend")
+        manifest_path = xplane_manifest.get_manifest_path(blend_path)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, check_existing=False)
+
+        self.assertEqual(self._export(), [])
+        self.assertTrue(os.path.isfile(manifest_path))
+        self.assertEqual(self._export(), ["edited.obj", "unchanged.obj"])
+
+        bpy.data.objects["edited_cube"].location.x = 2
+        bpy.context.view_layer.update()
+        self.assertEqual(self._export(), ["unchanged.obj"])
+
+        # Deleting an OBJ writes it again, even with nothing changed in Blender
+        os.remove(
+            os.path.join(get_tmp_folder(), EXPORT_FOLDER, "unchanged.obj")
+        )
+        self.assertEqual(self._export(), ["edited.obj"])
+
+
+runTestCases([TestIncrementalExport])
@@ -0,0 +1,64 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender import xplane_export_workers
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_helpers import logger
+
+__dirname__ = os.path.dirname(__file__)
+
+EXPORT_FOLDER = "parallel_export"
+ROOT_NAMES = ("hangar", "tower", "fence", "light_pole")
+
+
+class TestParallelExport(XPlaneTestCase):
+    def test_shard_roots_balanced(self) -> None:
+        shards = xplane_export_workers.shard_roots(
+            {"a": 5, "b": 4, "c": 3, "d": 2, "e": 1}, 2
+        )
+        self.assertEqual(shards, [["a", "d", "e"], ["b", "c"]])
+        # Never more shards than roots
+        self.assertEqual(xplane_export_workers.shard_roots({"a": 1}, 4), [["a"]])
+
+    def _export(self, export_workers: int):
+        bpy.context.scene.xplane.export_workers = export_workers
+        bpy.ops.scene.export_to_relative_dir(initial_dir=EXPORT_FOLDER)
+        self.assertLoggerErrors(0)
+        outputs = {}
+        for name in ROOT_NAMES:
+            with open(
+                os.path.join(get_tmp_folder(), EXPORT_FOLDER, f"{name}.obj")
+            ) as obj_file:
+                outputs[name] = obj_file.read()
+        return outputs
+
+    def test_workers_write_same_objs(self) -> None:
+        create_initial_test_setup()
+        for name in ROOT_NAMES:
+            create_datablock_collection(name).xplane.is_exportable_collection = True
+            create_datablock_mesh(DatablockInfo("MESH", f"{name}_cube", collection=name))
+            set_animation_data(bpy.data.objects[f"{name}_cube"], T_2_FRAMES_1_X)
+
+        blend_path = os.path.join(get_tmp_folder(), "parallel_export.blend")
+        bpy.ops.wm.save_as_mainfile(filepath=blend_path, check_existing=False)
+
+        in_process = self._export(1)
+        in_workers = self._export(2)
+        self.assertEqual(in_workers, in_process)
+        self.assertTrue(
+            any(
+                m["message"] == "Exporting 4 roots with 2 workers"
+                for m in logger.findInfos()
+            )
+        )
+        # The copy the workers opened is cleaned up
+        self.assertEqual(
+            [f for f in os.listdir(get_tmp_folder()) if f.endswith(".xplane_export.blend")],
+            [],
+        )
+
+
+runTestCases([TestParallelExport])
@@ -0,0 +1,48 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_helpers import logger
+
+__dirname__ = os.path.dirname(__file__)
+
+EXPORT_FOLDER = "write_only_changed_objs"
+
+
+class TestWriteOnlyChangedObjs(XPlaneTestCase):
+    def _export_and_get_mtime(self) -> int:
+        bpy.ops.scene.export_to_relative_dir(initial_dir=EXPORT_FOLDER)
+        self.assertLoggerErrors(0)
+        return os.stat(self.obj_path).st_mtime_ns
+
+    def test_identical_obj_not_rewritten(self) -> None:
+        create_initial_test_setup()
+        bpy.context.scene.xplane.only_write_changed_objs = True
+        create_datablock_collection("kept").xplane.is_exportable_collection = True
+        create_datablock_mesh(DatablockInfo("MESH", "kept_cube", collection="kept"))
+        bpy.ops.wm.save_as_mainfile(
+            filepath=os.path.join(get_tmp_folder(), "write_only_changed_objs.blend"),
+            check_existing=False,
+        )
+        self.obj_path = os.path.join(get_tmp_folder(), EXPORT_FOLDER, "kept.obj")
+
+        self._export_and_get_mtime()
+        # An old modification time, so any rewrite is noticed
+        os.utime(self.obj_path, ns=(0, 0))
+
+        self.assertEqual(self._export_and_get_mtime(), 0)
+        self.assertIn(
+            "1 OBJs were unchanged and not rewritten",
+            [m["message"] for m in logger.findInfos()],
+        )
+        self.assertFalse(os.path.exists(self.obj_path + ".tmp"))
+
+        bpy.data.objects["kept_cube"].location.x = 2
+        bpy.context.view_layer.update()
+        self.assertNotEqual(self._export_and_get_mtime(), 0)
+
+
+runTestCases([TestWriteOnlyChangedObjs])
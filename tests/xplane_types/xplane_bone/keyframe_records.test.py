@@ -0,0 +1,44 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestKeyframeRecords(XPlaneTestCase):
+    def setUp(self):
+        super().setUp()
+        create_initial_test_setup()
+        create_datablock_mesh(
+            DatablockInfo("MESH", "rotated_mesh", collection="records")
+        )
+        set_animation_data(bpy.data.objects["rotated_mesh"], R_2_FRAMES_45_Y_AXIS)
+        xp_file = self.createXPlaneFileFromPotentialRoot("records")
+        xplane_file._all_keyframe_infos.clear()
+        self.keyframes = next(
+            iter(xp_file._bl_obj_name_to_bone["rotated_mesh"].animations.values())
+        )
+
+    def test_keyframes_are_slotted(self) -> None:
+        for keyframe in self.keyframes:
+            self.assertFalse(hasattr(keyframe, "__dict__"))
+
+    def test_conversions_share_and_never_mutate(self) -> None:
+        rotations = [keyframe.rotation.copy() for keyframe in self.keyframes]
+        as_aa = self.keyframes.asAA()
+
+        self.assertEqual(self.keyframes.getRotationMode(), "XYZ")
+        self.assertEqual([keyframe.rotation for keyframe in self.keyframes], rotations)
+        self.assertEqual(as_aa.getRotationMode(), "AXIS_ANGLE")
+        for original, converted in zip(self.keyframes, as_aa):
+            self.assertIs(converted.location, original.location)
+            # Already AA, nothing to convert
+            self.assertIs(converted.asAA(), converted)
+
+
+runTestCases([TestKeyframeRecords])
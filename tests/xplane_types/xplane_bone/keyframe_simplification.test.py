@@ -0,0 +1,86 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types.xplane_keyframe_collection import (
+    XPlaneKeyframeCollection,
+)
+
+__dirname__ = os.path.dirname(__file__)
+
+TableEntry = XPlaneKeyframeCollection.TableEntry
+
+
+class TestKeyframeSimplification(XPlaneTestCase):
+    def _make_baked_scene(self) -> None:
+        create_initial_test_setup()
+        create_datablock_mesh(DatablockInfo("MESH", "baked", collection="baked"))
+        # Clamped for 3 frames, a straight line keyed on every frame, clamped again
+        set_animation_data(
+            bpy.data.objects["baked"],
+            [
+                KeyframeInfo(
+                    frame,
+                    "sim/test/baked",
+                    frame,
+                    location=(min(max(frame - 3, 0), 40) * 0.25, 0, 0),
+                    rotation=(0, 0, min(max(frame - 3, 0), 40) * 2),
+                )
+                for frame in range(1, 51)
+            ],
+        )
+
+    def test_off_by_default(self) -> None:
+        self._make_baked_scene()
+        out = self.exportExportableRoot("baked")
+        self.assertLoggerErrors(0)
+        self.assertEqual(out.count("ANIM_trans_key"), 50)
+        self.assertEqual(out.count("ANIM_rotate_key"), 50)
+
+    def test_straight_lines_simplified(self) -> None:
+        self._make_baked_scene()
+        bpy.context.scene.xplane.optimize = True
+        bpy.context.scene.xplane.optimize_keyframes = True
+        out = self.exportExportableRoot("baked")
+        self.assertLoggerErrors(0)
+        trans_keys = [
+            line.split()[1:3]
+            for line in out.splitlines()
+            if line.strip().startswith("ANIM_trans_key")
+        ]
+        # First, clamp ends, clamp starts, last
+        self.assertEqual(
+            trans_keys, [["1", "0"], ["3", "0"], ["43", "10"], ["50", "10"]]
+        )
+        self.assertEqual(out.count("ANIM_rotate_key"), 4)
+
+    def test_loop_and_jumps_kept(self) -> None:
+        table = [TableEntry(float(value), value * 10.0) for value in range(10)]
+        self.assertEqual(
+            XPlaneKeyframeCollection.simplify_keyframe_table(table, "degrees", 0.001),
+            [table[0], table[-1]],
+        )
+        self.assertEqual(
+            XPlaneKeyframeCollection.simplify_keyframe_table(
+                table, "degrees", 0.001, loop=4.0
+            ),
+            [table[0], table[4], table[8], table[-1]],
+        )
+
+        jump = [
+            TableEntry(0.0, 0.0),
+            TableEntry(1.0, 1.0),
+            TableEntry(1.0, 5.0),
+            TableEntry(2.0, 6.0),
+            TableEntry(3.0, 7.0),
+        ]
+        self.assertEqual(
+            XPlaneKeyframeCollection.simplify_keyframe_table(jump, "degrees", 0.001),
+            [jump[0], jump[1], jump[2], jump[-1]],
+        )
+
+
+runTestCases([TestKeyframeSimplification])
@@ -0,0 +1,74 @@
+import os
+import sys
+
+import bpy
+from mathutils import Matrix
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestMatrixCache(XPlaneTestCase):
+    def setUp(self):
+        super().setUp()
+        create_initial_test_setup()
+        create_datablock_empty(
+            DatablockInfo("EMPTY", "animated_parent", collection="cached")
+        )
+        set_animation_data(
+            bpy.data.objects["animated_parent"], T_2_FRAMES_1_X,
+        )
+        create_datablock_mesh(
+            DatablockInfo(
+                "MESH",
+                "attached_mesh",
+                parent_info=ParentInfo(bpy.data.objects["animated_parent"]),
+                collection="cached",
+                location=(0, 0, 2),
+            )
+        )
+        self.xp_file = self.createXPlaneFileFromPotentialRoot("cached")
+        xplane_file._all_keyframe_infos.clear()
+
+    def test_matrices_computed_once(self) -> None:
+        mesh_bone = self.xp_file._bl_obj_name_to_bone["attached_mesh"]
+        parent_bone = self.xp_file._bl_obj_name_to_bone["animated_parent"]
+        self.assertIn("bake_attached", mesh_bone._matrices)
+        self.assertIn("bake_animations", parent_bone._matrices)
+
+        calls = 0
+        compute = parent_bone._computePostAnimationMatrix
+
+        def counting_compute() -> Matrix:
+            nonlocal calls
+            calls += 1
+            return compute()
+
+        parent_bone._matrices.clear()
+        parent_bone._computePostAnimationMatrix = counting_compute
+        for _ in range(3):
+            parent_bone.getPostAnimationMatrix()
+        self.assertEqual(calls, 1)
+
+    def test_returns_copies(self) -> None:
+        mesh_bone = self.xp_file._bl_obj_name_to_bone["attached_mesh"]
+        bake = mesh_bone.getBakeMatrixForAttached()
+        expected = bake.copy()
+        bake[0][3] = 100
+        self.assertEqual(mesh_bone.getBakeMatrixForAttached(), expected)
+
+    def test_frame_change_clears_cache(self) -> None:
+        parent_bone = self.xp_file._bl_obj_name_to_bone["animated_parent"]
+        at_frame_1 = parent_bone.getBlenderWorldMatrix()
+        bpy.context.scene.frame_set(2)
+        at_frame_2 = parent_bone.getBlenderWorldMatrix()
+        bpy.context.scene.frame_set(1)
+        self.assertNotEqual(at_frame_1, at_frame_2)
+        self.assertEqual(at_frame_2.to_translation()[0], 1)
+        self.assertEqual(parent_bone.getBlenderWorldMatrix(), at_frame_1)
+
+
+runTestCases([TestMatrixCache])
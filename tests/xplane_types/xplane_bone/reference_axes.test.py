@@ -0,0 +1,132 @@
+import math
+import os
+import random
+import sys
+
+import bpy
+from mathutils import Vector
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+from io_xplane2blender.xplane_types.xplane_keyframe_collection import (
+    XPlaneKeyframeCollection,
+)
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _old_reference_axis(keyframes):
+    """
+    The one keyframe at a time loop _makeReferenceAxes used to use,
+    returns the reference axis, flipped indices, and if the axis was shared
+    """
+    round_vector = lambda vec: Vector([round(comp, 5) for comp in vec])
+    refAxis = None
+    flipped = []
+    for i, keyframe in enumerate(keyframes):
+        angle, axis = keyframe.rotation
+        if round(angle, 5) == 0:
+            continue
+        elif refAxis == None:
+            refAxis = axis
+        elif round_vector(refAxis) == round_vector(axis):
+            continue
+        elif round_vector(refAxis * -1) == round_vector(axis):
+            flipped.append(i)
+        else:
+            return refAxis, flipped, False
+    return refAxis, flipped, True
+
+
+class TestReferenceAxes(XPlaneTestCase):
+    def setUp(self):
+        super().setUp()
+        create_initial_test_setup()
+        create_datablock_mesh(
+            DatablockInfo("MESH", "rotated_mesh", collection="reference_axes")
+        )
+        set_animation_data(bpy.data.objects["rotated_mesh"], R_2_FRAMES_45_Y_AXIS)
+        xp_file = self.createXPlaneFileFromPotentialRoot("reference_axes")
+        xplane_file._all_keyframe_infos.clear()
+        self.template = next(
+            iter(xp_file._bl_obj_name_to_bone["rotated_mesh"].animations.values())
+        )[0]
+
+    def _make_keyframes(self, rotations):
+        return [
+            self.template.withRotation("AXIS_ANGLE", (angle, Vector(axis)))
+            for angle, axis in rotations
+        ]
+
+    def _propeller(self, count):
+        # Blender's AA for a spinning prop keeps turning its axis around
+        return [
+            (
+                math.radians(i * 37 % 360) - math.pi,
+                (0, 1 if i % 3 else -1, 0),
+            )
+            for i in range(count)
+        ]
+
+    def test_matches_keyframe_at_a_time(self) -> None:
+        rng = random.Random(17)
+        base = (0.577351, -0.577351, 0.577351)
+        cases = [self._propeller(400), [(0, (1, 0, 0)), (0.000004, (0, 0, 1))]]
+        for _ in range(200):
+            rotations = []
+            for _ in range(rng.randint(2, 12)):
+                angle = rng.choice([0, 0.000004, 0.000005, rng.uniform(-7, 7)])
+                pick = rng.random()
+                if pick < 0.45:
+                    axis = base
+                elif pick < 0.9:
+                    axis = tuple(-comp for comp in base)
+                else:
+                    axis = tuple(rng.uniform(-1, 1) for _ in range(3))
+                rotations.append((angle, axis))
+            cases.append(rotations)
+
+        for rotations in cases:
+            keyframes = self._make_keyframes(rotations)
+            ref_axis, flipped, is_shared = _old_reference_axis(keyframes)
+            collection = XPlaneKeyframeCollection(keyframes)
+            axes, final_rotation_mode = collection.getReferenceAxes()
+
+            if not is_shared:
+                self.assertEqual(final_rotation_mode, "XZY")
+                continue
+            self.assertEqual(final_rotation_mode, "AXIS_ANGLE")
+            self.assertEqual(axes, [ref_axis or Vector((0, 0, 1))])
+            for i, (original, kept) in enumerate(zip(keyframes, collection)):
+                if i in flipped:
+                    self.assertEqual(kept.rotation[0], original.rotation[0] * -1)
+                    self.assertEqual(kept.rotation[1], original.rotation[1] * -1)
+                else:
+                    self.assertIs(kept, original)
+
+    def test_rotate_keys_unchanged(self) -> None:
+        create_initial_test_setup()
+        create_datablock_mesh(
+            DatablockInfo("MESH", "propeller", collection="propeller")
+        )
+        set_animation_data(
+            bpy.data.objects["propeller"],
+            [
+                KeyframeInfo(
+                    i + 1,
+                    "sim/flightmodel/engine/POINT_prop_ang_deg",
+                    i * 30,
+                    rotation_mode="AXIS_ANGLE",
+                    rotation=(math.radians(i * 30 % 360), (0, 1, 0)),
+                )
+                for i in range(24)
+            ],
+        )
+        out = self.exportExportableRoot("propeller")
+        self.assertLoggerErrors(0)
+        self.assertEqual(out.count("ANIM_rotate_key"), 24)
+        self.assertEqual(out.count("ANIM_rotate_begin"), 1)
+
+
+runTestCases([TestReferenceAxes])
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestMergeAnimBlocks(XPlaneTestCase):
+    def _make_scene(self) -> None:
+        create_initial_test_setup()
+        # Two doors that move together and a lever that doesn't
+        for name, keyframes in (
+            ("door_left", T_2_FRAMES_1_X),
+            ("door_right", T_2_FRAMES_1_X),
+            ("lever", R_2_FRAMES_45_Y_AXIS),
+        ):
+            create_datablock_mesh(DatablockInfo("MESH", name, collection="doors"))
+            set_animation_data(bpy.data.objects[name], keyframes)
+
+    def _export(self, optimize_animations: bool) -> str:
+        self._make_scene()
+        bpy.context.scene.xplane.optimize = True
+        bpy.context.scene.xplane.optimize_animations = optimize_animations
+        out = self.exportExportableRoot("doors")
+        self.assertLoggerErrors(0)
+        return out
+
+    def test_identical_siblings_merged(self) -> None:
+        unmerged = self._export(False)
+        merged = self._export(True)
+
+        self.assertEqual(unmerged.count("ANIM_begin"), 3)
+        self.assertEqual(merged.count("ANIM_begin"), 2)
+        self.assertEqual(merged.count("ANIM_end"), 2)
+        self.assertEqual(merged.count("ANIM_trans_begin"), 1)
+        self.assertEqual(merged.count("TRIS"), unmerged.count("TRIS"))
+
+        # Same geometry, only the animation text changed
+        def geometry(out):
+            return [
+                line.strip()
+                for line in out.splitlines()
+                if line.strip().startswith(("VT", "IDX", "TRIS"))
+            ]
+
+        self.assertEqual(geometry(merged), geometry(unmerged))
+
+
+runTestCases([TestMergeAnimBlocks])
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.xplane_types.xplane_commands import XPlaneCommands
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestReseters(XPlaneTestCase):
+    def test_setter_counterparts(self) -> None:
+        commands = XPlaneCommands(None)
+        commands.written["ATTR_cockpit_region"] = True
+        commands.written["ATTR_hard_deck"] = True
+        self.assertCountEqual(
+            commands.getAttributeCounterparts("ATTR_cockpit"),
+            ["ATTR_no_cockpit", "ATTR_cockpit_region"],
+        )
+        self.assertCountEqual(
+            commands.getAttributeCounterparts("ATTR_hard"),
+            ["ATTR_no_hard", "ATTR_hard_deck"],
+        )
+        self.assertCountEqual(
+            commands.getAttributeCounterparts("ATTR_manip_drag_xy"),
+            ["ATTR_manip_none"],
+        )
+
+    def test_resetter_counterparts(self) -> None:
+        commands = XPlaneCommands(None)
+        commands.written["ATTR_cockpit_region"] = True
+        commands.written["ATTR_manip_drag_xy"] = True
+        self.assertCountEqual(
+            commands.getAttributeCounterparts("ATTR_no_cockpit"),
+            ["ATTR_cockpit_region"],
+        )
+        self.assertCountEqual(
+            commands.getAttributeCounterparts("ATTR_manip_none"),
+            ["ATTR_manip_drag_xy"],
+        )
+        self.assertEqual(commands.getAttributeCounterparts("ATTR_shiny_rat"), [])
+
+    def test_add_reseter_after_lookup(self) -> None:
+        commands = XPlaneCommands(None)
+        self.assertEqual(commands.getAttributeCounterparts("ATTR_custom"), [])
+        commands.addReseter("ATTR_custom", "ATTR_custom_reset")
+        commands.written["ATTR_custom"] = True
+        self.assertEqual(
+            commands.getAttributeCounterparts("ATTR_custom"), ["ATTR_custom_reset"]
+        )
+        self.assertEqual(
+            commands.getAttributeCounterparts("ATTR_custom_reset"), ["ATTR_custom"]
+        )
+
+
+runTestCases([TestReseters])
@@ -0,0 +1,68 @@
+import os
+import sys
+
+import bpy
+from mathutils import Vector
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+from io_xplane2blender.xplane_types.xplane_commands import XPlaneCommands
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _create_armature_tree(name: str, num_bones: int) -> bpy.types.Object:
+    """
+    Makes an armature in its own collection with num_bones bones, each bone i
+    parented to bone (i-1)//2, all in one trip to Edit Mode
+    """
+    arm = create_datablock_armature(DatablockInfo("ARMATURE", name))
+    set_collection(arm, name)
+    bpy.context.view_layer.objects.active = arm
+    bpy.ops.object.mode_set(mode="EDIT", toggle=False)
+    edit_bones = arm.data.edit_bones
+    edit_bones.remove(edit_bones[0])
+    new_bones = []
+    for i in range(num_bones):
+        bone = edit_bones.new(f"{name}_{i}")
+        bone.head = Vector((i, 0, 0))
+        bone.tail = Vector((i, 0, 1))
+        if i:
+            bone.parent = new_bones[(i - 1) // 2]
+        new_bones.append(bone)
+    bpy.ops.object.mode_set(mode="OBJECT", toggle=False)
+    return arm
+
+
+def _write_recursively(commands: XPlaneCommands, xplaneBone) -> str:
+    """The old recursive writer, what the explicit stack must match"""
+    o = xplaneBone.writeAnimationPrefix()
+    xplaneObject = xplaneBone.xplaneObject
+    writesObject = xplaneObject and not xplaneObject.export_animation_only
+    if writesObject:
+        o += commands._writeXPlaneObjectPrefix(xplaneObject)
+    for childBone in xplaneBone.children:
+        o += _write_recursively(commands, childBone)
+    if writesObject:
+        o += commands._writeXPlaneObjectSuffix(xplaneObject)
+    return o + xplaneBone.writeAnimationSuffix()
+
+
+class TestWriteBoneTree(XPlaneTestCase):
+    def test_5000_bones_match_recursive_writer(self) -> None:
+        create_initial_test_setup()
+        # Debug mode writes a comment for every bone, so every bone has output
+        bpy.context.scene.xplane.debug = True
+
+        _create_armature_tree("tree", 5000)
+        xp_file = self.createXPlaneFileFromPotentialRoot("tree")
+        xplane_file._all_keyframe_infos.clear()
+
+        out = xp_file.commands.write(lod_bucket_index=None)
+        self.assertEqual(out.count("Bone: "), 5000)
+        self.assertEqual(
+            out, _write_recursively(XPlaneCommands(xp_file), xp_file.rootBone)
+        )
+
+runTestCases([TestWriteBoneTree])
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import bpy
+from mathutils import Vector
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestWriteLods(XPlaneTestCase):
+    def test_write_lods_matches_write_per_bucket(self) -> None:
+        create_initial_test_setup()
+        for i, buckets in enumerate(
+            [
+                (True, False, False, False),
+                (False, True, True, False),
+                (True, True, True, True),
+                (False, False, False, True),
+            ]
+        ):
+            cube = create_datablock_mesh(
+                DatablockInfo(
+                    "MESH", f"cube_{i}", collection="lods", location=Vector((i * 3, 0, 0))
+                ),
+                primitive_shape="cube",
+            )
+            cube.xplane.override_lods = True
+            cube.xplane.lod = buckets
+
+        layer = bpy.data.collections["lods"].xplane.layer
+        layer.export_type = "instanced_scenery"
+        layer.lods = "4"
+        for i, lod in enumerate(layer.lod):
+            lod.near = i * 100
+            lod.far = i * 100 + 100
+
+        per_bucket_file = self.createXPlaneFileFromPotentialRoot("lods")
+        per_bucket = [
+            per_bucket_file.commands.write(lod_bucket_index=i) for i in range(4)
+        ]
+        xplane_file._all_keyframe_infos.clear()
+
+        single_pass_file = self.createXPlaneFileFromPotentialRoot("lods")
+        single_pass = list(single_pass_file.commands.writeLods(range(4)))
+        xplane_file._all_keyframe_infos.clear()
+
+        self.assertLoggerErrors(0)
+        self.assertEqual(single_pass, per_bucket)
+        self.assertTrue(all(single_pass))
+
+
+runTestCases([TestWriteLods])
@@ -0,0 +1,131 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestFCurveEvaluation(XPlaneTestCase):
+    def _make_scene(self) -> None:
+        create_initial_test_setup()
+        col = create_datablock_collection("evaluated")
+        col.xplane.is_exportable_collection = True
+
+        euler = create_datablock_empty(
+            DatablockInfo("EMPTY", "euler_empty", collection=col)
+        )
+        set_animation_data(
+            euler,
+            [
+                KeyframeInfo(1, "euler", 0, location=(0, 0, 0), rotation=(0, 0, 0)),
+                KeyframeInfo(3, "euler", 1, location=(1, 2, 3), rotation=(10, 20, 30)),
+                KeyframeInfo(7, "euler", 2, location=(-1, 0, 5), rotation=(0, 45, 0)),
+            ],
+        )
+
+        quaternion = create_datablock_mesh(
+            DatablockInfo("MESH", "quaternion_mesh", collection=col)
+        )
+        set_animation_data(
+            quaternion,
+            [
+                KeyframeInfo(
+                    2,
+                    "quaternion",
+                    0,
+                    rotation_mode="QUATERNION",
+                    rotation=(1, 0, 0, 0),
+                ),
+                KeyframeInfo(
+                    5,
+                    "quaternion",
+                    1,
+                    rotation_mode="QUATERNION",
+                    rotation=(0.7071, 0, 0.7071, 0),
+                ),
+            ],
+        )
+
+        armature = create_datablock_armature(
+            DatablockInfo("ARMATURE", "armature", collection=col)
+        )
+        set_animation_data(
+            armature.pose.bones["Bone"],
+            [
+                KeyframeInfo(
+                    1,
+                    "bone",
+                    0,
+                    rotation_mode="AXIS_ANGLE",
+                    rotation=(0, (0, 0, 1)),
+                ),
+                KeyframeInfo(
+                    4,
+                    "bone",
+                    1,
+                    rotation_mode="AXIS_ANGLE",
+                    rotation=(1.5, (0, 1, 0)),
+                ),
+            ],
+            parent_armature=armature,
+        )
+
+        constrained = create_datablock_empty(
+            DatablockInfo("EMPTY", "constrained_empty", collection=col)
+        )
+        set_animation_data(
+            constrained,
+            [
+                KeyframeInfo(2, "constrained", 0, location=(0, 0, 0)),
+                KeyframeInfo(6, "constrained", 1, location=(0, 0, 4)),
+            ],
+        )
+        constrained.constraints.new("COPY_LOCATION").target = euler
+        bpy.context.scene.frame_set(1)
+
+    def test_classification(self) -> None:
+        self._make_scene()
+        objects = bpy.data.objects
+        self.assertIsNotNone(
+            xplane_file._fcurve_evaluable_channels(objects["euler_empty"], None)
+        )
+        self.assertIsNotNone(
+            xplane_file._fcurve_evaluable_channels(objects["armature"], "Bone")
+        )
+        self.assertIsNone(
+            xplane_file._fcurve_evaluable_channels(objects["constrained_empty"], None)
+        )
+
+    def test_strategies_identical(self) -> None:
+        self._make_scene()
+        scene_name = bpy.context.scene.name
+        root = bpy.data.collections["evaluated"]
+
+        xplane_file._pre_scan_keyframes(root, use_fcurve_evaluation=False)
+        from_frame_set = dict(xplane_file._all_keyframe_infos[scene_name])
+        xplane_file._all_keyframe_infos.clear()
+
+        # Land on a frame no key uses, the fcurves must not care
+        bpy.context.scene.frame_set(4)
+        xplane_file._pre_scan_keyframes(root, use_fcurve_evaluation=True)
+        from_fcurves = dict(xplane_file._all_keyframe_infos[scene_name])
+        xplane_file._all_keyframe_infos.clear()
+
+        self.assertEqual(
+            set(from_frame_set),
+            {
+                ("euler_empty", None),
+                ("quaternion_mesh", None),
+                ("armature", "Bone"),
+                ("constrained_empty", None),
+            },
+        )
+        self.assertEqual(from_fcurves, from_frame_set)
+
+
+runTestCases([TestFCurveEvaluation])
@@ -0,0 +1,61 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_helpers import logger
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestFramePlan(XPlaneTestCase):
+    def test_frame_plan_logged(self) -> None:
+        create_initial_test_setup()
+        bpy.context.scene.xplane.plugin_development = True
+        bpy.context.scene.xplane.dev_profile_export = True
+        col = create_datablock_collection("planned")
+        col.xplane.is_exportable_collection = True
+
+        for name in ("first", "second"):
+            obj = create_datablock_empty(
+                DatablockInfo("EMPTY", f"{name}_constrained", collection=col)
+            )
+            set_animation_data(
+                obj,
+                [
+                    KeyframeInfo(frame, "planned", frame, location=(0, 0, frame))
+                    for frame in (1, 2, 3)
+                ],
+            )
+            # Constraints need the depsgraph, so these cost frame_sets
+            obj.constraints.new("LIMIT_LOCATION")
+
+        # Unrelated camera animation keyed on every frame
+        camera = create_datablock_empty(DatablockInfo("EMPTY", "camera_rig"))
+        for frame in range(1, 2001, 50):
+            camera.location.x = frame
+            camera.keyframe_insert("location", index=0, frame=frame)
+
+        xplane_file._all_keyframe_infos.clear()
+        xplane_file._pre_scan_keyframes(col)
+        xplane_file._all_keyframe_infos.clear()
+
+        plan_msgs = [
+            m["message"]
+            for m in logger.findInfos()
+            if m["message"].startswith("Keyframe scan for planned")
+        ]
+        self.assertEqual(
+            plan_msgs,
+            [
+                "Keyframe scan for planned visits 3 frames"
+                " (0 owners read from fcurves, 0 cached):"
+                " 1-3: first_constrained, second_constrained"
+            ],
+        )
+
+
+runTestCases([TestFramePlan])
@@ -0,0 +1,88 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestPersistentKeyframeCache(XPlaneTestCase):
+    def _make_scene(self) -> None:
+        create_initial_test_setup()
+        col = create_datablock_collection("persistent")
+        col.xplane.is_exportable_collection = True
+        for name in ("animated_a", "animated_b"):
+            ob = create_datablock_mesh(DatablockInfo("MESH", name, collection=col))
+            set_animation_data(
+                ob,
+                [
+                    KeyframeInfo(1, name, 0, location=(0, 0, 0)),
+                    KeyframeInfo(2, name, 1, location=(1, 0, 0)),
+                ],
+            )
+        bpy.context.view_layer.update()
+
+    def _scan(self) -> dict:
+        xplane_file.createFileFromBlenderRootObject(
+            bpy.data.collections["persistent"], bpy.context.view_layer
+        )
+        return xplane_file._all_keyframe_infos[bpy.context.scene.name]
+
+    def test_cache_survives_export(self) -> None:
+        self._make_scene()
+        xplane_file.createFilesFromBlenderRootObjects(
+            bpy.context.scene, bpy.context.view_layer
+        )
+        bpy.context.view_layer.update()
+        self.assertEqual(
+            set(xplane_file._all_keyframe_infos[bpy.context.scene.name]),
+            {("animated_a", None), ("animated_b", None)},
+        )
+
+    def test_new_keyframe_invalidates_only_its_object(self) -> None:
+        self._make_scene()
+        self._scan()
+        set_animation_data(
+            bpy.data.objects["animated_a"],
+            [KeyframeInfo(3, "animated_a", 2, location=(2, 0, 0))],
+        )
+        bpy.context.view_layer.update()
+        self.assertEqual(
+            set(xplane_file._all_keyframe_infos[bpy.context.scene.name]),
+            {("animated_b", None)},
+        )
+
+        scene_keyframe_infos = self._scan()
+        self.assertEqual(
+            sorted(scene_keyframe_infos[("animated_a", None)]), [1, 2, 3]
+        )
+        self.assertEqual(
+            scene_keyframe_infos[("animated_a", None)][3].location[:], (2, 0, 0)
+        )
+
+    def test_new_constraint_invalidates(self) -> None:
+        self._make_scene()
+        self._scan()
+        bpy.data.objects["animated_b"].constraints.new("COPY_LOCATION")
+        bpy.context.view_layer.update()
+        self.assertEqual(
+            set(xplane_file._all_keyframe_infos[bpy.context.scene.name]),
+            {("animated_a", None)},
+        )
+
+    def test_frame_change_keeps_cache(self) -> None:
+        self._make_scene()
+        self._scan()
+        bpy.context.scene.frame_set(2)
+        bpy.context.scene.frame_set(1)
+        self.assertEqual(
+            set(xplane_file._all_keyframe_infos[bpy.context.scene.name]),
+            {("animated_a", None), ("animated_b", None)},
+        )
+
+
+runTestCases([TestPersistentKeyframeCache])
@@ -0,0 +1,121 @@
+import os
+import sys
+
+import bpy
+from mathutils import Vector
+
+from io_xplane2blender import xplane_helpers
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestPoseSnapshot(XPlaneTestCase):
+    def _make_scene(self) -> bpy.types.Object:
+        create_initial_test_setup()
+        col = create_datablock_collection("posed")
+        col.xplane.is_exportable_collection = True
+        armature = create_datablock_armature(
+            DatablockInfo("ARMATURE", "armature", collection=col),
+            extra_bones=4,
+            bone_direction=Vector((0, 0, 1)),
+        )
+        set_animation_data(
+            armature.pose.bones["bone_0"],
+            [
+                KeyframeInfo(1, "bone_0", 0, location=(0, 0, 0), rotation=(0, 0, 0)),
+                KeyframeInfo(4, "bone_0", 1, location=(1, 2, 3), rotation=(0, 30, 0)),
+            ],
+            parent_armature=armature,
+        )
+        set_animation_data(
+            armature.pose.bones["bone_2"],
+            [
+                KeyframeInfo(
+                    2,
+                    "bone_2",
+                    0,
+                    rotation_mode="QUATERNION",
+                    rotation=(1, 0, 0, 0),
+                ),
+                KeyframeInfo(
+                    4,
+                    "bone_2",
+                    1,
+                    rotation_mode="QUATERNION",
+                    rotation=(0.7071, 0.7071, 0, 0),
+                ),
+            ],
+            parent_armature=armature,
+        )
+        set_animation_data(
+            armature.pose.bones["bone_3"],
+            [
+                KeyframeInfo(
+                    3,
+                    "bone_3",
+                    0,
+                    rotation_mode="AXIS_ANGLE",
+                    rotation=(0, (1, 0, 0)),
+                ),
+                KeyframeInfo(
+                    5,
+                    "bone_3",
+                    1,
+                    rotation_mode="AXIS_ANGLE",
+                    rotation=(0.5, (0, 0, 1)),
+                ),
+            ],
+            parent_armature=armature,
+        )
+        bpy.context.scene.frame_set(1)
+        return armature
+
+    def test_snapshot_matches_pose_bones(self) -> None:
+        armature = self._make_scene()
+        scene_name = bpy.context.scene.name
+        xplane_file._pre_scan_keyframes(
+            bpy.data.collections["posed"], use_fcurve_evaluation=False
+        )
+        scene_keyframe_infos = dict(xplane_file._all_keyframe_infos[scene_name])
+        xplane_file._all_keyframe_infos.clear()
+
+        expected_frames = {"bone_0": [1, 4], "bone_2": [2, 4], "bone_3": [3, 5]}
+        self.assertEqual(
+            {key: list(frames) for key, frames in scene_keyframe_infos.items()},
+            {
+                ("armature", bone_name): frames
+                for bone_name, frames in expected_frames.items()
+            },
+        )
+
+        for bone_name, frames in expected_frames.items():
+            pose_bone = armature.pose.bones[bone_name]
+            for frame_num in frames:
+                bpy.context.scene.frame_set(frame_num)
+                self.assertEqual(
+                    scene_keyframe_infos[("armature", bone_name)][frame_num],
+                    xplane_file.LocRotPerFrame(
+                        frame_num,
+                        pose_bone.location.copy(),
+                        pose_bone.rotation_mode,
+                        xplane_helpers.get_rotation_from_rotatable(pose_bone),
+                    ),
+                )
+
+    def test_unkeyed_frame_raises_key_error(self) -> None:
+        self._make_scene()
+        xplane_file._pre_scan_keyframes(
+            bpy.data.collections["posed"], use_fcurve_evaluation=False
+        )
+        bone_frames = xplane_file._all_keyframe_infos[bpy.context.scene.name][
+            ("armature", "bone_0")
+        ]
+        xplane_file._all_keyframe_infos.clear()
+        with self.assertRaises(KeyError):
+            bone_frames[2]
+
+
+runTestCases([TestPoseSnapshot])
@@ -0,0 +1,90 @@
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestScopedKeyframeScan(XPlaneTestCase):
+    def _make_scene(self) -> None:
+        create_initial_test_setup()
+        col = create_datablock_collection("scoped")
+        col.xplane.is_exportable_collection = True
+
+        parent = create_datablock_empty(
+            DatablockInfo("EMPTY", "out_of_collection_parent")
+        )
+        set_animation_data(
+            parent,
+            [
+                KeyframeInfo(1, "parent", 0, location=(0, 0, 0)),
+                KeyframeInfo(5, "parent", 1, location=(0, 1, 0)),
+            ],
+        )
+        child = create_datablock_mesh(
+            DatablockInfo(
+                "MESH",
+                "in_collection_child",
+                parent_info=ParentInfo(parent),
+                collection=col,
+            )
+        )
+        set_animation_data(
+            child,
+            [
+                KeyframeInfo(2, "child", 0, location=(0, 0, 0)),
+                KeyframeInfo(3, "child", 1, location=(1, 0, 0)),
+            ],
+        )
+        unrelated = create_datablock_empty(DatablockInfo("EMPTY", "unrelated"))
+        set_animation_data(
+            unrelated,
+            [
+                KeyframeInfo(4, "unrelated", 0, location=(0, 0, 0)),
+                KeyframeInfo(6, "unrelated", 1, location=(0, 0, 1)),
+            ],
+        )
+
+        # A library action no root uses, like an unused NLA strip
+        library_action = bpy.data.actions.new("unused_library_action")
+        fcurve = library_action.fcurves.new("location", index=0)
+        for frame in range(1, 301):
+            fcurve.keyframe_points.insert(frame, frame)
+
+    def test_only_root_owners_and_frames_scanned(self) -> None:
+        self._make_scene()
+        xplane_file._pre_scan_keyframes(bpy.data.collections["scoped"])
+
+        scene_keyframe_infos = xplane_file._all_keyframe_infos[bpy.context.scene.name]
+        self.assertEqual(
+            {
+                key: sorted(frames)
+                for key, frames in scene_keyframe_infos.items()
+            },
+            {
+                ("in_collection_child", None): [2, 3],
+                ("out_of_collection_parent", None): [1, 5],
+            },
+        )
+        self.assertEqual(
+            scene_keyframe_infos[("in_collection_child", None)][3].location[:],
+            (1, 0, 0),
+        )
+        self.assertEqual(
+            scene_keyframe_infos[("out_of_collection_parent", None)][5].location[:],
+            (0, 1, 0),
+        )
+
+    def test_scoped_scan_export_unchanged(self) -> None:
+        self._make_scene()
+        out = self.exportExportableRoot("scoped")
+        self.assertLoggerErrors(0)
+        self.assertEqual(out.count("ANIM_trans_key"), 4)
+
+
+runTestCases([TestScopedKeyframeScan])
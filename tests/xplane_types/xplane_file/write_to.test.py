@@ -0,0 +1,72 @@
+import io
+import os
+import sys
+
+import bpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+from io_xplane2blender.xplane_types.xplane_mesh import XPlaneMesh
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class ChunkRecorder(io.StringIO):
+    """A text sink that remembers the size of every chunk written to it"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunk_sizes = []
+
+    def write(self, s: str) -> int:
+        self.chunk_sizes.append(len(s))
+        return super().write(s)
+
+
+class TestWriteTo(XPlaneTestCase):
+    def setUp(self):
+        super().setUp()
+        self._old_chunk_size = XPlaneMesh.WRITE_CHUNK_SIZE
+        XPlaneMesh.WRITE_CHUNK_SIZE = 16
+
+    def tearDown(self):
+        XPlaneMesh.WRITE_CHUNK_SIZE = self._old_chunk_size
+        super().tearDown()
+
+    def test_write_to_matches_write(self) -> None:
+        create_initial_test_setup()
+        create_datablock_mesh(
+            DatablockInfo("MESH", "streamed_sphere", collection="streamed"),
+            primitive_shape="uv_sphere",
+        )
+
+        out = self.createXPlaneFileFromPotentialRoot("streamed").write()
+        xplane_file._all_keyframe_infos.clear()
+
+        sink = ChunkRecorder()
+        self.createXPlaneFileFromPotentialRoot("streamed").writeTo(sink)
+        xplane_file._all_keyframe_infos.clear()
+
+        self.assertLoggerErrors(0)
+        self.assertEqual(sink.getvalue(), out)
+        # The VT and IDX tables must arrive in many small chunks,
+        # not one string holding the whole file
+        self.assertLess(max(sink.chunk_sizes), len(out) // 4)
+
+    def test_mesh_write_to_matches_write(self) -> None:
+        create_initial_test_setup()
+        create_datablock_mesh(
+            DatablockInfo("MESH", "streamed_cube", collection="streamed"),
+            primitive_shape="cube",
+        )
+        xp_file = self.createXPlaneFileFromPotentialRoot("streamed")
+        xp_file.mesh.collectXPlaneObjects(xp_file.get_xplane_objects())
+
+        sink = io.StringIO()
+        written = xp_file.mesh.writeTo(sink)
+        self.assertEqual(sink.getvalue(), xp_file.mesh.write())
+        self.assertEqual(written, len(sink.getvalue()))
+
+
+runTestCases([TestWriteTo])
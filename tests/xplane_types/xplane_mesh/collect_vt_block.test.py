@@ -0,0 +1,93 @@
+import os
+import sys
+from typing import List, Tuple
+
+import bpy
+
+from io_xplane2blender import xplane_config, xplane_helpers
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_mesh
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _reference_vt_entries(bl_obj: bpy.types.Object, bake_matrix) -> List[Tuple[float, ...]]:
+    """The old, one corner at a time, way of making VT entries. Used to check the new one"""
+    dg = bpy.context.evaluated_depsgraph_get()
+    evaluated_obj = bl_obj.evaluated_get(dg)
+    mesh = evaluated_obj.to_mesh(preserve_all_data_layers=False, depsgraph=dg)
+    mesh.transform(bake_matrix)
+    if hasattr(mesh, "calc_normals_split"):
+        mesh.calc_normals_split()
+    mesh.calc_loop_triangles()
+    uv_layer = mesh.uv_layers.active
+    vt_entries = []
+    for tri in mesh.loop_triangles:
+        for i in reversed(range(0, 3)):
+            vertex = xplane_helpers.vec_b_to_x(mesh.vertices[tri.vertices[i]].co)
+            normal = xplane_helpers.vec_b_to_x(
+                tri.split_normals[i] if tri.use_smooth else tri.normal
+            )
+            uv = uv_layer.data[tri.loops[i]].uv if uv_layer else (0.0, 0.0)
+            vt_entries.append(tuple(vertex[:] + normal[:] + tuple(uv[:])))
+    evaluated_obj.to_mesh_clear()
+    return vt_entries
+
+
+class TestCollectVTBlock(XPlaneTestCase):
+    def setUp(self):
+        super().setUp()
+        create_initial_test_setup()
+
+    def _make_monkey(self) -> bpy.types.Object:
+        ob = create_datablock_mesh(
+            DatablockInfo(
+                "MESH",
+                "monkey",
+                collection="vt_block",
+                location=(1, -2, 3),
+                rotation=(0.5, 0.25, 0),
+            ),
+            primitive_shape="monkey",
+        )
+        # Mixed smooth and flat faces test both normal paths
+        for poly in ob.data.polygons[::2]:
+            poly.use_smooth = True
+        return ob
+
+    def test_vt_block_matches_per_corner_collection(self) -> None:
+        ob = self._make_monkey()
+        xp_file = self.createXPlaneFileFromPotentialRoot("vt_block")
+        xp_file.mesh.collectXPlaneObjects(xp_file.get_xplane_objects())
+        xp_obj = xp_file.get_xplane_objects()[0]
+
+        expected = _reference_vt_entries(ob, xp_obj.bakeMatrix)
+        self.assertEqual(xp_file.mesh.vertices.shape, (len(expected), 8))
+        self.assertEqual(xp_file.mesh.vertices.dtype.itemsize, 4)
+        self.assertEqual(xp_file.mesh.indices.typecode, "i")
+        self.assertEqual(list(map(tuple, xp_file.mesh.vertices.tolist())), expected)
+        self.assertEqual(list(xp_file.mesh.indices), list(range(len(expected))))
+        self.assertEqual(xp_obj.indices, [0, len(expected)])
+
+    def test_vt_block_optimized_matches_per_corner_collection(self) -> None:
+        bpy.context.scene.xplane.optimize = True
+        ob = self._make_monkey()
+        xp_file = self.createXPlaneFileFromPotentialRoot("vt_block")
+        xp_file.mesh.collectXPlaneObjects(xp_file.get_xplane_objects())
+        xp_obj = xp_file.get_xplane_objects()[0]
+
+        expected_vertices = []
+        expected_indices = []
+        seen = {}
+        for vt_entry in _reference_vt_entries(ob, xp_obj.bakeMatrix):
+            if vt_entry not in seen:
+                seen[vt_entry] = len(expected_vertices)
+                expected_vertices.append(vt_entry)
+            expected_indices.append(seen[vt_entry])
+
+        self.assertEqual(list(map(tuple, xp_file.mesh.vertices.tolist())), expected_vertices)
+        self.assertEqual(list(xp_file.mesh.indices), expected_indices)
+
+
+runTestCases([TestCollectVTBlock])
@@ -0,0 +1,65 @@
+import os
+import sys
+from typing import List, Tuple
+
+import bpy
+import numpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.xplane_types.xplane_mesh import dedup_vt_block
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _dedup_with_dict(vt_block: numpy.ndarray) -> Tuple[List[int], List[int]]:
+    """The old vertices_dct approach, what dedup_vt_block must match"""
+    vertices_dct = {}
+    first_rows = []
+    inverse = []
+    for row, vt_entry in enumerate(map(tuple, vt_block.tolist())):
+        vindex = vertices_dct.get(vt_entry, -1)
+        if vindex == -1:
+            vindex = len(first_rows)
+            first_rows.append(row)
+            vertices_dct[vt_entry] = vindex
+        inverse.append(vindex)
+    return first_rows, inverse
+
+
+def _make_corners(num_corners: int, num_unique: int) -> numpy.ndarray:
+    rng = numpy.random.default_rng(1)
+    unique = rng.random((num_unique, 8)).astype(numpy.float32)
+    return unique[rng.integers(0, num_unique, num_corners)]
+
+
+class TestDedupVTBlock(XPlaneTestCase):
+    def test_matches_dict_first_seen_order(self) -> None:
+        vt_block = _make_corners(5000, 700)
+        first_rows, inverse = dedup_vt_block(vt_block)
+        expected_first_rows, expected_inverse = _dedup_with_dict(vt_block)
+        self.assertEqual(first_rows.tolist(), expected_first_rows)
+        self.assertEqual(inverse.tolist(), expected_inverse)
+        self.assertTrue(numpy.array_equal(vt_block[first_rows][inverse], vt_block))
+
+    def test_negative_zero_and_nan(self) -> None:
+        vt_block = numpy.zeros((4, 8), dtype=numpy.float32)
+        vt_block[0, 0] = -0.0
+        vt_block[2:, 1] = numpy.nan
+        first_rows, inverse = dedup_vt_block(vt_block)
+        expected_first_rows, expected_inverse = _dedup_with_dict(vt_block)
+        self.assertEqual(first_rows.tolist(), expected_first_rows)
+        self.assertEqual(inverse.tolist(), expected_inverse)
+
+    def test_empty(self) -> None:
+        first_rows, inverse = dedup_vt_block(numpy.empty((0, 8), dtype=numpy.float32))
+        self.assertEqual(len(first_rows), 0)
+        self.assertEqual(len(inverse), 0)
+
+    def test_1M_corners(self) -> None:
+        vt_block = _make_corners(1000000, 250000)
+        first_rows, inverse = dedup_vt_block(vt_block)
+        expected_first_rows, expected_inverse = _dedup_with_dict(vt_block)
+        self.assertEqual(first_rows.tolist(), expected_first_rows)
+        self.assertEqual(inverse.tolist(), expected_inverse)
+
+runTestCases([TestDedupVTBlock])
@@ -0,0 +1,88 @@
+import os
+import sys
+
+import bpy
+import numpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types import xplane_file
+from io_xplane2blender.xplane_types.xplane_mesh import (
+    reorder_vertices_by_first_use,
+    tipsify_triangles,
+    vertex_cache_misses,
+)
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _shuffled_grid(size: int) -> numpy.ndarray:
+    """A size x size grid of quads as a triangle list, in a random triangle order"""
+    verts = numpy.arange((size + 1) * (size + 1)).reshape(size + 1, size + 1)
+    quads = numpy.stack(
+        (verts[:-1, :-1], verts[:-1, 1:], verts[1:, :-1], verts[1:, 1:]), axis=-1
+    ).reshape(-1, 4)
+    triangles = numpy.concatenate((quads[:, [0, 1, 2]], quads[:, [1, 3, 2]]))
+    return triangles[numpy.random.default_rng(1).permutation(len(triangles))].ravel()
+
+
+def _triangle_set(vertices: numpy.ndarray, indices: numpy.ndarray):
+    return sorted(map(tuple, vertices[indices].reshape(-1, 24).tolist()))
+
+
+class TestVertexCache(XPlaneTestCase):
+    def test_tipsify_keeps_triangles_and_lowers_acmr(self) -> None:
+        indices = _shuffled_grid(50)
+        num_triangles = len(indices) // 3
+        reordered = tipsify_triangles(indices, 51 * 51)
+        self.assertEqual(
+            sorted(map(tuple, reordered.reshape(-1, 3).tolist())),
+            sorted(map(tuple, indices.reshape(-1, 3).tolist())),
+        )
+        acmr_before = vertex_cache_misses(indices) / num_triangles
+        acmr_after = vertex_cache_misses(reordered) / num_triangles
+        self.assertGreater(acmr_before, 2.5)
+        self.assertLess(acmr_after, 0.8)
+
+    def test_reorder_vertices_by_first_use(self) -> None:
+        indices = numpy.array([4, 2, 0, 2, 4, 1, 3, 1, 4])
+        order, new_indices = reorder_vertices_by_first_use(indices, 6)
+        self.assertEqual(order.tolist(), [4, 2, 0, 1, 3])
+        self.assertEqual(new_indices.tolist(), [0, 1, 2, 1, 0, 3, 4, 3, 0])
+        self.assertTrue((order[new_indices] == indices).all())
+
+    def test_export_logs_acmr_and_keeps_geometry(self) -> None:
+        create_initial_test_setup()
+        bpy.context.scene.xplane.optimize = True
+        create_datablock_mesh(
+            DatablockInfo("MESH", "cached_sphere", collection="cached"),
+            primitive_shape="uv_sphere",
+        )
+        xp_file = self.createXPlaneFileFromPotentialRoot("cached")
+        xp_file.mesh.collectXPlaneObjects(xp_file.get_xplane_objects())
+        xplane_file._all_keyframe_infos.clear()
+        expected = _triangle_set(
+            xp_file.mesh.vertices, numpy.array(xp_file.mesh.indices)
+        )
+
+        bpy.context.scene.xplane.optimize_vertex_cache = True
+        out = self.exportExportableRoot("cached")
+        self.assertLoggerErrors(0)
+        acmr_msgs = [
+            m["message"]
+            for m in logger.findInfos()
+            if m["message"].startswith("Vertex cache optimization in")
+        ]
+        self.assertEqual(len(acmr_msgs), 1)
+
+        xp_file = self.createXPlaneFileFromPotentialRoot("cached")
+        xp_file.mesh.collectXPlaneObjects(xp_file.get_xplane_objects())
+        xplane_file._all_keyframe_infos.clear()
+        indices = numpy.array(xp_file.mesh.indices)
+        self.assertEqual(_triangle_set(xp_file.mesh.vertices, indices), expected)
+        # Vertices are in first use order
+        first_uses = numpy.unique(indices, return_index=True)[1]
+        self.assertTrue((numpy.diff(first_uses) > 0).all())
+
+
+runTestCases([TestVertexCache])
@@ -0,0 +1,52 @@
+import os
+import sys
+
+import bpy
+import numpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.tests.test_creation_helpers import *
+from io_xplane2blender.xplane_types.xplane_mesh import weld_vt_block
+
+__dirname__ = os.path.dirname(__file__)
+
+
+class TestWeldVTBlock(XPlaneTestCase):
+    def test_near_duplicates_welded_within_tolerance(self) -> None:
+        vt_block = numpy.array(
+            [
+                [0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.5, 0.5],
+                [1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.5, 0.5],
+                # Float noise of the first row
+                [0.00001, 0.00002, 0.0, 0.0, 0.9999, 0.0, 0.50001, 0.5],
+                # Same position, different normal
+                [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.5, 0.5],
+            ],
+            dtype=numpy.float32,
+        )
+        first_rows, inverse = weld_vt_block(vt_block, 0.0001, 0.001, 0.0001)
+        self.assertEqual(first_rows.tolist(), [0, 1, 3])
+        self.assertEqual(inverse.tolist(), [0, 1, 0, 2])
+        self.assertLess(
+            numpy.abs(vt_block[first_rows][inverse] - vt_block).max(), 0.001
+        )
+
+    def test_export_logs_saved_vertices(self) -> None:
+        create_initial_test_setup()
+        bpy.context.scene.xplane.optimize = True
+        bpy.context.scene.xplane.optimize_weld = True
+        create_datablock_mesh(
+            DatablockInfo("MESH", "welded_sphere", collection="weld"),
+            primitive_shape="uv_sphere",
+        )
+        out = self.exportExportableRoot("weld")
+        self.assertLoggerErrors(0)
+        welded_msgs = [
+            m["message"]
+            for m in logger.findInfos()
+            if m["message"].startswith("Welding nearby vertices in")
+        ]
+        self.assertEqual(len(welded_msgs), 1)
+
+
+runTestCases([TestWeldVTBlock])
@@ -0,0 +1,63 @@
+import os
+import sys
+
+import bpy
+import numpy
+
+from io_xplane2blender.tests import *
+from io_xplane2blender.xplane_helpers import floatRowsToStr, floatToStr
+
+__dirname__ = os.path.dirname(__file__)
+
+
+def _format_with_floatToStr(table: numpy.ndarray, first_index=None) -> str:
+    """The old per component approach, what floatRowsToStr must match"""
+    tab = "\t"
+    return "".join(
+        f"VT\t"
+        f"{tab.join(floatToStr(component) for component in line)}"
+        f"{f'{tab}# {first_index + i}' if first_index is not None else ''}"
+        f"\n"
+        for i, line in enumerate(table.tolist())
+    )
+
+
+class TestWriteVertices(XPlaneTestCase):
+    def test_matches_floatToStr(self) -> None:
+        rng = numpy.random.default_rng(1)
+        table = (
+            rng.standard_normal((5000, 8)) * 10.0 ** rng.integers(-12, 12, (5000, 8))
+        ).astype(numpy.float32)
+        table[rng.random(table.shape) < 0.05] = 0.0
+        table[rng.random(table.shape) < 0.01] = -0.0
+        for first_index in (None, 10):
+            self.assertEqual(
+                floatRowsToStr(table, "VT\t", first_index),
+                _format_with_floatToStr(table, first_index),
+            )
+
+    def test_exponent_edges(self) -> None:
+        edges = [1e-4, 9.9999e-5, 1.0001e-4, 1e-5, 1e-45, 9999999.0, 99999999.5, 1e8]
+        table = numpy.array(
+            edges + [-edge for edge in edges] + [0.0, -0.0, numpy.inf, numpy.nan],
+            dtype=numpy.float32,
+        ).reshape(-1, 4)
+        self.assertEqual(
+            floatRowsToStr(table, "VT\t"), _format_with_floatToStr(table)
+        )
+
+    def test_empty(self) -> None:
+        self.assertEqual(
+            floatRowsToStr(numpy.empty((0, 8), dtype=numpy.float32), "VT\t"), ""
+        )
+
+    def test_1M_vertices(self) -> None:
+        rng = numpy.random.default_rng(1)
+        table = (rng.random((1000000, 8)) * 2 - 1).astype(numpy.float32)
+        batch = "".join(
+            floatRowsToStr(table[chunk_start : chunk_start + 65536], "VT\t")
+            for chunk_start in range(0, len(table), 65536)
+        )
+        self.assertEqual(batch, _format_with_floatToStr(table))
+
+runTestCases([TestWriteVertices])